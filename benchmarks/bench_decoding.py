@@ -0,0 +1,153 @@
+"""Micro-benchmark of decoding Github issue listing pages.
+
+Compares *Response.json* (the previous path) with *gitmine.decoding*, using the standard
+library parser and orjson when it is installed, each followed by the projection of the
+items to the fields gitmine reads.
+
+Usage (with gitmine installed, e.g. pip install -e .):
+    python benchmarks/bench_decoding.py [--pages N]
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from requests import Response
+
+from gitmine import decoding
+from gitmine.decoding import project_issue
+
+ITEMS_PER_PAGE = 100
+
+
+def make_user(login: str) -> Dict[str, Any]:
+    return {
+        "login": login,
+        "id": 1234,
+        "node_id": "MDQ6VXNlcjEyMzQ=",
+        "avatar_url": f"https://avatars.githubusercontent.com/u/1234?v=4&{login}",
+        "url": f"https://api.github.com/users/{login}",
+        "html_url": f"https://github.com/{login}",
+        "repos_url": f"https://api.github.com/users/{login}/repos",
+        "type": "User",
+        "site_admin": False,
+    }
+
+
+def make_item(number: int) -> Dict[str, Any]:
+    """An issue as the REST API lists it, with the fields gitmine never reads."""
+    repo_url = "https://api.github.com/repos/an-org/a-repo"
+    return {
+        "url": f"{repo_url}/issues/{number}",
+        "repository_url": repo_url,
+        "labels_url": f"{repo_url}/issues/{number}/labels{{/name}}",
+        "comments_url": f"{repo_url}/issues/{number}/comments",
+        "events_url": f"{repo_url}/issues/{number}/events",
+        "html_url": f"https://github.com/an-org/a-repo/issues/{number}",
+        "id": 100000 + number,
+        "node_id": "MDU6SXNzdWUxMjM0NTY3ODk=",
+        "number": number,
+        "title": f"Issue number {number} with a title of a realistic length",
+        "user": make_user("reporter"),
+        "labels": [
+            {
+                "id": 1,
+                "node_id": "MDU6TGFiZWwx",
+                "url": f"{repo_url}/labels/bug",
+                "name": "bug",
+                "color": "d73a4a",
+                "default": True,
+                "description": "Something isn't working",
+            }
+        ],
+        "state": "open",
+        "locked": False,
+        "assignee": make_user("assignee"),
+        "assignees": [make_user("assignee")],
+        "milestone": None,
+        "comments": 3,
+        "created_at": "2021-03-04T12:34:56Z",
+        "updated_at": "2021-12-01T12:00:00Z",
+        "closed_at": None,
+        "author_association": "MEMBER",
+        "body": "Steps to reproduce:\n\n1. Run the thing\n2. Watch it fail\n" * 20,
+        "reactions": {
+            "url": f"{repo_url}/issues/{number}/reactions",
+            "total_count": 2,
+            "+1": 2,
+            "-1": 0,
+            "laugh": 0,
+            "hooray": 0,
+            "confused": 0,
+            "heart": 0,
+            "rocket": 0,
+            "eyes": 0,
+        },
+        "timeline_url": f"{repo_url}/issues/{number}/timeline",
+    }
+
+
+def make_response(body: bytes) -> Response:
+    response = Response()
+    response.status_code = 200
+    response.encoding = "utf-8"
+    response._content = body  # pylint: disable=protected-access
+    return response
+
+
+def measure(name: str, decode: Callable[[bytes], List[Any]], bodies: List[bytes]) -> None:
+    gc.collect()
+    start = time.perf_counter()
+    for body in bodies:
+        decode(body)
+    elapsed = time.perf_counter() - start
+    items = len(bodies) * ITEMS_PER_PAGE
+
+    tracemalloc.start()
+    # What a sweep keeps alive while pages wait to be turned into elements
+    pages = [decode(body) for body in bodies]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del pages
+
+    print(
+        f"{name:<22} {elapsed / items * 1e6:6.2f} us/item   "
+        f"retained {retained / items:8.1f} bytes/item"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=50)
+    args = parser.parse_args()
+
+    bodies = [
+        json.dumps([make_item(page * ITEMS_PER_PAGE + i) for i in range(ITEMS_PER_PAGE)]).encode()
+        for page in range(args.pages)
+    ]
+    print(f"Decoding {args.pages} pages of {ITEMS_PER_PAGE} issues, {len(bodies[0])} bytes each")
+
+    measure("Response.json", lambda body: make_response(body).json(), bodies)  # type: ignore
+    decoding_loads = decoding._fast_loads  # pylint: disable=protected-access
+    decoding._fast_loads = None  # pylint: disable=protected-access
+    measure(
+        "json + projection",
+        lambda body: [project_issue(item) for item in decoding.loads(body)],
+        bodies,
+    )
+    decoding._fast_loads = decoding_loads  # pylint: disable=protected-access
+    if decoding_loads is None:
+        print("orjson is not installed, pip install 'gitmine[fast]' to compare it")
+        return
+    measure(
+        "orjson + projection",
+        lambda body: [project_issue(item) for item in decoding.loads(body)],
+        bodies,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Benchmark *gitmine get* end to end against a local fake Github server.
+
+Each scenario runs the real CLI in a subprocess pointed at the stand-in server from
+tests/fake_github.py and reports wall time, time to the first printed row, the number of
+requests served, and the peak RSS of the process.
+
+Usage (with gitmine installed, e.g. pip install -e .):
+    python benchmarks/bench_get.py [--issues N] [--repos N] [--latency SECONDS] ...
+"""
+
+import argparse
+import os
+from pathlib import Path
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, NamedTuple, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tests"))
+
+from fake_github import FakeGithub  # noqa: E402  pylint: disable=wrong-import-position
+
+SCENARIOS = {
+    "issues": ["get", "issues"],
+    "prs": ["get", "prs"],
+    "all": ["get", "all"],
+    "issues-u": ["get", "issues", "-u"],
+}
+# Lines gitmine prints before any result
+STATUS_PREFIXES = ("Hang on", "Logging level")
+
+
+class Result(NamedTuple):
+    scenario: str
+    wall: float
+    first_row: float
+    requests: int
+    peak_rss_mb: float
+
+
+def make_item(repo_name: str, number: int, kind: str = "issues") -> Dict[str, Any]:
+    return {
+        "title": f"Benchmark {kind} number {number} with a realistic length title",
+        "number": number,
+        "labels": [{"id": 1, "name": "bug", "color": "d73a4a", "default": True}],
+        "html_url": f"https://github.com/{repo_name}/{kind}/{number}",
+        "created_at": f"2021-{1 + number % 12:02d}-{1 + number % 28:02d}T12:00:00Z",
+        "updated_at": "2021-12-01T12:00:00Z",
+        "state": "open",
+        "repository": {"full_name": repo_name},
+        "body": "x" * 500,
+        "user": {"login": "someone", "id": 1, "url": "https://api.github.com/users/someone"},
+    }
+
+
+def populate(fake: FakeGithub, args: argparse.Namespace) -> None:
+    repo_names = [f"bench/repo{i}" for i in range(args.repos)]
+    fake.add_listing(
+        "/issues", [make_item(repo_names[i % args.repos], i) for i in range(args.issues)]
+    )
+    fake.add_listing(
+        "/search/issues",
+        [make_item(repo_names[i % args.repos], i, "pull") for i in range(args.prs)],
+        search=True,
+    )
+    fake.add_listing("/user/repos", [{"full_name": name} for name in repo_names])
+    for name in repo_names:
+        fake.add_listing(
+            f"/repos/{name}/issues", [make_item(name, i) for i in range(args.issues_per_repo)]
+        )
+
+
+def run_scenario(
+    name: str, command: Sequence[str], fake: FakeGithub, home: Path, extra: Sequence[str]
+) -> Result:
+    env = dict(os.environ, HOME=str(home), GITMINE_API_URL=fake.url)
+    cli = [sys.executable, "-c", "from gitmine.gitmine import gitmine; gitmine()"]
+    requests_before = len(fake.requests)
+
+    start = time.perf_counter()
+    first_row = None
+    with tempfile.TemporaryFile(mode="w+") as stderr:
+        proc = subprocess.Popen(  # pylint: disable=consider-using-with
+            [*cli, *command, *extra],
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            universal_newlines=True,
+        )
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            if first_row is None and line.strip() and not line.startswith(STATUS_PREFIXES):
+                first_row = time.perf_counter() - start
+        proc.stdout.close()
+        # wait4 reaps the process and reports its own resource usage
+        _, status, rusage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - start
+        if not os.WIFEXITED(status) or os.WEXITSTATUS(status):
+            stderr.seek(0)
+            raise RuntimeError(f"{name} failed:\n{stderr.read()}")
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    rss_scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return Result(
+        name,
+        wall,
+        first_row if first_row is not None else wall,
+        len(fake.requests) - requests_before,
+        rusage.ru_maxrss / rss_scale,
+    )
+
+
+def write_config(home: Path) -> None:
+    config_dir = home / ".config" / "ghp"
+    config_dir.mkdir(parents=True)
+    (config_dir / "hosts.yml").write_text(
+        "github.com:\n  username: bench\n  token: bench-token\n", encoding="utf-8"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--issues", type=int, default=2000, help="assigned issues")
+    parser.add_argument("--prs", type=int, default=500, help="review-requested PRs")
+    parser.add_argument("--repos", type=int, default=50, help="collaborator repos")
+    parser.add_argument("--issues-per-repo", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per request")
+    parser.add_argument("--max-per-page", type=int, default=100)
+    parser.add_argument("--rate-limit", type=int, default=None, help="requests per window")
+    parser.add_argument("--rate-limit-window", type=float, default=60.0)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS), help="default: all of them"
+    )
+    parser.add_argument("gitmine_args", nargs="*", help="extra arguments for gitmine get, after --")
+    args = parser.parse_args()
+    extra = args.gitmine_args or ["--no-cache"]
+
+    results: List[Result] = []
+    with tempfile.TemporaryDirectory() as tmp, FakeGithub(
+        latency=args.latency,
+        max_per_page=args.max_per_page,
+        rate_limit=args.rate_limit,
+        rate_limit_window=args.rate_limit_window,
+    ) as fake:
+        write_config(Path(tmp))
+        populate(fake, args)
+        for name in args.scenario or SCENARIOS:
+            for _ in range(args.repeat):
+                results.append(run_scenario(name, SCENARIOS[name], fake, Path(tmp), extra))
+
+    print(f"{'scenario':<10} {'wall s':>8} {'1st row s':>10} {'requests':>9} {'peak RSS MB':>12}")
+    for result in results:
+        print(
+            f"{result.scenario:<10} {result.wall:>8.3f} {result.first_row:>10.3f} "
+            f"{result.requests:>9} {result.peak_rss_mb:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Micro-benchmark of building GithubElements from Github API objects.
+
+Compares the current compact element with the previous representation (a plain object
+holding the raw label dicts and a datetime parsed with *strptime*).
+
+Usage (with gitmine installed, e.g. pip install -e .):
+    python benchmarks/bench_github_elements.py [--items N]
+"""
+
+import argparse
+from datetime import datetime
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Mapping
+
+from gitmine.models.github_elements import GithubElement
+
+LABELS = ["bug", "enhancement", "good first issue", "help wanted", "question"]
+
+
+class LegacyElement:
+    """The element as it was stored before it became slotted."""
+
+    def __init__(self, obj: Mapping[str, Any]) -> None:
+        self.elem_type = "Issue"
+        self.title = obj["title"]
+        self.number = obj["number"]
+        self.url = obj["html_url"]
+        self.labels = obj["labels"]
+        self.created_at = datetime.strptime(obj["created_at"], "%Y-%m-%dT%H:%M:%SZ")
+        self.color_coded = True
+
+
+def make_api_objects(count: int) -> List[Dict[str, Any]]:
+    """API objects as *response.json()* would return them, labels freshly allocated."""
+    return [
+        {
+            "title": f"Issue number {i}",
+            "number": i,
+            "html_url": f"https://github.com/a/repo/issues/{i}",
+            "created_at": f"2021-{1 + i % 12:02d}-{1 + i % 28:02d}T12:34:56Z",
+            "labels": [
+                {
+                    "id": j,
+                    "name": "".join(LABELS[(i + j) % len(LABELS)]),
+                    "color": "ededed",
+                    "url": f"https://api.github.com/repos/a/repo/labels/{j}",
+                    "description": "A label",
+                    "default": False,
+                }
+                for j in range(2)
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def measure(name: str, build: Callable[[Mapping[str, Any]], Any], count: int) -> None:
+    objs = make_api_objects(count)
+    start = time.perf_counter()
+    elements = [build(obj) for obj in objs]
+    elapsed = time.perf_counter() - start
+    del elements
+
+    tracemalloc.start()
+    objs = make_api_objects(count)
+    elements = [build(obj) for obj in objs]
+    # What stays alive once the API objects are dropped is what a sweep keeps in memory
+    del objs
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del elements
+
+    print(
+        f"{name:<8} parse {elapsed / count * 1e6:6.2f} us/item   "
+        f"retained {retained / count:7.1f} bytes/item"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"Building {args.items} elements")
+    measure("legacy", LegacyElement, args.items)
+    measure(
+        "compact",
+        lambda obj: GithubElement.from_dict(obj, elem_type="Issue", color_coded=True),
+        args.items,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Benchmark how long gitmine takes to start, and fail when a command goes over budget.
+
+Each scenario runs the CLI in a fresh interpreter with *-X importtime* and reports the wall
+time of the process and the cumulative import time of gitmine's own modules and their
+dependencies. Scenarios are real invocations that exit before sending any request, and each
+may only import the heavy modules its command needs: never requests short of talking to Github.
+
+Usage (with gitmine installed, e.g. pip install -e .):
+    python benchmarks/bench_startup.py [--repeat N] [--budget-scale X]
+"""
+
+import argparse
+import os
+from pathlib import Path
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+# Modules that only the commands talking to Github may pull in
+HEAVY_MODULES = ("requests", "furl", "tabulate", "yaml", "sqlite3")
+
+
+class Scenario(NamedTuple):
+    args: Sequence[str]
+    # Wall time budget in seconds on a developer machine
+    budget: float
+    # Modules of HEAVY_MODULES this command needs
+    allowed: Tuple[str, ...] = ()
+    # Run before the CLI, e.g. to stub what would leave the process
+    prelude: str = ""
+
+
+# Never opens a browser
+NO_LAUNCH = "import click; click.launch = lambda *args, **kwargs: 0; "
+
+# Real invocations, which all exit before sending any request
+SCENARIOS: Dict[str, Scenario] = {
+    "--version": Scenario(["--version"], 0.25),
+    "--help": Scenario(["--help"], 0.25),
+    "go --help": Scenario(["go", "--help"], 0.25),
+    "get --help": Scenario(["get", "--help"], 0.25),
+    "config username": Scenario(["config", "username"], 0.3, ("yaml",)),
+    "go owner/repo": Scenario(["go", "owner/repo", "12"], 0.25, ("sqlite3",), NO_LAUNCH),
+    "get --explain": Scenario(["get", "all", "-u", "--explain"], 0.6, HEAVY_MODULES),
+}
+IMPORT_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)")
+
+
+class Result(NamedTuple):
+    scenario: str
+    wall: float
+    import_ms: float
+    heavy: List[str]
+    budget: float
+
+
+def run_scenario(name: str, scenario: Scenario, home: Path) -> Result:
+    env = dict(os.environ, HOME=str(home))
+    cli = [
+        sys.executable,
+        "-X",
+        "importtime",
+        "-c",
+        f"{scenario.prelude}from gitmine.gitmine import gitmine; gitmine()",
+    ]
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [*cli, *scenario.args],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=False,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode:
+        raise RuntimeError(f"{name} failed:\n{proc.stderr}")
+
+    import_us = 0
+    heavy = []
+    for line in proc.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, module = match.groups()
+        # Top level imports only, their cumulative time covers everything below them
+        if len(indent) == 1:
+            import_us += int(cumulative)
+        if module in HEAVY_MODULES and module not in scenario.allowed:
+            heavy.append(module)
+    return Result(name, wall, import_us / 1000, heavy, scenario.budget)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="keep the best of N runs")
+    parser.add_argument(
+        "--budget-scale", type=float, default=1.0, help="multiply every budget, e.g. on slow CI"
+    )
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        home = Path(tmp)
+        credentials = home / ".config" / "ghp" / "hosts.yml"
+        credentials.parent.mkdir(parents=True)
+        credentials.write_text("github.com:\n  username: me\n  token: token\n")
+        for name, scenario in SCENARIOS.items():
+            runs = [run_scenario(name, scenario, home) for _ in range(args.repeat)]
+            results.append(min(runs, key=lambda result: result.wall))
+
+    failed = False
+    print(f"{'scenario':<16} {'wall s':>8} {'budget s':>9} {'imports ms':>11}  heavy modules")
+    for result in results:
+        budget = result.budget * args.budget_scale
+        over = result.wall > budget or bool(result.heavy)
+        failed = failed or over
+        print(
+            f"{result.scenario:<16} {result.wall:>8.3f} {budget:>9.3f} {result.import_ms:>11.1f}  "
+            f"{', '.join(result.heavy) or '-'}{'  <-- over budget' if over else ''}"
+        )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+from typing import Any, Iterable, List, Mapping
+
+import click
+from furl import furl
+import requests
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from gitmine.constants import ISSUE
+from gitmine.decoding import loads, project_issue
+from gitmine.endpoints import REPOS_ENDPOINT
+from gitmine.models.github_elements import GithubElement, RepoDict, Repository
+from gitmine.tracing import get_tracer, span
+from gitmine.utils import PER_PAGE, safe_request_async
+
+logger = logging.getLogger()
+
+
+def _import_aiohttp() -> Any:
+    try:
+        import aiohttp  # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+        raise click.ClickException(
+            "The async backend requires aiohttp. Install it with: pip install 'gitmine[async]'"
+        ) from e
+    return aiohttp
+
+
+async def _get(
+    session: Any, url: furl, params: Mapping[str, str], headers: Mapping[str, str]
+) -> Response:
+    """Send a GET with aiohttp, as the *requests* Response *safe_request* would have got."""
+    aiohttp = _import_aiohttp()
+    start = time.perf_counter()
+    try:
+        async with session.get(str(url), params=params, headers=headers) as raw:
+            headers_at = time.perf_counter()
+            body = await raw.read()
+    except aiohttp.ClientConnectionError as e:
+        raise requests.exceptions.ConnectionError(str(e)) from e
+    end = time.perf_counter()
+
+    response = Response()
+    response.status_code = raw.status
+    response.url = str(raw.url)
+    response.headers = CaseInsensitiveDict(raw.headers)
+    response.encoding = "utf-8"
+    response._content = body  # pylint: disable=protected-access
+    tracer = get_tracer()
+    if tracer is not None:
+        tracer.add_request(
+            raw.method,
+            response.url,
+            raw.status,
+            response.headers,
+            start=start,
+            headers_at=headers_at,
+            end=end,
+        )
+    return response
+
+
+async def _paginate(
+    session: Any, url: furl, headers: Mapping[str, str], params: Mapping[str, str]
+) -> List[Any]:
+    """Follow *rel="next"* links of a Github listing, through *safe_request_async*."""
+
+    async def send(
+        page_url: furl, page_params: Mapping[str, str], page_headers: Mapping[str, str]
+    ) -> Response:
+        return await _get(session, page_url, page_params, page_headers)
+
+    items: List[Any] = []
+    next_url, next_params = url, {**params, "per_page": str(PER_PAGE)}
+    while True:
+        response = await safe_request_async(send, next_url, headers, next_params)
+        with span("decode", "json"):
+            items.extend(project_issue(item) for item in loads(response.content))
+        next_link = response.links.get("next")
+        if not next_link:
+            return items
+        next_url, next_params = furl(next_link["url"]), {}
+
+
+async def _sweep_repos(
+    repo_names: Iterable[str],
+    params: Mapping[str, str],
+    headers: Mapping[str, str],
+    color: bool,
+    concurrency: int,
+) -> List[Repository]:
+    aiohttp = _import_aiohttp()
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=concurrency)
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+
+        async def get_issues_by_repo(repo_name: str) -> Repository:
+            url = REPOS_ENDPOINT.copy()
+            url.path = url.path / repo_name / "issues"
+            async with semaphore:
+                issues = await _paginate(session, url, headers, params)
+            repo = Repository(name=repo_name)
+            for issue in issues:
+                if "pull_request" in issue:
+                    continue
+                repo.add_issue(GithubElement.from_dict(issue, elem_type=ISSUE, color_coded=color))
+            return repo
+
+        return await asyncio.gather(*(get_issues_by_repo(name) for name in repo_names))
+
+
+def get_issues_by_repos(
+    repo_names: Iterable[str],
+    params: Mapping[str, str],
+    headers: Mapping[str, str],
+    color: bool,
+    concurrency: int,
+) -> RepoDict:
+    """Fetch the issues of every repo in *repo_names* on a single event loop.
+
+    At most *concurrency* requests are in flight at once and connections are kept alive
+    across repos. Requests go through the same response cache, rate limit scheduler (and
+    its retries) and tracing as those of the threads backend.
+    """
+    logger.debug(f"Sweeping repos with the async backend, concurrency={concurrency}")
+    repos = asyncio.run(_sweep_repos(repo_names, params, headers, color, concurrency))
+    return RepoDict(
+        Repository,  # type: ignore
+        {repo.name: repo for repo in repos if repo.has_issues()},
+    )
@@ -0,0 +1,219 @@
+import functools
+import json
+import logging
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import click
+
+from gitmine.constants import ISSUE, PULL_REQUEST
+from gitmine.decoding import loads
+from gitmine.endpoints import GRAPHQL_ENDPOINT
+from gitmine.filters import IssueFilters
+from gitmine.models.github_elements import GithubElement, RepoDict
+from gitmine.tracing import span
+from gitmine.utils import PER_PAGE, get_session, safe_request
+
+logger = logging.getLogger()
+
+# Keeps each document well below Github's node limit while still batching many repos
+MAX_ALIASES_PER_QUERY = 50
+
+# Only the fields GithubElement.from_dict reads, plus the repository they belong to
+_ELEMENT_FIELDS = (
+    "title number url createdAt repository { nameWithOwner } labels(first: 20) { nodes { name } }"
+)
+FRAGMENTS = (
+    f"fragment IssueFields on Issue {{ {_ELEMENT_FIELDS} }}\n"
+    f"fragment PullRequestFields on PullRequest {{ {_ELEMENT_FIELDS} }}\n"
+)
+_PAGE_INFO = "pageInfo { hasNextPage endCursor }"
+_ELEMENT_NODES = (
+    "nodes { ... on Issue { ...IssueFields } ... on PullRequest { ...PullRequestFields } }"
+)
+
+# A selection renders the aliased field of a query given its pagination arguments
+Selection = Callable[[str], str]
+
+
+def _search(query: str) -> Selection:
+    def select(after: str) -> str:
+        return (
+            f"search(type: ISSUE, first: {PER_PAGE}{after}, query: {json.dumps(query)}) "
+            f"{{ {_PAGE_INFO} {_ELEMENT_NODES} }}"
+        )
+
+    return select
+
+
+def _repo_issues(repo_name: str, asc: bool, unassigned: bool) -> Selection:
+    owner, name = repo_name.split("/", 1)
+    direction = "ASC" if asc else "DESC"
+    # Github documents a null assignee filter as "issues with no assigned user"
+    filter_by = ", filterBy: {assignee: null}" if unassigned else ""
+
+    def select(after: str) -> str:
+        return (
+            f"repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{ "
+            f"issues(first: {PER_PAGE}{after}, states: OPEN{filter_by}, "
+            f"orderBy: {{field: CREATED_AT, direction: {direction}}}) "
+            f"{{ {_PAGE_INFO} {_ELEMENT_NODES} }} }}"
+        )
+
+    return select
+
+
+def _collaborator_repos(after: str) -> str:
+    return (
+        f"viewer {{ repositories(first: {PER_PAGE}{after}, affiliations: [COLLABORATOR]) "
+        f"{{ {_PAGE_INFO} nodes {{ nameWithOwner }} }} }}"
+    )
+
+
+def graphql_request(document: str, headers: Mapping[str, str]) -> Any:
+    """Run a GraphQL document against Github and return its *data*."""
+    request_func = functools.partial(get_session().post, json={"query": document})
+    response = safe_request(request_func, GRAPHQL_ENDPOINT, headers, {}, cacheable=False)
+    with span("decode", "json"):
+        body = loads(response.content)
+    if body.get("errors") and not body.get("data"):
+        messages = "; ".join(error.get("message", "") for error in body["errors"])
+        raise click.ClickException(f"GraphQL query failed: {messages}")
+    for error in body.get("errors") or []:
+        logger.warning(f"GraphQL error: {error.get('message')}")
+    return body["data"]
+
+
+def _connection(value: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Descend through wrapping objects (repository, viewer) to the paginated connection."""
+    while "pageInfo" not in value:
+        value = next(iter(value.values()))
+    return value
+
+
+def fetch_selections(
+    selections: Mapping[str, Selection], headers: Mapping[str, str]
+) -> Dict[str, List[Any]]:
+    """Fetch every page of every aliased selection, batching aliases into few documents."""
+    nodes: Dict[str, List[Any]] = {alias: [] for alias in selections}
+    pending: Dict[str, Optional[str]] = {alias: None for alias in selections}
+
+    while pending:
+        batch = list(pending.items())[:MAX_ALIASES_PER_QUERY]
+        fields = "\n".join(
+            f"  {alias}: {selections[alias](f', after: {json.dumps(cursor)}' if cursor else '')}"
+            for alias, cursor in batch
+        )
+        logger.debug(f"Running GraphQL query with {len(batch)} aliases")
+        data = graphql_request(f"query {{\n{fields}\n}}\n{FRAGMENTS}", headers)
+
+        for alias, _ in batch:
+            del pending[alias]
+            if not data.get(alias):
+                logger.warning(f"No data returned for GraphQL alias {alias}")
+                continue
+            connection = _connection(data[alias])
+            nodes[alias].extend(node for node in connection["nodes"] if node)
+            if connection["pageInfo"]["hasNextPage"]:
+                pending[alias] = connection["pageInfo"]["endCursor"]
+
+    return nodes
+
+
+def _node_to_dict(node: Mapping[str, Any]) -> Dict[str, Any]:
+    """Reshape a GraphQL node like the REST objects *GithubElement.from_dict* expects."""
+    return {
+        "title": node["title"],
+        "number": node["number"],
+        "html_url": node["url"],
+        "created_at": node["createdAt"],
+        "labels": node["labels"]["nodes"],
+    }
+
+
+def _add_nodes(repositories: RepoDict, nodes: List[Any], elem_type: str, color: bool) -> None:
+    for node in nodes:
+        elem = GithubElement.from_dict(_node_to_dict(node), elem_type=elem_type, color_coded=color)
+        repo = repositories[node["repository"]["nameWithOwner"]]
+        if elem_type == PULL_REQUEST:
+            repo.add_pr(elem)
+        else:
+            repo.add_issue(elem)
+
+
+def plan_rounds(
+    *, issues: bool, prs: bool, unassigned: bool, repo_name: str
+) -> Tuple[List[str], bool]:
+    """What *get_elements* requests: the aliases of its first documents, and whether the
+    unassigned issues of each repo are requested next.
+
+    The aliases are "issues" (assigned to the user), "repos" (collaborator repos) and "prs".
+    """
+    owner, _, name = repo_name.partition("/")
+    if repo_name and not (owner and name and "/" not in name):
+        raise click.BadParameter(f"{repo_name} is not of the form owner/name.", param_hint="--repo")
+    aliases = []
+    if issues and not unassigned:
+        aliases.append("issues")
+    if issues and unassigned and not repo_name:
+        aliases.append("repos")
+    if prs:
+        aliases.append("prs")
+    return aliases, issues and unassigned
+
+
+def get_elements(
+    headers: Mapping[str, str],
+    *,
+    issues: bool,
+    prs: bool,
+    unassigned: bool,
+    repo_name: str,
+    asc: bool,
+    color: bool,
+    filters: IssueFilters = IssueFilters(),
+) -> Tuple[RepoDict, RepoDict]:
+    """Get Issues and/or review-requested PRs in as few GraphQL round trips as possible.
+
+    Assigned issues, PRs and the collaborator repo list share one document; unassigned issues
+    of each repo are then requested under one alias per repo. Filters turn repo listings into
+    searches, which take them all as qualifiers.
+    """
+    aliases, sweep_repos = plan_rounds(
+        issues=issues, prs=prs, unassigned=unassigned, repo_name=repo_name
+    )
+    sort = "sort:created-asc" if asc else "sort:created-desc"
+    qualifiers = "".join(f" {qualifier}" for qualifier in filters.qualifiers())
+
+    def repo_issues(name: str, no_assignee: bool) -> Selection:
+        if not filters:
+            return _repo_issues(name, asc, no_assignee)
+        assignee = " no:assignee" if no_assignee else ""
+        return _search(f"repo:{name} is:open is:issue{assignee} {sort}{qualifiers}")
+
+    def select(alias: str) -> Selection:
+        if alias == "issues" and repo_name:
+            return repo_issues(repo_name, no_assignee=False)
+        if alias == "issues":
+            return _search(f"is:open is:issue assignee:@me {sort}{qualifiers}")
+        if alias == "repos":
+            return _collaborator_repos
+        return _search(f"is:open is:pr review-requested:@me{qualifiers}")
+
+    selections = {alias: select(alias) for alias in aliases}
+    nodes = fetch_selections(selections, headers)
+
+    if sweep_repos:
+        repo_names = [repo_name] if repo_name else [r["nameWithOwner"] for r in nodes["repos"]]
+        repo_selections = {
+            f"repo{i}": repo_issues(name, no_assignee=True) for i, name in enumerate(repo_names)
+        }
+        nodes["issues"] = [
+            node
+            for repo_nodes in fetch_selections(repo_selections, headers).values()
+            for node in repo_nodes
+        ]
+
+    issue_repos, pr_repos = RepoDict(), RepoDict()
+    _add_nodes(issue_repos, nodes.get("issues", []), ISSUE, color)
+    _add_nodes(pr_repos, nodes.get("prs", []), PULL_REQUEST, color)
+    return issue_repos, pr_repos
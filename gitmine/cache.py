@@ -0,0 +1,167 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Dict, Mapping, Optional, Tuple
+
+from furl import furl
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger()
+
+DEFAULT_MAX_CACHE_SIZE = 50 * 1024 * 1024  # bytes
+CACHED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Link")
+
+
+class CachedResponse:
+    """Body and headers of a previously seen 200 response."""
+
+    def __init__(self, url: str, headers: Dict[str, str], body: bytes, stored_at: float) -> None:
+        self.url = url
+        self.headers = headers
+        self.body = body
+        self.stored_at = stored_at
+
+    def is_fresh(self, max_age: int) -> bool:
+        return time.time() - self.stored_at < max_age
+
+    def validators(self) -> Dict[str, str]:
+        """Headers turning the next request for this resource into a conditional one."""
+        validators = {}
+        if "ETag" in self.headers:
+            validators["If-None-Match"] = self.headers["ETag"]
+        if "Last-Modified" in self.headers:
+            validators["If-Modified-Since"] = self.headers["Last-Modified"]
+        return validators
+
+    def to_response(self) -> Response:
+        response = Response()
+        response.status_code = 200
+        response.url = self.url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = "utf-8"
+        response._content = self.body  # pylint: disable=protected-access
+        response._content_consumed = True  # pylint: disable=protected-access
+        return response
+
+
+class ResponseCache:
+    """Size-bounded, least-recently-used on-disk cache of Github API responses.
+
+    Each entry is a pair of files named after a hash of the URL, the query parameters and
+    the Authorization header, so different accounts never share entries.
+    """
+
+    def __init__(
+        self, directory: Path, *, max_age: int = 0, max_size: int = DEFAULT_MAX_CACHE_SIZE
+    ) -> None:
+        self.directory = directory
+        self.max_age = max_age
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(url: furl, params: Mapping[str, str], headers: Mapping[str, str]) -> str:
+        token_hash = hashlib.sha256(headers.get("Authorization", "").encode()).hexdigest()
+        raw = json.dumps([str(url), sorted(params.items()), token_hash])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as handle:
+                meta = json.load(handle)
+            body = body_path.read_bytes()
+            os.utime(body_path)  # bump recency for LRU eviction
+        except (OSError, ValueError):
+            return None
+        return CachedResponse(meta["url"], meta["headers"], body, meta["stored_at"])
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as fresh again after a 304."""
+        meta_path, _ = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as handle:
+                meta = json.load(handle)
+            meta["stored_at"] = time.time()
+            self._write(meta_path, json.dumps(meta).encode())
+        except (OSError, ValueError):
+            pass
+
+    def put(self, key: str, response: Response) -> None:
+        headers = {
+            name: response.headers[name] for name in CACHED_HEADERS if name in response.headers
+        }
+        meta = {"url": response.url, "headers": headers, "stored_at": time.time()}
+        meta_path, body_path = self._paths(key)
+        try:
+            # The body this one replaces, if any, no longer counts against the budget
+            previous_size = body_path.stat().st_size
+        except OSError:
+            previous_size = 0
+        try:
+            self._write(body_path, response.content)
+            self._write(meta_path, json.dumps(meta).encode())
+        except OSError as e:
+            logger.debug(f"Could not write cache entry for {response.url}: {e}")
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(p.stat().st_size for p in self.directory.glob("*.body"))
+            else:
+                self._size += len(response.content) - previous_size
+            if self._size > self.max_size:
+                self._evict()
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits in half its budget."""
+        bodies = []
+        for body_path in self.directory.glob("*.body"):
+            try:
+                stat = body_path.stat()
+            except OSError:
+                continue
+            bodies.append((stat.st_mtime, stat.st_size, body_path))
+        bodies.sort()
+
+        size = sum(entry[1] for entry in bodies)
+        for _, body_size, body_path in bodies:
+            if size <= self.max_size // 2:
+                break
+            for path in (body_path, body_path.with_suffix(".json")):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            size -= body_size
+        logger.debug(f"Evicted response cache down to {size} bytes")
+        self._size = size
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def set_response_cache(cache: Optional[ResponseCache]) -> None:
+    """Install the cache consulted by *safe_request*, or disable caching with None."""
+    global _response_cache  # pylint: disable=global-statement
+    _response_cache = cache
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    return _response_cache
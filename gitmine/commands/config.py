@@ -1,31 +1,44 @@
 import logging
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import click
-import yaml
 
+from gitmine.hosts import GITHUB_HOST, Host, default_api_url
 from gitmine.paths import GH_CREDENTIALS_PATH, GHP_CREDENTIALS_DIR, GHP_CREDENTIALS_PATH
 
 logger = logging.getLogger()
 
+# Properties of an account on a host other than github.com
+HOST_PROPS = ("username", "token", "api_url")
+
 
 class GithubConfig:
-    """Github Config object, holds information about username and bearer token"""
+    """Github Config object, holds information about username and bearer token
+
+    Accounts on other hosts, e.g. Github Enterprise instances, are kept next to the one on
+    github.com, under the name of their host.
+    """
 
     def __init__(self) -> None:
         self.token = ""
         self.username = ""
+        # host -> HOST_PROPS values
+        self.other_hosts: Dict[str, Dict[str, str]] = {}
 
-    def get_value(self, prop: str) -> Optional[str]:
-        if prop == "token":
+    def get_value(self, prop: str, host: str = GITHUB_HOST) -> Optional[str]:
+        if host != GITHUB_HOST and prop in HOST_PROPS:
+            return self.other_hosts.get(host, {}).get(prop)
+        elif prop == "token":
             return self.token
         elif prop == "username":
             return self.username
         raise click.BadArgumentUsage(message=f"Unknown property specified: {prop}")
 
-    def set_prop(self, prop: str, value: str) -> None:
-        if prop == "token":
+    def set_prop(self, prop: str, value: str, host: str = GITHUB_HOST) -> None:
+        if host != GITHUB_HOST and prop in HOST_PROPS:
+            self.other_hosts.setdefault(host, {})[prop] = value
+        elif prop == "token":
             self.token = value
         elif prop == "username":
             self.username = value
@@ -33,51 +46,80 @@ class GithubConfig:
             raise click.BadArgumentUsage(message=f"Unknown property specified: {prop}")
 
     def config_as_dict(self) -> Dict[str, Dict[str, str]]:
-        return {"github.com": {"username": self.username, "token": self.token}}
+        return {GITHUB_HOST: {"username": self.username, "token": self.token}, **self.other_hosts}
+
+    def hosts(self) -> List[Host]:
+        """Every configured host, github.com first."""
+        hosts = []
+        if self.token or not self.other_hosts:
+            hosts.append(Host(GITHUB_HOST, self.username, self.token, default_api_url(GITHUB_HOST)))
+        for name, values in self.other_hosts.items():
+            hosts.append(
+                Host(
+                    name,
+                    values.get("username", ""),
+                    values.get("token", ""),
+                    values.get("api_url") or default_api_url(name),
+                )
+            )
+        return hosts
 
     @staticmethod
     def load_config_from_yaml(path_to_yaml_file: Path) -> "GithubConfig":
+        import yaml  # pylint: disable=import-outside-toplevel
+
         with open(path_to_yaml_file, "r", encoding="utf-8") as handle:
             gh_yaml = yaml.load(handle, Loader=yaml.FullLoader)
             github_config = GithubConfig()
 
-            if gh_yaml:
-                gh_yaml_github = gh_yaml["github.com"]
-                try:
-                    username = gh_yaml_github["username"]
-                    token = gh_yaml_github["token"]
-                except KeyError:
-                    # Copying from GH credentials
-                    username = gh_yaml_github["user"]
-                    token = gh_yaml_github["oauth_token"]
+            for host, values in (gh_yaml or {}).items():
+                # Our own credentials, or the ones copied from GH credentials
+                username = values.get("username", values.get("user"))
+                token = values.get("token", values.get("oauth_token"))
 
-                github_config.set_prop("username", username)
-                github_config.set_prop("token", token)
+                github_config.set_prop("username", username or "", host)
+                github_config.set_prop("token", token or "", host)
+                if values.get("api_url"):
+                    github_config.set_prop("api_url", values["api_url"], host)
 
         return github_config
 
 
-def config_command(ctx: click.Context, prop: str, value: str) -> None:
+class LazyGithubConfig:
+    """Stand-in for the GithubConfig that reads it from disk on first use."""
+
+    def __init__(self) -> None:
+        self._config: Optional[GithubConfig] = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._config is None:
+            self._config = get_or_create_github_config()
+        return getattr(self._config, name)
+
+
+def config_command(ctx: click.Context, prop: str, value: str, host: str = GITHUB_HOST) -> None:
     """Implementation of the *config* command"""
     if not value and prop:
-        click.echo(ctx.obj.get_value(prop))
+        click.echo(ctx.obj.get_value(prop, host))
 
     elif value:
-        ctx.obj.set_prop(prop, value)
+        ctx.obj.set_prop(prop, value, host)
 
         if not GHP_CREDENTIALS_PATH.exists():
             GHP_CREDENTIALS_PATH.touch()
 
         ghp_config = GithubConfig.load_config_from_yaml(GHP_CREDENTIALS_PATH)
-        ghp_config.set_prop(prop, value)
+        ghp_config.set_prop(prop, value, host)
         set_config(ghp_config.config_as_dict())
 
-        logger.info(f"Config {prop} {value} written at {GHP_CREDENTIALS_PATH}")
+        logger.info(f"Config {prop} {value} of {host} written at {GHP_CREDENTIALS_PATH}")
         click.echo(value)
 
 
 def set_config(config_dict: Dict[str, Dict[str, str]]) -> None:
     """Set config file based on dictionary of config values."""
+    import yaml  # pylint: disable=import-outside-toplevel
+
     with open(GHP_CREDENTIALS_PATH, "w+", encoding="utf-8") as handle:
         yaml.dump(config_dict, handle)
 
@@ -0,0 +1,212 @@
+import json
+import logging
+import os
+from pathlib import Path
+import signal
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Dict, List, Mapping, NoReturn, Sequence
+
+import click
+
+from gitmine.cache import ResponseCache, set_response_cache
+from gitmine.commands.get import format_info
+from gitmine.commands.sync import sync_index
+from gitmine.hosts import GITHUB_HOST
+from gitmine.index import ASSIGNED, REVIEW_REQUESTED, UNASSIGNED, IssueIndex
+from gitmine.paths import GHP_CACHE_DIR, GHP_DAEMON_SOCKET, GHP_INDEX_PATH
+from gitmine.utils import RequestScheduler, get_scheduler, set_scheduler
+
+logger = logging.getLogger()
+
+# Seconds a request waits for the first sync before the client fetches directly instead
+READY_TIMEOUT = 2.0
+
+
+class GitmineDaemon:
+    """Keeps the local index fresh and answers *get* requests from it over a Unix socket.
+
+    The index is synced every *interval* seconds, or later if the rate limit is exhausted,
+    through one scheduler, response cache and set of keep-alive sessions that live as long as
+    the daemon.
+    """
+
+    def __init__(
+        self,
+        socket_path: Path,
+        index_path: Path,
+        username: str,
+        headers: Mapping[str, str],
+        *,
+        unassigned: bool,
+        interval: float,
+        concurrency: int,
+        host_names: Sequence[str] = (GITHUB_HOST,),
+    ) -> None:
+        self.socket_path = socket_path
+        self.index_path = index_path
+        self.username = username
+        self.headers = headers
+        self.unassigned = unassigned
+        self.interval = interval
+        self.concurrency = concurrency
+        # Every configured host, of which only github.com is synced
+        self.host_names = host_names
+        self.synced_at = 0.0
+        self.ready = threading.Event()
+        # Set once the first refresh is over, whether or not it succeeded
+        self.refreshed = threading.Event()
+        # Why the last refresh failed, if it did
+        self.refresh_error = ""
+        self.stopped = threading.Event()
+        # Set to refresh the index before the interval is over
+        self.wake = threading.Event()
+        self.server = socketserver.ThreadingUnixStreamServer(
+            str(socket_path), _make_handler(self), bind_and_activate=False
+        )
+        self.server.daemon_threads = True
+
+    def refresh(self) -> None:
+        index = IssueIndex(self.index_path)
+        try:
+            issues, prs = sync_index(
+                index,
+                self.username,
+                self.headers,
+                unassigned=self.unassigned,
+                concurrency=self.concurrency,
+            )
+        finally:
+            index.close()
+        self.synced_at = time.time()
+        self.ready.set()
+        logger.info(f"Updated {issues} issues and {prs} PRs in the index")
+
+    def refresh_forever(self) -> None:
+        while not self.stopped.is_set():
+            try:
+                self.refresh()
+                self.refresh_error = ""
+            except click.ClickException as e:
+                logger.warning(f"Refreshing the index failed: {e.format_message()}")
+                self.refresh_error = e.format_message()
+            self.refreshed.set()
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            # Never poll faster than the rate limit allows, even when asked to refresh
+            self.stopped.wait(max(0.0, get_scheduler().paused_until - time.time()))
+
+    def answer(self, request: Mapping[str, Any]) -> Dict[str, Any]:
+        """Reply to a *get* request with the sections *echo_info* would print.
+
+        A *refresh* request instead has the index refreshed now, e.g. for *go*.
+        """
+        if request.get("refresh"):
+            self.wake.set()
+            return {"refreshing": True}
+        if request["unassigned"] and not self.unassigned:
+            return {"error": "unassigned issues are not synced, start the daemon with -u"}
+        if set(request.get("hosts") or self.host_names) != {GITHUB_HOST} or (
+            request["repo_name"].count("/") > 1
+        ):
+            return {"error": "only github.com is synced"}
+        if not self.refreshed.wait(READY_TIMEOUT):
+            return {"error": "the first sync is still running"}
+        if not self.ready.is_set():
+            return {"error": f"the first sync failed: {self.refresh_error}"}
+
+        kinds = []
+        if request["spec"] in ("issues", "all"):
+            kinds.append((UNASSIGNED if request["unassigned"] else ASSIGNED, "issues"))
+        if request["spec"] in ("prs", "all"):
+            kinds.append((REVIEW_REQUESTED, "prs"))
+
+        sections: List[Dict[str, Any]] = []
+        index = IssueIndex(self.index_path)
+        try:
+            for kind, elem in kinds:
+                repos = index.load(
+                    kind, repo_name=request["repo_name"], asc=request["asc"], color=request["color"]
+                )
+                sections.append({"text": format_info(repos, elem), "empty": not repos})
+        finally:
+            index.close()
+        return {"sections": sections, "age": time.time() - self.synced_at}
+
+    def serve_forever(self) -> None:
+        # Created private rather than restricted once bound, before anything else runs
+        umask = os.umask(0o177)
+        try:
+            self.server.server_bind()
+        finally:
+            os.umask(umask)
+        self.server.server_activate()
+        threading.Thread(target=self.refresh_forever, daemon=True).start()
+        try:
+            self.server.serve_forever()
+        finally:
+            self.stopped.set()
+            self.wake.set()
+            self.server.server_close()
+            self.socket_path.unlink()
+
+    def shutdown(self) -> None:
+        self.server.shutdown()
+
+
+def _make_handler(daemon: GitmineDaemon) -> type:
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            try:
+                reply = daemon.answer(json.loads(self.rfile.readline()))
+            except Exception as e:  # pylint: disable=broad-except
+                logger.exception("Failed to answer a request")
+                reply = {"error": str(e)}
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+    return Handler
+
+
+def _remove_stale_socket(path: Path) -> None:
+    if not path.exists():
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError:
+            logger.info(f"Removing stale socket {path}")
+            path.unlink()
+            return
+    raise click.ClickException(f"A daemon is already listening on {path}")
+
+
+def _exit(*_: Any) -> NoReturn:
+    raise SystemExit(0)
+
+
+def daemon_command(ctx: click.Context, unassigned: bool, interval: int, concurrency: int) -> None:
+    """Implementation of the *daemon* command."""
+    headers = {"Authorization": f"Bearer {ctx.obj.get_value('token')}"}
+    # Conditional requests answered with 304 do not count against the rate limit
+    set_response_cache(ResponseCache(GHP_CACHE_DIR))
+    set_scheduler(RequestScheduler(concurrency))
+
+    _remove_stale_socket(GHP_DAEMON_SOCKET)
+    daemon = GitmineDaemon(
+        GHP_DAEMON_SOCKET,
+        GHP_INDEX_PATH,
+        ctx.obj.get_value("username"),
+        headers,
+        unassigned=unassigned,
+        interval=interval,
+        concurrency=concurrency,
+        host_names=[host.name for host in ctx.obj.hosts()],
+    )
+    signal.signal(signal.SIGTERM, _exit)
+    click.echo(f"Listening on {GHP_DAEMON_SOCKET}, refreshing every {interval}s.")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
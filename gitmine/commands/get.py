@@ -1,125 +1,349 @@
-import concurrent.futures
+import heapq
+import itertools
 import logging
 import re
-import threading
-from typing import Any, Mapping
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
 import click
-import requests
-from tabulate import tabulate
+from furl import furl
+from tabulate import WIDE_CHARS_MODE, tabulate
 
-from gitmine.constants import ISSUE, PULL_REQUEST
-from gitmine.endpoints import ISSUES_ENDPOINT, REPOS_ENDPOINT, SEARCH_ENDPOINT, USER_ENDPOINT
-from gitmine.models.github_elements import GithubElement, RepoDict, Repository
-from gitmine.utils import SafeSession, safe_request
+try:
+    from wcwidth import wcswidth
+except ImportError:  # pragma: no cover
+    wcswidth = None
+
+from gitmine.backends import async_backend, graphql_backend
+from gitmine.backends.graphql_backend import MAX_ALIASES_PER_QUERY
+from gitmine.cache import ResponseCache, set_response_cache
+from gitmine.constants import (
+    ASYNC_BACKEND,
+    DEFAULT_CONCURRENCY,
+    GRAPHQL_BACKEND,
+    ISSUE,
+    MAX_ELEMS_TO_STDOUT,
+    PULL_REQUEST,
+    REPO_NAME_COLOR,
+    SECTION_SEPARATOR,
+    TABLE_FORMAT,
+    THREADS_BACKEND,
+)
+from gitmine.decoding import project_issue
+from gitmine.endpoints import (
+    GRAPHQL_ENDPOINT,
+    ISSUES_ENDPOINT,
+    REPOS_ENDPOINT,
+    SEARCH_ENDPOINT,
+    USER_ENDPOINT,
+)
+from gitmine.filters import IssueFilters
+from gitmine.hosts import GITHUB_HOST, Host, current_host, use_host
+from gitmine.index import ASSIGNED, REVIEW_REQUESTED, UNASSIGNED, IssueIndex
+from gitmine.models.github_elements import GithubElement, RepoDict, Repository, style
+from gitmine.output import RecordWriter
+from gitmine.paths import GHP_CACHE_DIR, GHP_INDEX_PATH
+from gitmine.search import SEARCH_RESULTS_CAP, search_issues
+from gitmine.utils import (
+    PER_PAGE,
+    ContextExecutor,
+    RequestScheduler,
+    get_executor,
+    log_duration,
+    paginate,
+    set_scheduler,
+)
 
 logger = logging.getLogger()
-thread_local = threading.local()
 
+T = TypeVar("T")
 
-def get_session() -> Any:
-    if not hasattr(thread_local, "session"):
-        thread_local.session = SafeSession()
-    return thread_local.session
+# The SGR codes of click.style, which tabulate leaves out of cell widths
+_ANSI_CODES = re.compile(r"\x1b\[[0-9;]*m")
+# Repositories measured before *stream_table* prints the first one
+STREAM_LOOKAHEAD = 20
+# Least widths of the number, title, labels and age columns once a streamed table fixes them,
+# with room for any "#number" and "days ago"
+STREAM_MIN_WIDTHS = (len("#9999999"), 50, 20, len("9999 days ago"))
 
 
-def get_prs(ctx: click.Context, color: bool, headers: Mapping[str, str]) -> RepoDict:
-    """Get all Github PRs assigned to user."""
-    username = ctx.obj.get_value("username")
-    logger.debug(f"Fetching PRs for {username} from github.com \n")
-    url = SEARCH_ENDPOINT.copy()
-    query_params = " ".join(["is:open", "is:pr", f"review-requested:{username}"])
-    url.add(path="/issues", args={"q": query_params})
-    response = safe_request(requests.get, url, headers, {})
-    prs = response.json()["items"]
+def pr_repo_name(pr: Mapping[str, Any]) -> str:
+    """Full name of the repository a PR search result belongs to."""
+    return str(re.findall(r"^\w+://[^/]+/(.+?)/pull/", pr["html_url"])[0])
 
-    repositories = RepoDict()
-    for pr in prs:
-        url = pr["html_url"]
-        repo_name = re.findall(r"github.com/(.+?)/pull", url)[0]
-        repositories[repo_name].add_pr(
-            GithubElement.from_dict(pr, elem_type=PULL_REQUEST, color_coded=color)
-        )
 
-    return repositories
+def issue_repo_name(issue: Mapping[str, Any]) -> str:
+    """Full name of the repository an Issue search result belongs to."""
+    return str(issue["repository_url"].split("/repos/", 1)[1])
+
+
+def is_pull_request(issue: Mapping[str, Any]) -> bool:
+    """Whether an object of a REST issue listing is in fact a PR."""
+    return "pull_request" in issue
 
 
-def get_unassigned_issues(
-    asc: bool, color: bool, repo_name: str, headers: Mapping[str, str]
+def _review_requests_query(username: str, filters: IssueFilters, asc: bool) -> str:
+    sort = "sort:created-asc" if asc else "sort:created-desc"
+    return " ".join(
+        ["is:open", "is:pr", f"review-requested:{username}", sort, *filters.qualifiers()]
+    )
+
+
+def get_prs(
+    username: str,
+    color: bool,
+    headers: Mapping[str, str],
+    *,
+    asc: bool = False,
+    backend: str = THREADS_BACKEND,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    filters: IssueFilters = IssueFilters(),
 ) -> RepoDict:
-    """Get all Github Issues that are unnassigned from the repos in which user is a collaborator."""
+    """Get all Github PRs assigned to user, as planned by *plan_prs*."""
+    logger.debug(f"Fetching PRs for {username} from github.com \n")
+    plan = plan_prs(
+        username, asc, color, headers, backend=backend, concurrency=concurrency, filters=filters
+    )
+    return plan.fetch()
+
 
-    def get_collaborator_repos() -> Any:
-        """Get all Github repos where user is classified as a collaborator."""
-        params = {"affiliation": "collaborator"}
-        url = USER_ENDPOINT.copy()
-        url.path /= "repos"
-        response = safe_request(requests.get, url, headers, params)
-        return response.json()
+def get_collaborator_repos(headers: Mapping[str, str]) -> List[Any]:
+    """Get all Github repos where user is classified as a collaborator."""
+    params = {"affiliation": "collaborator"}
+    url = USER_ENDPOINT.copy()
+    url.path /= "repos"
+    return list(paginate(url, headers, params))
 
-    collaborator_repos = get_collaborator_repos()
+
+def get_unassigned_repo_names(repo_name: str, headers: Mapping[str, str]) -> List[str]:
+    """Names of the repos swept for unassigned Issues.
+
+    A *repo_name* is swept alone, without listing the collaborator repos nor looking it up:
+    its issue listing answers 404 as well if it does not exist.
+    """
     if repo_name:
-        collaborator_repos = filter(lambda x: x["full_name"] == repo_name, collaborator_repos)
-    params = {"direction": "asc" if asc else "desc", "assignee": "none"}
-
-    def get_issues_by_repo(repo: Mapping[str, Any]) -> Repository:
-        """Get all Github Issues in a repo specified by params."""
-
-        session = get_session()
-        url = REPOS_ENDPOINT.copy()
-        url.path = url.path / repo["full_name"] / "issues"
-        with session.safe_get(url, headers=headers, params=params) as response:
-            repo_name = repo["full_name"]
-            repo_class = Repository(name=repo_name)
-            for issue in response.json():
-                repo_class.add_issue(
-                    GithubElement.from_dict(issue, elem_type=ISSUE, color_coded=color)
-                )
-            return repo_class
-
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-        repositories = RepoDict(
-            # https://www.gitmemory.com/issue/python/mypy/7217/512213750
-            Repository,  # type: ignore
-            {
-                repo.name: repo
-                for repo in filter(
-                    lambda x: x.has_issues(),
-                    executor.map(get_issues_by_repo, collaborator_repos),
-                )
-            },
-        )
+        return [repo_name]
+    return [repo["full_name"] for repo in get_collaborator_repos(headers)]
 
-    return repositories
+
+def _repo_url(repo_name: str, listing: str) -> furl:
+    url = REPOS_ENDPOINT.copy()
+    url.path = url.path / repo_name / listing
+    return url
+
+
+def get_milestone_number(repo_name: str, title: str, headers: Mapping[str, str]) -> Optional[str]:
+    """Number of the milestone of a repo with the given title, as REST listings filter by."""
+    for milestone in paginate(_repo_url(repo_name, "milestones"), headers, {"state": "all"}):
+        if milestone["title"] == title:
+            return str(milestone["number"])
+    return None
+
+
+def iter_repo_issues(
+    repo_name: str,
+    params: Mapping[str, str],
+    headers: Mapping[str, str],
+    color: bool,
+    *,
+    milestone: Optional[str] = None,
+    prefetch: bool = True,
+) -> Iterator[GithubElement]:
+    """Yield the Github Issues in a repo specified by params, in the order Github lists them."""
+    if milestone:
+        number = get_milestone_number(repo_name, milestone, headers)
+        if number is None:
+            logger.debug(f"No milestone {milestone} in {repo_name}")
+            return
+        params = {**params, "milestone": number}
+
+    url = _repo_url(repo_name, "issues")
+    for issue in paginate(url, headers, params, project=project_issue, prefetch=prefetch):
+        if not is_pull_request(issue):
+            yield GithubElement.from_dict(issue, elem_type=ISSUE, color_coded=color)
+
+
+def get_issues_by_repo(
+    repo_name: str,
+    params: Mapping[str, str],
+    headers: Mapping[str, str],
+    color: bool,
+    *,
+    milestone: Optional[str] = None,
+) -> Repository:
+    """Get all Github Issues in a repo specified by params."""
+    repo = Repository(name=repo_name)
+    repo.issues.extend(iter_repo_issues(repo_name, params, headers, color, milestone=milestone))
+    return repo
+
+
+def _unassigned_params(asc: bool, filters: IssueFilters) -> Dict[str, str]:
+    return {"direction": "asc" if asc else "desc", "assignee": "none", **filters.params()}
+
+
+def _assigned_search_url(asc: bool, filters: IssueFilters) -> furl:
+    url = SEARCH_ENDPOINT.copy()
+    sort = "sort:created-asc" if asc else "sort:created-desc"
+    query = " ".join(["is:open", "is:issue", "assignee:@me", sort, *filters.qualifiers()])
+    url.add(path="/issues", args={"q": query})
+    return url
 
 
 def get_issues(
-    unassigned: bool, asc: bool, color: bool, repo_name: str, headers: Mapping[str, str]
+    unassigned: bool,
+    asc: bool,
+    color: bool,
+    repo_name: str,
+    headers: Mapping[str, str],
+    *,
+    backend: str = THREADS_BACKEND,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    filters: IssueFilters = IssueFilters(),
 ) -> RepoDict:
-    """Get all Github Issues assigned to user."""
+    """Get all Github Issues assigned to user, as planned by *plan_issues*."""
+    logger.debug("Fetching issues from github.com \n")
+    plan = plan_issues(
+        unassigned,
+        asc,
+        color,
+        repo_name,
+        headers,
+        backend=backend,
+        concurrency=concurrency,
+        filters=filters,
+    )
+    return plan.fetch()
 
-    if unassigned:
-        click.echo("Hang on, getting unassigned issues for you...")
-        return get_unassigned_issues(asc, color, repo_name, headers)
 
-    if repo_name:
-        url = REPOS_ENDPOINT.copy()
-        url.path = url.path / repo_name / "issues"
-    else:
-        url = ISSUES_ENDPOINT.copy()
+def format_info(repos: RepoDict, elem: str) -> str:
+    """Text printed by *echo_info*."""
+    if not repos:
+        return f"No {elem} found! Keep up the good work."
 
-    params = {"direction": "asc" if asc else "desc"}
-    logger.debug("Fetching issues from github.com \n")
-    response = safe_request(requests.get, url, headers, params)
+    now = time.time()
+    all_repos = []
+    for repo in repos.values():
+        all_repos.extend(repo.format_for_table(elem, now))
+    return plain_table(all_repos)
 
-    repositories = RepoDict()
-    for issue in response.json():
-        name = repo_name or issue["repository"]["full_name"]
-        repositories[name].add_issue(
-            GithubElement.from_dict(issue, elem_type=ISSUE, color_coded=color)
+
+def _cell_width(text: str) -> Optional[int]:
+    """Width of a stripped cell as tabulate measures it, None if tabulate must lay it out."""
+    visible = _ANSI_CODES.sub("", text) if "\x1b" in text else text
+    if visible.isascii() or not (WIDE_CHARS_MODE and wcswidth):
+        return len(visible) if visible.isprintable() else None
+    width = int(wcswidth(visible))
+    return width if width >= 0 else None
+
+
+def _table_cells(
+    rows: Sequence[Sequence[Optional[str]]], num_columns: int
+) -> Optional[List[List[Tuple[str, int]]]]:
+    """The stripped cells of *rows* with their widths, None if tabulate must lay one out."""
+    table = []
+    for row in rows:
+        cells = []
+        for i in range(num_columns):
+            cell = row[i] if i < len(row) else None
+            text = cell.strip() if cell else ""
+            width = _cell_width(text)
+            if width is None:
+                return None
+            cells.append((text, width))
+        table.append(cells)
+    return table
+
+
+def _table_line(cells: Sequence[Tuple[str, int]], widths: Sequence[int]) -> str:
+    return "  ".join(
+        text + " " * (widths[i] - width) for i, (text, width) in enumerate(cells)
+    ).rstrip()
+
+
+def plain_table(rows: Sequence[Sequence[Optional[str]]]) -> str:
+    """*tabulate(rows, tablefmt="plain")* for rows of strings, byte for byte.
+
+    tabulate infers a type for every cell and measures each of them several times, which
+    makes it the bulk of the time spent printing tens of thousands of rows. The rows of
+    *format_for_table* always lay out as left aligned text, so they are padded here in two
+    passes instead, and handed to tabulate only if a cell holds a line break or other control
+    character.
+    """
+    if not rows:
+        return ""
+    num_columns = max(len(row) for row in rows)
+    table = _table_cells(rows, num_columns)
+    if table is None:
+        return str(tabulate(rows, tablefmt="plain"))
+    widths = [max(cells[i][1] for cells in table) for i in range(num_columns)]
+    return "\n".join(_table_line(cells, widths) for cells in table)
+
+
+def select_named_hosts(configured: Sequence[Host], names: Sequence[str]) -> List[Host]:
+    """The configured hosts among *names*, or all of them without names."""
+    unknown = set(names) - {host.name for host in configured}
+    if unknown:
+        raise click.BadOptionUsage(
+            "host", f"No account configured for {', '.join(sorted(unknown))}."
         )
+    return [host for host in configured if not names or host.name in names]
 
-    return repositories
+
+def select_hosts(
+    configured: Sequence[Host], names: Sequence[str], repo_name: str
+) -> Tuple[List[Host], str]:
+    """Hosts to query, and the repo to query on them.
+
+    A repo given as *host/owner/name* is only queried on that host, while a plain
+    *owner/name* refers to github.com as soon as several hosts are configured.
+    """
+    hosts = select_named_hosts(configured, names)
+    if repo_name.count("/") == 2:
+        host_name, repo_name = repo_name.split("/", 1)
+        hosts = [host for host in hosts if host.name == host_name]
+    elif repo_name and len(hosts) > 1:
+        hosts = [host for host in hosts if host.name == GITHUB_HOST]
+    if not hosts:
+        raise click.BadOptionUsage("host", "None of the configured hosts was selected.")
+    return hosts, repo_name
+
+
+def fan_out(hosts: Sequence[Host], fetch: Callable[[Host], T]) -> List[Tuple[Host, T]]:
+    """Run *fetch* against every host at once, each with its own sessions and rate limit."""
+
+    def fetch_on(host: Host) -> Tuple[Host, T]:
+        with use_host(host):
+            return host, fetch(host)
+
+    if len(hosts) == 1:
+        return [fetch_on(hosts[0])]
+    # Not the shared executor: each host waits on per-repo tasks submitted to it
+    with ContextExecutor(max_workers=len(hosts)) as executor:
+        return list(executor.map(fetch_on, hosts))
+
+
+def merge_by_host(results: Iterable[Tuple[Host, RepoDict]]) -> RepoDict:
+    """One RepoDict of the repos of every host, keyed by *host.repo_key*."""
+    merged = RepoDict()
+    for host, repositories in results:
+        for name, repo in repositories.items():
+            repo.name = host.repo_key(name)
+            merged[repo.name] = repo
+    return merged
 
 
 def echo_info(repos: RepoDict, elem: str) -> None:
@@ -132,13 +356,700 @@ def echo_info(repos: RepoDict, elem: str) -> None:
     """
 
     if not repos:
-        click.echo(f"No {elem} found! Keep up the good work.")
+        click.echo(format_info(repos, elem))
         return
 
-    all_repos = []
-    for repo in repos.values():
-        all_repos.extend(repo.format_for_table(elem))
-    click.echo_via_pager(tabulate(all_repos, tablefmt="plain"))
+    click.echo_via_pager(format_info(repos, elem))
+
+
+def _truncate(text: str, width: int) -> Tuple[str, int]:
+    """*text*, uncolored, cut to *width* with an ellipsis, and its width."""
+    visible = _ANSI_CODES.sub("", text)
+    while visible and (_cell_width(visible + "…") or 0) > width:
+        visible = visible[:-1]
+    truncated = visible + "…"
+    return truncated, _cell_width(truncated) or len(truncated)
+
+
+def _stream_cells(row: Sequence[Optional[str]], num_columns: int) -> List[Tuple[str, int]]:
+    """Like *_table_cells* for one row, with control characters printed as spaces."""
+    cells = []
+    for i in range(num_columns):
+        cell = row[i] if i < len(row) else None
+        text = cell.strip() if cell else ""
+        width = _cell_width(text)
+        if width is None:
+            text = "".join(c if c.isprintable() else " " for c in _ANSI_CODES.sub("", text))
+            width = _cell_width(text) or len(text)
+        cells.append((text, width))
+    return cells
+
+
+def stream_table(repos: Iterable[Repository], elem: str) -> Iterator[str]:
+    """Yield the table printed by *echo_info* one repository block at a time.
+
+    The first STREAM_LOOKAHEAD repositories are measured before anything is printed; when
+    there are no more, the table is the one *echo_info* prints. Otherwise the widths are
+    fixed from those repositories and STREAM_MIN_WIDTHS, and the titles and labels of later
+    blocks that would not fit are truncated, so every block lines up with the first ones.
+    """
+    now = time.time()
+    iterator = iter(repos)
+    blocks = [
+        repo.format_for_table(elem, now) for repo in itertools.islice(iterator, STREAM_LOOKAHEAD)
+    ]
+    if not blocks:
+        yield f"No {elem} found! Keep up the good work.\n"
+        return
+    later = next(iterator, None)
+    if later is None:
+        yield plain_table([row for rows in blocks for row in rows]) + "\n"
+        return
+
+    num_columns = len(STREAM_MIN_WIDTHS)
+    table = [_stream_cells(row, num_columns) for rows in blocks for row in rows]
+    widths = [
+        max(STREAM_MIN_WIDTHS[i], *(cells[i][1] for cells in table)) for i in range(num_columns)
+    ]
+
+    def layout(rows: Sequence[Sequence[Optional[str]]]) -> str:
+        lines = []
+        for row in rows:
+            cells = _stream_cells(row, num_columns)
+            # Only titles and labels are cut, and not when nothing follows them on the line,
+            # e.g. the name of a repo
+            for i in (1, 2):
+                if cells[i][1] > widths[i] and any(text for text, _ in cells[i + 1 :]):
+                    cells[i] = _truncate(cells[i][0], widths[i])
+            lines.append(_table_line(cells, widths))
+        return "\n".join(lines) + "\n"
+
+    for rows in blocks:
+        yield layout(rows)
+    for repo in itertools.chain([later], iterator):
+        yield layout(repo.format_for_table(elem, now))
+
+
+def echo_stream(repos: Iterable[Repository], elem: str) -> None:
+    """Print issues/prs like *echo_info*, writing each repository as soon as it arrives."""
+    click.echo_via_pager(stream_table(repos, elem))
+
+
+# (repo key, element) pairs, in the order *--limit* prints them
+Ranked = List[Tuple[str, GithubElement]]
+Stream = Generator[Tuple[str, GithubElement], None, None]
+
+
+def _created_key(pair: Tuple[str, GithubElement]) -> int:
+    return pair[1].created_ts
+
+
+def _keyed(key: str, elements: Iterable[GithubElement]) -> Stream:
+    for element in elements:
+        yield key, element
+
+
+def _on_host(host: Host, stream: Stream) -> Stream:
+    """Advance *stream* with its requests sent to *host*, whichever thread consumes it."""
+    while True:
+        with use_host(host):
+            pair = next(stream, None)
+        if pair is None:
+            return
+        yield pair
+
+
+def merge_top(streams: Sequence[Stream], asc: bool, limit: int, concurrency: int) -> Ranked:
+    """The *limit* oldest (*asc*) or newest elements of streams ordered by creation.
+
+    The first page of every stream is requested at once, then the streams are merged k-way
+    on a heap: a stream's next page is only requested when its last element is the next to
+    be output, so once *limit* elements are out no remaining page could have entered them
+    and none is requested.
+    """
+    heads = list(get_executor(concurrency).map(lambda stream: next(stream, None), streams))
+    primed = [
+        itertools.chain([head], stream) for head, stream in zip(heads, streams) if head is not None
+    ]
+    merged = heapq.merge(*primed, key=_created_key, reverse=not asc)
+    try:
+        return list(itertools.islice(merged, limit))
+    finally:
+        for stream in streams:
+            stream.close()
+
+
+def rank(repos: RepoDict, elem: str, asc: bool, limit: int) -> Ranked:
+    """The *limit* oldest (*asc*) or newest elements of already fetched *repos*."""
+    pairs = (
+        (repo.name, element)
+        for repo in repos.values()
+        for element in (repo.issues if elem == "issues" else repo.prs)
+    )
+    select = heapq.nsmallest if asc else heapq.nlargest
+    return select(limit, pairs, key=_created_key)
+
+
+def format_ranked(ranked: Ranked, elem: str) -> str:
+    """Text printed by *echo_ranked*: one row per element, its repo after its number."""
+    if not ranked:
+        return f"No {elem} found! Keep up the good work."
+    now = time.time()
+    rows = []
+    for repo_name, element in ranked:
+        number, *cells = element.get_formatted_args_for_table(now)
+        rows.append([number, style(repo_name, REPO_NAME_COLOR, bold=True), *cells])
+    return plain_table(rows)
+
+
+def echo_ranked(ranked: Ranked, elem: str) -> None:
+    """Print the elements of *--limit* in order, through the pager only if they are many."""
+    if len(ranked) <= MAX_ELEMS_TO_STDOUT:
+        click.echo(format_ranked(ranked, elem))
+    else:
+        click.echo_via_pager(format_ranked(ranked, elem))
+
+
+class PlannedRequest(NamedTuple):
+    """A request *get* sends, once or, given *each*, once per element of it."""
+
+    method: str
+    url: str
+    purpose: str
+    each: str = ""
+
+
+def _planned_get(
+    url: furl, params: Mapping[str, str], purpose: str, each: str = ""
+) -> PlannedRequest:
+    url = url.copy().add(args={**params, "per_page": str(PER_PAGE)})
+    # Placeholders, e.g. {repo}, are filled in when the request is sent
+    resolved = _resolve(url).replace("%7B", "{").replace("%7D", "}")
+    return PlannedRequest("GET", resolved, purpose, each)
+
+
+def _resolve(url: furl) -> str:
+    """*url* as *safe_request* sends it to the current host."""
+    host = current_host()
+    return host.resolve(str(url)) if host is not None else str(url)
+
+
+class Plan(NamedTuple):
+    """How *get* fetches a section from the current host, decided once by *plan_issues* or
+    *plan_prs*: the requests *--explain* prints, and the functions that send them.
+    """
+
+    requests: List[PlannedRequest]
+    # Every element, by repo
+    fetch: Callable[[], RepoDict]
+    # The elements from a host as streams ordered by creation, if they can be paged lazily
+    streams: Optional[Callable[[Host], List[Stream]]] = None
+    # Each repo with elements, as soon as it and the repos listed before it are fetched
+    repos: Optional[Callable[[], Iterator[Repository]]] = None
+
+
+class GraphqlPlan(NamedTuple):
+    """Like *Plan*, for issues and PRs fetched together by the GraphQL backend."""
+
+    requests: List[PlannedRequest]
+    fetch: Callable[[], Tuple[RepoDict, RepoDict]]
+
+
+def _pages(limit: Optional[int]) -> str:
+    return f"pages while they can make the top {limit}" if limit else "every page"
+
+
+def _elements(
+    items: Iterable[Any], elem_type: str, repo_of: Callable[[Any], str], color: bool
+) -> Iterator[Tuple[str, GithubElement]]:
+    """(repo name, element) pairs of REST issue objects, leaving PRs out of issues."""
+    for item in items:
+        if elem_type == PULL_REQUEST or not is_pull_request(item):
+            yield repo_of(item), GithubElement.from_dict(
+                item, elem_type=elem_type, color_coded=color
+            )
+
+
+def _by_repo(pairs: Iterable[Tuple[str, GithubElement]], elem_type: str) -> RepoDict:
+    repositories = RepoDict()
+    for name, element in pairs:
+        if elem_type == PULL_REQUEST:
+            repositories[name].add_pr(element)
+        else:
+            repositories[name].add_issue(element)
+    return repositories
+
+
+def _listing_streams(
+    url: furl,
+    params: Mapping[str, str],
+    headers: Mapping[str, str],
+    items_key: Optional[str],
+    elem_type: str,
+    repo_of: Callable[[Any], str],
+    color: bool,
+) -> Callable[[Host], List[Stream]]:
+    """*Plan.streams* of a single listing, a page only requested once the previous one is
+    consumed."""
+
+    def streams(host: Host) -> List[Stream]:
+        items = paginate(
+            url, headers, params, items_key=items_key, project=project_issue, prefetch=False
+        )
+        pairs = _elements(items, elem_type, repo_of, color)
+        return [_on_host(host, ((host.repo_key(name), element) for name, element in pairs))]
+
+    return streams
+
+
+def _assigned_repo_name(issue: Mapping[str, Any]) -> str:
+    return str(issue["repository"]["full_name"])
+
+
+def plan_issues(
+    unassigned: bool,
+    asc: bool,
+    color: bool,
+    repo_name: str,
+    headers: Mapping[str, str],
+    *,
+    backend: str = THREADS_BACKEND,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    filters: IssueFilters = IssueFilters(),
+    limit: Optional[int] = None,
+) -> Plan:
+    """How *get issues* fetches from the current host.
+
+    Its *limit*, if any, only tells how the requests are described.
+    """
+    if backend == GRAPHQL_BACKEND:
+        graphql = plan_graphql(
+            headers,
+            issues=True,
+            prs=False,
+            unassigned=unassigned,
+            repo_name=repo_name,
+            asc=asc,
+            color=color,
+            filters=filters,
+        )
+        return Plan(graphql.requests, lambda: graphql.fetch()[0])
+    if unassigned or repo_name:
+        return _plan_repo_issues(
+            unassigned,
+            asc,
+            color,
+            repo_name,
+            headers,
+            backend=backend,
+            concurrency=concurrency,
+            filters=filters,
+            limit=limit,
+        )
+
+    if filters.milestone:
+        # The issues of the user can only be filtered by milestone title through search
+        url, params, items_key = _assigned_search_url(asc, filters), {}, "items"
+        repo_of = issue_repo_name
+    else:
+        url, items_key = ISSUES_ENDPOINT.copy(), None
+        params = {"direction": "asc" if asc else "desc", **filters.params()}
+        repo_of = _assigned_repo_name
+
+    def fetch() -> RepoDict:
+        items = paginate(url, headers, params, items_key=items_key, project=project_issue)
+        return _by_repo(_elements(items, ISSUE, repo_of, color), ISSUE)
+
+    return Plan(
+        [_planned_get(url, params, f"assigned issues, {_pages(limit)}")],
+        fetch,
+        _listing_streams(url, params, headers, items_key, ISSUE, repo_of, color),
+    )
+
+
+def _plan_repo_issues(
+    unassigned: bool,
+    asc: bool,
+    color: bool,
+    repo_name: str,
+    headers: Mapping[str, str],
+    *,
+    backend: str,
+    concurrency: int,
+    filters: IssueFilters,
+    limit: Optional[int],
+) -> Plan:
+    """Plan of the issue listings of *repo_name*, or of every collaborator repo."""
+    if unassigned:
+        params = _unassigned_params(asc, filters)
+    else:
+        params = {"direction": "asc" if asc else "desc", **filters.params()}
+    async_repos = unassigned and backend == ASYNC_BACKEND
+    if async_repos and filters.milestone:
+        raise click.BadOptionUsage(
+            "milestone", "--milestone is not supported by the async backend."
+        )
+
+    requests = []
+    each = ""
+    if not repo_name:
+        requests.append(
+            _planned_get(
+                USER_ENDPOINT.copy().add(path="repos"),
+                {"affiliation": "collaborator"},
+                "collaborator repos, every page",
+            )
+        )
+        each = "collaborator repo"
+    listed_params: Mapping[str, str] = params
+    if filters.milestone:
+        requests.append(
+            _planned_get(
+                _repo_url(repo_name or "{repo}", "milestones"),
+                {"state": "all"},
+                "milestone number, every page",
+                each,
+            )
+        )
+        listed_params = {**params, "milestone": "{number}"}
+    kind = "unassigned issues" if unassigned else "issues"
+    pages = "every page" if async_repos else _pages(limit)
+    requests.append(
+        _planned_get(
+            _repo_url(repo_name or "{repo}", "issues"), listed_params, f"{kind}, {pages}", each
+        )
+    )
+
+    if async_repos:
+        return Plan(
+            requests,
+            lambda: async_backend.get_issues_by_repos(
+                get_unassigned_repo_names(repo_name, headers), params, headers, color, concurrency
+            ),
+        )
+
+    def repos() -> Iterator[Repository]:
+        executor = get_executor(concurrency)
+        futures = [
+            executor.submit(
+                get_issues_by_repo, name, params, headers, color, milestone=filters.milestone
+            )
+            for name in get_unassigned_repo_names(repo_name, headers)
+        ]
+        try:
+            for future in futures:
+                repo = future.result()
+                if repo.has_issues():
+                    yield repo
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def fetch() -> RepoDict:
+        # https://www.gitmemory.com/issue/python/mypy/7217/512213750
+        return RepoDict(Repository, {repo.name: repo for repo in repos()})  # type: ignore
+
+    def streams(host: Host) -> List[Stream]:
+        return [
+            _on_host(
+                host,
+                _keyed(
+                    host.repo_key(name),
+                    iter_repo_issues(
+                        name, params, headers, color, milestone=filters.milestone, prefetch=False
+                    ),
+                ),
+            )
+            for name in get_unassigned_repo_names(repo_name, headers)
+        ]
+
+    return Plan(requests, fetch, streams, repos)
+
+
+def plan_prs(
+    username: str,
+    asc: bool,
+    color: bool,
+    headers: Mapping[str, str],
+    *,
+    backend: str = THREADS_BACKEND,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    filters: IssueFilters = IssueFilters(),
+    limit: Optional[int] = None,
+) -> Plan:
+    """How *get prs* fetches from the current host.
+
+    Without a *limit*, the search is sharded to get past the 1000 results the Search API
+    returns per query.
+    """
+    if backend == GRAPHQL_BACKEND:
+        graphql = plan_graphql(
+            headers,
+            issues=False,
+            prs=True,
+            unassigned=False,
+            repo_name="",
+            asc=asc,
+            color=color,
+            filters=filters,
+        )
+        return Plan(graphql.requests, lambda: graphql.fetch()[1])
+
+    url = SEARCH_ENDPOINT.copy().add(path="/issues")
+    query = _review_requests_query(username, filters, asc)
+    if limit is None:
+        purpose = f"review requests, every page, split by creation past {SEARCH_RESULTS_CAP}"
+    else:
+        purpose = f"review requests, {_pages(limit)}"
+
+    def fetch() -> RepoDict:
+        prs = search_issues(query, headers, project=project_issue, concurrency=concurrency)
+        return _by_repo(_elements(prs, PULL_REQUEST, pr_repo_name, color), PULL_REQUEST)
+
+    return Plan(
+        [_planned_get(url, {"q": query}, purpose)],
+        fetch,
+        _listing_streams(url, {"q": query}, headers, "items", PULL_REQUEST, pr_repo_name, color),
+    )
+
+
+def plan_graphql(
+    headers: Mapping[str, str],
+    *,
+    issues: bool,
+    prs: bool,
+    unassigned: bool,
+    repo_name: str,
+    asc: bool,
+    color: bool,
+    filters: IssueFilters,
+) -> GraphqlPlan:
+    """How *graphql_backend.get_elements* fetches from the current host."""
+    aliases, sweep_repos = graphql_backend.plan_rounds(
+        issues=issues, prs=prs, unassigned=unassigned, repo_name=repo_name
+    )
+    url = _resolve(GRAPHQL_ENDPOINT)
+    selected = {
+        "issues": "assigned issues",
+        "repos": "collaborator repos",
+        "prs": "review requests",
+    }
+    requests = []
+    if aliases:
+        purpose = ", ".join(selected[alias] for alias in aliases)
+        requests.append(PlannedRequest("POST", url, f"{purpose}, every page"))
+    if sweep_repos:
+        each = "" if repo_name else f"batch of {MAX_ALIASES_PER_QUERY} collaborator repos"
+        requests.append(PlannedRequest("POST", url, "unassigned issues, every page", each))
+
+    def fetch() -> Tuple[RepoDict, RepoDict]:
+        return graphql_backend.get_elements(
+            headers,
+            issues=issues,
+            prs=prs,
+            unassigned=unassigned,
+            repo_name=repo_name,
+            asc=asc,
+            color=color,
+            filters=filters,
+        )
+
+    return GraphqlPlan(requests, fetch)
+
+
+def format_plan(plan: Sequence[Tuple[str, Sequence[PlannedRequest]]]) -> str:
+    """Text printed by *get --explain*: the planned requests of each section."""
+    lines = []
+    for section, requests in plan:
+        lines.append(f"{section}:")
+        if not requests:
+            lines.append("  no requests, answered from the local index")
+        rows = [
+            [
+                request.method,
+                request.url,
+                request.purpose + (f", for each {request.each}" if request.each else ""),
+            ]
+            for request in requests
+        ]
+        if rows:
+            lines.extend("  " + line for line in plain_table(rows).splitlines())
+    return "\n".join(lines)
+
+
+class Output:
+    """Where *get* prints: tables through the pager, or records of an *output_format*."""
+
+    def __init__(self, output_format: str) -> None:
+        self.writer = None if output_format == TABLE_FORMAT else RecordWriter(output_format)
+
+    def notify(self, message: str) -> None:
+        # Kept out of the records piped from stdout
+        click.echo(message, err=self.writer is not None)
+
+    def show(self, repos: RepoDict, elem: str) -> None:
+        if self.writer is not None:
+            self.writer.write(repos.values(), elem)
+        else:
+            echo_info(repos, elem)
+
+    def show_stream(self, repos: Iterable[Repository], elem: str) -> None:
+        if self.writer is not None:
+            self.writer.write(repos, elem)
+        else:
+            echo_stream(repos, elem)
+
+    def show_ranked(self, ranked: Ranked, elem: str) -> None:
+        if self.writer is not None:
+            self.writer.write_elements(ranked)
+        else:
+            echo_ranked(ranked, elem)
+
+    def separate(self) -> None:
+        if self.writer is None:
+            click.echo(SECTION_SEPARATOR)
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+
+def load_indexed(
+    kind: str,
+    hosts: Sequence[Host],
+    repo_name: str,
+    asc: bool,
+    color: bool,
+    output: Output,
+    *,
+    offline: bool,
+    max_staleness: Optional[int],
+    filters: IssueFilters,
+) -> Optional[RepoDict]:
+    """Elements of *kind* from the local index, if it may answer for them."""
+    if not offline and max_staleness is None:
+        return None
+    if filters:
+        # The index holds everything synced; filters are only applied by Github
+        if offline:
+            raise click.BadOptionUsage("offline", "Filters cannot be used with --offline.")
+        return None
+    if [host.name for host in hosts] != [GITHUB_HOST]:
+        # Only github.com is synced to the index
+        if offline:
+            raise click.BadOptionUsage(
+                "offline", "--offline only covers github.com, select it with --host."
+            )
+        return None
+    index = IssueIndex(GHP_INDEX_PATH)
+    try:
+        if not offline and not index.is_fresh(kind, max_staleness or 0):
+            logger.info(f"Local index of {kind} is stale, fetching from github.com")
+            return None
+        if index.synced_at(kind) is None:
+            output.notify(f"Nothing indexed for {kind} yet, run *gitmine sync* first.")
+        with log_duration(f"Loading {kind} from the local index"):
+            return index.load(kind, repo_name=repo_name, asc=asc, color=color)
+    finally:
+        index.close()
+
+
+def plan_hosts(hosts: Sequence[Host], make: Callable[[Host], T]) -> Dict[str, T]:
+    """What *make* plans for each host, by host name."""
+    plans = {}
+    for host in hosts:
+        with use_host(host):
+            plans[host.name] = make(host)
+    return plans
+
+
+class Section(NamedTuple):
+    """Issues or PRs of a *get*: from the local index if it answers, else by the plan of each
+    host."""
+
+    elem: str
+    indexed: Optional[RepoDict]
+    plans: Dict[str, Plan]
+    # Printed before the elements are fetched
+    notice: str = ""
+
+    @property
+    def label(self) -> str:
+        return "PRs" if self.elem == "prs" else self.elem
+
+
+def fetch_section(section: Section, hosts: Sequence[Host], output: Output) -> RepoDict:
+    if section.indexed is not None:
+        return section.indexed
+    if section.notice:
+        output.notify(section.notice)
+    with log_duration(f"Fetching {section.label}"):
+        return merge_by_host(fan_out(hosts, lambda host: section.plans[host.name].fetch()))
+
+
+def stream_repos(host: Host, repos: Callable[[], Iterator[Repository]]) -> Iterator[Repository]:
+    """The repos of *Plan.repos*, fetched from *host* and named after it."""
+    with use_host(host):
+        for repo in repos():
+            repo.name = host.repo_key(repo.name)
+            yield repo
+
+
+def echo_section(section: Section, hosts: Sequence[Host], output: Output) -> None:
+    """Print a section, each repo as soon as it is fetched if a single host lists them so."""
+    plan = section.plans.get(hosts[0].name) if section.indexed is None else None
+    if plan is not None and plan.repos is not None and len(hosts) == 1:
+        if section.notice:
+            output.notify(section.notice)
+        output.show_stream(stream_repos(hosts[0], plan.repos), section.elem)
+        return
+    repos = fetch_section(section, hosts, output)
+    with log_duration(f"Rendering {section.label}"):
+        output.show(repos, section.elem)
+
+
+def top_of_section(
+    section: Section, hosts: Sequence[Host], output: Output, asc: bool, limit: int, concurrency: int
+) -> Ranked:
+    """The *limit* oldest (*asc*) or newest elements of a section, paging only what can make
+    them when the plans of every host can be streamed."""
+    makers = {
+        name: plan.streams for name, plan in section.plans.items() if plan.streams is not None
+    }
+    if section.indexed is not None or len(makers) < len(hosts):
+        return rank(fetch_section(section, hosts, output), section.elem, asc, limit)
+    if section.notice:
+        output.notify(section.notice)
+    with log_duration(f"Fetching the top {limit} {section.elem}"):
+        streams = []
+        for host in hosts:
+            with use_host(host):
+                streams.extend(makers[host.name](host))
+        return merge_top(streams, asc, limit, concurrency)
+
+
+def echo_sections(issues: Section, prs: Section, hosts: Sequence[Host], output: Output) -> None:
+    """Print issues, then PRs, fetching the PRs in the background meanwhile."""
+    # Not the shared executor: fetching PRs waits on the tasks it submits there
+    with ContextExecutor(max_workers=1) as phases:
+        prs_future = phases.submit(fetch_section, prs, hosts, output)
+        echo_section(issues, hosts, output)
+        output.separate()
+        with log_duration("Rendering PRs"):
+            output.show(prs_future.result(), "prs")
+
+
+def echo_graphql(
+    plans: Mapping[str, GraphqlPlan], hosts: Sequence[Host], output: Output, notice: str
+) -> None:
+    """Print issues and PRs fetched together by the GraphQL backend."""
+    if notice:
+        output.notify(notice)
+    with log_duration("Fetching issues and PRs"):
+        results = fan_out(hosts, lambda host: plans[host.name].fetch())
+    output.show(merge_by_host((host, elements[0]) for host, elements in results), "issues")
+    output.separate()
+    output.show(merge_by_host((host, elements[1]) for host, elements in results), "prs")
 
 
 def get_command(
@@ -148,26 +1059,158 @@ def get_command(
     asc: bool,
     repo_name: str = "",
     unassigned: bool = False,
+    *,
+    cache: bool = True,
+    max_age: int = 0,
+    backend: str = THREADS_BACKEND,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    offline: bool = False,
+    max_staleness: Optional[int] = None,
+    filters: IssueFilters = IssueFilters(),
+    host_names: Sequence[str] = (),
+    output_format: str = TABLE_FORMAT,
+    limit: Optional[int] = None,
+    explain: bool = False,
 ) -> None:
-    """Implementation of the *get* command."""
+    """Implementation of the *get* command.
 
+    With a *limit*, only the *limit* oldest (*asc*) or newest elements of all repos are printed,
+    in that order. With *explain*, the requests that would be sent are printed instead.
+    """
+    if spec not in ("issues", "prs", "all"):
+        raise click.BadArgumentUsage(message=f"Unkown spec: {spec}")
+    hosts, repo_name = select_hosts(ctx.obj.hosts(), host_names, repo_name or "")
     logger.info(
-        f"""Getting {spec} for {ctx.obj.get_value('username')}
-        from github.com with parameters: color={str(color)}, ascending={str(asc)} \n"""
+        f"""Getting {spec} for {', '.join(f'{host.username}@{host.name}' for host in hosts)}
+        with parameters: color={str(color)}, ascending={str(asc)} \n"""
     )
-    headers = {"Authorization": f"Bearer {ctx.obj.get_value('token')}"}
-
-    if spec == "all":
-        res = get_issues(unassigned, asc, color, repo_name, headers=headers)
-        echo_info(res, "issues")
-        click.echo("* " * 20)
-        res = get_prs(ctx, color, headers=headers)
-        echo_info(res, "prs")
-    elif spec == "issues":
-        res = get_issues(unassigned, asc, color, repo_name, headers=headers)
-        echo_info(res, "issues")
-    elif spec == "prs":
-        res = get_prs(ctx, color, headers=headers)
-        echo_info(res, "prs")
+    set_response_cache(ResponseCache(GHP_CACHE_DIR, max_age=max_age) if cache else None)
+    set_scheduler(RequestScheduler(concurrency))
+    output = Output(output_format)
+    notice = "Hang on, getting unassigned issues for you..." if unassigned else ""
+
+    def indexed(kind: str) -> Optional[RepoDict]:
+        return load_indexed(
+            kind,
+            hosts,
+            repo_name,
+            asc,
+            color,
+            output,
+            offline=offline,
+            max_staleness=max_staleness,
+            filters=filters,
+        )
+
+    indexed_issues = indexed(UNASSIGNED if unassigned else ASSIGNED) if spec != "prs" else None
+    indexed_prs = indexed(REVIEW_REQUESTED) if spec != "issues" else None
+    # Issues and PRs come back from the same GraphQL round trips
+    if (
+        spec == "all"
+        and backend == GRAPHQL_BACKEND
+        and indexed_issues is None
+        and indexed_prs is None
+        and limit is None
+    ):
+        graphql_plans = plan_hosts(
+            hosts,
+            lambda host: plan_graphql(
+                host.headers,
+                issues=True,
+                prs=True,
+                unassigned=unassigned,
+                repo_name=repo_name,
+                asc=asc,
+                color=color,
+                filters=filters,
+            ),
+        )
+        if explain:
+            click.echo(format_plan(explained_graphql(graphql_plans, hosts)))
+        else:
+            echo_graphql(graphql_plans, hosts, output, notice)
+        return
+
+    issues = Section(
+        "issues",
+        indexed_issues,
+        (
+            {}
+            if spec == "prs" or indexed_issues is not None
+            else plan_hosts(
+                hosts,
+                lambda host: plan_issues(
+                    unassigned,
+                    asc,
+                    color,
+                    repo_name,
+                    host.headers,
+                    backend=backend,
+                    concurrency=concurrency,
+                    filters=filters,
+                    limit=limit,
+                ),
+            )
+        ),
+        notice,
+    )
+    prs = Section(
+        "prs",
+        indexed_prs,
+        (
+            {}
+            if spec == "issues" or indexed_prs is not None
+            else plan_hosts(
+                hosts,
+                lambda host: plan_prs(
+                    host.username,
+                    asc,
+                    color,
+                    host.headers,
+                    backend=backend,
+                    concurrency=concurrency,
+                    filters=filters,
+                    limit=limit,
+                ),
+            )
+        ),
+    )
+    sections = [section for section in (issues, prs) if spec in (section.elem, "all")]
+
+    if explain:
+        click.echo(format_plan(explained(sections, hosts)))
+    elif limit is not None:
+        for section in sections:
+            if section is not sections[0]:
+                output.separate()
+            ranked = top_of_section(section, hosts, output, asc, limit, concurrency)
+            output.show_ranked(ranked, section.elem)
+    elif len(sections) == 2:
+        echo_sections(issues, prs, hosts, output)
     else:
-        raise click.BadArgumentUsage(message=f"Unkown spec: {spec}")
+        echo_section(sections[0], hosts, output)
+    output.close()
+
+
+def explained(
+    sections: Sequence[Section], hosts: Sequence[Host]
+) -> List[Tuple[str, List[PlannedRequest]]]:
+    """The planned requests of each section and host, as *format_plan* prints them."""
+    explanation = []
+    for host in hosts:
+        on_host = f" on {host.name}" if len(hosts) > 1 else ""
+        for section in sections:
+            plan = section.plans.get(host.name)
+            explanation.append((f"{section.elem}{on_host}", plan.requests if plan else []))
+    return explanation
+
+
+def explained_graphql(
+    plans: Mapping[str, GraphqlPlan], hosts: Sequence[Host]
+) -> List[Tuple[str, List[PlannedRequest]]]:
+    """Like *explained*, for issues and PRs fetched together by the GraphQL backend."""
+    explanation = []
+    for host in hosts:
+        on_host = f" on {host.name}" if len(hosts) > 1 else ""
+        explanation.append((f"issues and prs{on_host}", plans[host.name].requests))
+    return explanation
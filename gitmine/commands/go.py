@@ -1,13 +1,143 @@
 import logging
-from typing import Optional
+import os
+from pathlib import Path
+import re
+import subprocess
+import sys
+import time
+from typing import List, Sequence
 
 import click
 
+from gitmine.constants import ELEM_NUM_COLOR, REPO_NAME_COLOR
+from gitmine.daemon import request_daemon
+from gitmine.index import ASSIGNED, REVIEW_REQUESTED, UNASSIGNED, IssueIndex, Match
+from gitmine.paths import GHP_DAEMON_SOCKET, GHP_INDEX_PATH, GHP_SYNC_PIDFILE
+
 logger = logging.getLogger()
 
+# Most matches listed for a free-text query
+MAX_MATCHES = 10
+# Seconds after which a background sync that has not exited is assumed to be stuck
+BACKGROUND_SYNC_TIMEOUT = 15 * 60
+
+_REPO_NAME = re.compile(r"[\w.-]+/[\w.-]+")
+
+
+def go_command(terms: Sequence[str], *, max_staleness: int, list_only: bool = False) -> None:
+    """Implementation of the *go* command.
+
+    A repo name, optionally followed by a number, is opened directly. Anything else is looked
+    up in the local index, without network calls; the index is synced in the background if
+    it is older than *max_staleness* seconds.
+    """
+    if _REPO_NAME.fullmatch(terms[0]) and (
+        len(terms) == 1 or (len(terms) == 2 and terms[1].isdigit())
+    ):
+        number = terms[1] if len(terms) == 2 else ""
+        logger.info(f"Launching browser session at repo: {terms[0]}, issue: {number}")
+        click.launch(f"https://github.com/{terms[0]}/issues/{number}")
+        return
+
+    query = " ".join(terms)
+    index = IssueIndex(GHP_INDEX_PATH)
+    try:
+        matches = index.search(query, MAX_MATCHES)
+        if not all(index.is_fresh(scope, max_staleness) for scope in (ASSIGNED, REVIEW_REQUESTED)):
+            sync_in_background(unassigned=index.synced_at(UNASSIGNED) is not None)
+        if index.synced_at(ASSIGNED) is None:
+            raise click.ClickException(
+                "Nothing indexed yet; it is being synced in the background, try again shortly."
+            )
+    finally:
+        index.close()
+
+    if not matches:
+        raise click.ClickException(f"Nothing in the local index matches {query!r}.")
+    if list_only or (len(matches) > 1 and sys.stdin.isatty()):
+        click.echo(format_matches(matches))
+    if list_only:
+        return
+
+    choice = 1
+    if len(matches) > 1 and sys.stdin.isatty():
+        choice = click.prompt("Open", type=click.IntRange(1, len(matches)), default=1)
+    match = matches[choice - 1]
+    logger.info(f"Launching browser session at {match.url}")
+    click.launch(match.url)
+
+
+def format_matches(matches: Sequence[Match]) -> str:
+    """One line per match, best first: its rank, repo, number and title."""
+    width = max(len(match.repo) for match in matches)
+    lines: List[str] = []
+    for rank, match in enumerate(matches, 1):
+        repo = click.style(match.repo.ljust(width), fg=REPO_NAME_COLOR, bold=True)
+        number = click.style(f"#{match.number}", fg=ELEM_NUM_COLOR)
+        lines.append(f"{rank:>2}  {repo}  {number}  {match.title}")
+    return "\n".join(lines)
+
+
+def _sync_is_running(pidfile: Path) -> bool:
+    try:
+        pid = pidfile.read_text()
+        age = time.time() - pidfile.stat().st_mtime
+    except FileNotFoundError:
+        return False
+    if age > BACKGROUND_SYNC_TIMEOUT:
+        return False
+    if not pid:
+        # Claimed by a search that is starting the sync
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _claim_pidfile(pidfile: Path) -> bool:
+    """Create *pidfile* for a new background sync; False while a previous one is running."""
+    for _ in range(2):
+        try:
+            os.close(os.open(str(pidfile), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+            return True
+        except FileExistsError:
+            if _sync_is_running(pidfile):
+                return False
+            try:
+                pidfile.unlink()
+            except FileNotFoundError:
+                pass
+    return False
+
+
+def sync_in_background(*, unassigned: bool) -> None:
+    """Have the index synced, without waiting for it.
+
+    A running daemon is asked to refresh it. Otherwise *gitmine sync* is started detached
+    from this process, unless the one a previous search started is still running.
+    """
+    if request_daemon(GHP_DAEMON_SOCKET, {"refresh": True}) is not None:
+        logger.info("Local index is stale, the daemon is refreshing it")
+        return
+    if not _claim_pidfile(GHP_SYNC_PIDFILE):
+        logger.info("Local index is stale, it is already being synced in the background")
+        return
 
-def go_command(repo: str, number: Optional[int]) -> None:
-    """Implementation of the *go* command."""
-    logger.info(f"Launching browser session at repo: {repo}, issue: {number}")
-    url = f"https://github.com/{repo}/issues/{number if number else ''}"
-    click.launch(url)
+    logger.info("Local index is stale, syncing it in the background")
+    command = [sys.executable, "-c", "from gitmine.gitmine import gitmine; gitmine()", "sync"]
+    try:
+        process = subprocess.Popen(  # pylint: disable=consider-using-with
+            command + (["-u"] if unassigned else []),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        GHP_SYNC_PIDFILE.unlink()
+        raise
+    GHP_SYNC_PIDFILE.write_text(str(process.pid))
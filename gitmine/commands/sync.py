@@ -0,0 +1,140 @@
+import logging
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import click
+
+from gitmine.commands.get import get_collaborator_repos, is_pull_request, pr_repo_name
+from gitmine.decoding import project_issue
+from gitmine.endpoints import ISSUES_ENDPOINT, REPOS_ENDPOINT
+from gitmine.index import ASSIGNED, REVIEW_REQUESTED, UNASSIGNED, IssueIndex
+from gitmine.paths import GHP_INDEX_PATH
+from gitmine.search import search_issues
+from gitmine.utils import RequestScheduler, get_executor, log_duration, paginate, set_scheduler
+
+logger = logging.getLogger()
+
+
+def _since_params(since: Optional[str]) -> Dict[str, str]:
+    """Ask only for what changed since the last sync, closed elements included."""
+    return {"state": "all", "since": since} if since else {"state": "open"}
+
+
+def sync_assigned(index: IssueIndex, headers: Mapping[str, str]) -> int:
+    """Sync the Issues assigned to the user.
+
+    Listing with *since* misses the issues reassigned to someone else, which are no longer
+    listed for the user at all; so the open ones are listed in full instead. Those updated
+    since the last sync are upserted, and those no longer listed are removed.
+    """
+    watermark = index.watermark(ASSIGNED)
+    issues = [
+        issue
+        for issue in paginate(
+            ISSUES_ENDPOINT.copy(), headers, {"state": "open"}, project=project_issue
+        )
+        if not is_pull_request(issue)
+    ]
+    removed = index.retain(
+        ASSIGNED, {(issue["repository"]["full_name"], issue["number"]) for issue in issues}
+    )
+    if removed:
+        logger.debug(f"Removed {removed} issues no longer assigned from the index")
+    return index.apply(
+        ASSIGNED,
+        (
+            (issue["repository"]["full_name"], issue)
+            for issue in issues
+            if watermark is None or issue["updated_at"] >= watermark
+        ),
+        scope=ASSIGNED,
+    )
+
+
+def sync_review_requests(
+    index: IssueIndex, username: str, headers: Mapping[str, str], concurrency: int
+) -> int:
+    """Sync the PRs awaiting the user's review.
+
+    The search API has no *since*, and a PR leaves the results once its review is given,
+    so these are always refetched in full.
+    """
+    query = " ".join(["is:open", "is:pr", f"review-requested:{username}"])
+    prs = list(search_issues(query, headers, project=project_issue, concurrency=concurrency))
+    return index.apply(
+        REVIEW_REQUESTED,
+        ((pr_repo_name(pr), pr) for pr in prs),
+        scope=REVIEW_REQUESTED,
+        replace=True,
+    )
+
+
+def sync_unassigned(index: IssueIndex, headers: Mapping[str, str], concurrency: int) -> int:
+    """Sync the unassigned Issues of every repo in which the user is a collaborator."""
+    repo_names = [repo["full_name"] for repo in get_collaborator_repos(headers)]
+    # The SQLite connection stays on this thread; workers only fetch
+    watermarks = {name: index.watermark(f"{UNASSIGNED}:{name}") for name in repo_names}
+
+    def fetch(repo_name: str) -> Tuple[str, List[Any]]:
+        params = _since_params(watermarks[repo_name])
+        if not watermarks[repo_name]:
+            params["assignee"] = "none"
+        url = REPOS_ENDPOINT.copy()
+        url.path = url.path / repo_name / "issues"
+        return repo_name, list(paginate(url, headers, params, project=project_issue))
+
+    upserted = 0
+    for repo_name, issues in get_executor(concurrency).map(fetch, repo_names):
+        upserted += index.apply(
+            UNASSIGNED,
+            ((repo_name, issue) for issue in issues),
+            scope=f"{UNASSIGNED}:{repo_name}",
+            keep=lambda issue: not issue.get("assignees") and not is_pull_request(issue),
+        )
+
+    for repo_name in set(index.repos(UNASSIGNED)) - set(repo_names):
+        index.delete(UNASSIGNED, repo=repo_name)
+    index.mark_synced(UNASSIGNED)
+    return upserted
+
+
+def sync_index(
+    index: IssueIndex,
+    username: str,
+    headers: Mapping[str, str],
+    *,
+    unassigned: bool,
+    concurrency: int,
+) -> Tuple[int, int]:
+    """Sync every scope of the index; return the number of issues and PRs upserted."""
+    with log_duration("Syncing assigned issues"):
+        issues = sync_assigned(index, headers)
+    with log_duration("Syncing review requests"):
+        prs = sync_review_requests(index, username, headers, concurrency)
+    if unassigned:
+        with log_duration("Syncing unassigned issues"):
+            issues += sync_unassigned(index, headers, concurrency)
+    return issues, prs
+
+
+def sync_command(ctx: click.Context, unassigned: bool, full: bool, concurrency: int) -> None:
+    """Implementation of the *sync* command."""
+    headers = {"Authorization": f"Bearer {ctx.obj.get_value('token')}"}
+    set_scheduler(RequestScheduler(concurrency))
+    index = IssueIndex(GHP_INDEX_PATH)
+    try:
+        if full:
+            index.clear()
+        if unassigned:
+            click.echo("Hang on, syncing unassigned issues for you...")
+        issues, prs = sync_index(
+            index,
+            ctx.obj.get_value("username"),
+            headers,
+            unassigned=unassigned,
+            concurrency=concurrency,
+        )
+    finally:
+        index.close()
+
+    logger.info(f"Index written at {GHP_INDEX_PATH}")
+    click.echo(f"Updated {issues} issues and {prs} PRs in the index.")
@@ -0,0 +1,195 @@
+import concurrent.futures
+import logging
+import time
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import click
+from tabulate import tabulate
+
+from gitmine.cache import ResponseCache, set_response_cache
+from gitmine.commands.get import fan_out, get_milestone_number, is_pull_request, select_named_hosts
+from gitmine.constants import ISSUE, PULL_REQUEST
+from gitmine.decoding import project_issue
+from gitmine.endpoints import ORGS_ENDPOINT, REPOS_ENDPOINT
+from gitmine.filters import IssueFilters
+from gitmine.hosts import Host
+from gitmine.models.github_elements import AGE_BUCKETS, ElementStats
+from gitmine.paths import GHP_CACHE_DIR
+from gitmine.utils import RequestScheduler, get_executor, log_duration, paginate, set_scheduler
+
+logger = logging.getLogger()
+
+ELEM_TYPES = {"issues": (ISSUE,), "prs": (PULL_REQUEST,), "all": (ISSUE, PULL_REQUEST)}
+COLUMN_HEADERS = {ISSUE: "Issues", PULL_REQUEST: "PRs"}
+
+
+def get_org_repos(org: str, headers: Mapping[str, str]) -> List[str]:
+    """Names of the repos of an organization with open Issues or PRs."""
+    url = ORGS_ENDPOINT.copy()
+    url.path = url.path / org / "repos"
+    # open_issues_count counts open PRs too, so repos without either need no request
+    return [
+        repo["full_name"]
+        for repo in paginate(url, headers, {"type": "all"})
+        if repo.get("open_issues_count", 1)
+    ]
+
+
+def get_repo_stats(
+    repo_name: str,
+    params: Mapping[str, str],
+    headers: Mapping[str, str],
+    elem_types: Sequence[str],
+    *,
+    repo_key: str,
+    milestone: Optional[str],
+    now: float,
+) -> ElementStats:
+    """Count the open Issues and PRs of a repo, one listing page at a time."""
+    stats = ElementStats()
+    if milestone:
+        number = get_milestone_number(repo_name, milestone, headers)
+        if number is None:
+            return stats
+        params = {**params, "milestone": number}
+
+    url = REPOS_ENDPOINT.copy()
+    url.path = url.path / repo_name / "issues"
+    for obj in paginate(url, headers, params, project=project_issue):
+        elem_type = PULL_REQUEST if is_pull_request(obj) else ISSUE
+        if elem_type in elem_types:
+            stats.add(repo_key, obj, elem_type, now)
+    return stats
+
+
+def sweep_org(
+    org: str,
+    host: Host,
+    elem_types: Sequence[str],
+    *,
+    unassigned: bool,
+    filters: IssueFilters,
+    concurrency: int,
+) -> ElementStats:
+    """Aggregate the open Issues and PRs of every repo of an organization on *host*.
+
+    Repos are swept in parallel and each one is reduced to counts as its pages arrive, so
+    the elements themselves are never kept. Runs within *use_host(host)*, as *fan_out* does.
+    """
+    repo_names = get_org_repos(org, host.headers)
+    logger.info(f"Sweeping {len(repo_names)} repos of {org} on {host.name}")
+    params = {"state": "open", **filters.params()}
+    if unassigned:
+        params["assignee"] = "none"
+    now = time.time()
+
+    executor = get_executor(concurrency)
+    futures = [
+        executor.submit(
+            get_repo_stats,
+            name,
+            params,
+            host.headers,
+            elem_types,
+            repo_key=host.repo_key(name),
+            milestone=filters.milestone,
+            now=now,
+        )
+        for name in repo_names
+    ]
+    stats = ElementStats()
+    try:
+        for future in concurrent.futures.as_completed(futures):
+            stats.merge(future.result())
+    finally:
+        for future in futures:
+            future.cancel()
+    return stats
+
+
+def select_org_hosts(
+    configured: Sequence[Host], names: Sequence[str], org: str
+) -> Tuple[List[Host], str]:
+    """Hosts to sweep, and the organization to sweep on them.
+
+    An organization given as *host/org* is only swept on that host, a plain one on every
+    selected host.
+    """
+    hosts = select_named_hosts(configured, names)
+    if "/" in org:
+        host_name, org = org.split("/", 1)
+        hosts = [host for host in hosts if host.name == host_name]
+    if not hosts:
+        raise click.BadOptionUsage("host", "None of the configured hosts was selected.")
+    return hosts, org
+
+
+def _by_count(counts: Mapping[Tuple[str, str], int]) -> List[str]:
+    """Keys of *counts*, most counted first across element types."""
+    totals: Dict[str, int] = {}
+    for (_, key), count in counts.items():
+        totals[key] = totals.get(key, 0) + count
+    return sorted(totals, key=lambda key: (-totals[key], key))
+
+
+def _table(
+    title: str,
+    counts: Mapping[Tuple[str, str], int],
+    keys: Iterable[str],
+    elem_types: Sequence[str],
+) -> str:
+    rows = [[key, *(counts.get((elem_type, key), 0) for elem_type in elem_types)] for key in keys]
+    headers = [title, *(COLUMN_HEADERS[elem_type] for elem_type in elem_types)]
+    return str(tabulate(rows, headers=headers, tablefmt="plain"))
+
+
+def format_stats(org: str, stats: ElementStats, elem_types: Sequence[str]) -> str:
+    """Summary of an organization followed by its counts by age, assignee, label and repo."""
+    totals = " and ".join(
+        f"{stats.totals[elem_type]} open {COLUMN_HEADERS[elem_type]}" for elem_type in elem_types
+    )
+    sections = [
+        f"{org}: {totals} in {stats.num_of_repos()} repos",
+        _table("Age", stats.by_age, AGE_BUCKETS, elem_types),
+        _table("Assignee", stats.by_assignee, _by_count(stats.by_assignee), elem_types),
+    ]
+    if stats.by_label:
+        sections.append(_table("Label", stats.by_label, _by_count(stats.by_label), elem_types))
+    sections.append(_table("Repo", stats.by_repo, _by_count(stats.by_repo), elem_types))
+    return "\n\n".join(sections)
+
+
+def triage_command(
+    ctx: click.Context,
+    org: str,
+    spec: str,
+    *,
+    unassigned: bool,
+    cache: bool,
+    max_age: int,
+    concurrency: int,
+    filters: IssueFilters,
+    host_names: Sequence[str],
+) -> None:
+    """Implementation of *get --org*."""
+    hosts, org = select_org_hosts(ctx.obj.hosts(), host_names, org)
+    set_response_cache(ResponseCache(GHP_CACHE_DIR, max_age=max_age) if cache else None)
+    set_scheduler(RequestScheduler(concurrency))
+
+    click.echo(f"Hang on, sweeping every repo of {org} for you...")
+    elem_types = ELEM_TYPES[spec]
+    stats = ElementStats()
+    with log_duration(f"Sweeping {org}"):
+        for _, host_stats in fan_out(
+            hosts,
+            lambda host: sweep_org(
+                org,
+                host,
+                elem_types,
+                unassigned=unassigned,
+                filters=filters,
+                concurrency=concurrency,
+            ),
+        ):
+            stats.merge(host_stats)
+    click.echo_via_pager(format_stats(org, stats, elem_types))
@@ -0,0 +1,159 @@
+import logging
+import time
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import click
+
+from gitmine.cache import ResponseCache, set_response_cache
+from gitmine.commands.get import (
+    fan_out,
+    format_info,
+    get_issues,
+    get_prs,
+    merge_by_host,
+    select_hosts,
+)
+from gitmine.constants import SECTION_SEPARATOR
+from gitmine.filters import IssueFilters
+from gitmine.hosts import Host, use_host
+from gitmine.models.github_elements import GithubElement, RepoDict
+from gitmine.paths import GHP_CACHE_DIR
+from gitmine.utils import (
+    CORE_RESOURCE,
+    SEARCH_RESOURCE,
+    RequestScheduler,
+    get_scheduler,
+    log_duration,
+    set_scheduler,
+)
+
+logger = logging.getLogger()
+
+# (elem, repo name, number) -> element
+Snapshot = Dict[Tuple[str, str, int], GithubElement]
+
+CHANGE_COLORS = {"+": "green", "-": "red", "~": "yellow"}
+
+
+def take_snapshot(sections: Sequence[Tuple[str, RepoDict]]) -> Snapshot:
+    return {
+        (elem, repo.name, element.number): element
+        for elem, repos in sections
+        for repo in repos.values()
+        for element in (repo.issues if elem == "issues" else repo.prs)
+    }
+
+
+def diff_snapshots(old: Snapshot, new: Snapshot) -> Iterator[Tuple[str, str, GithubElement]]:
+    """Yield the elements that were added (+), closed (-) or retitled or relabelled (~)."""
+    for key, element in new.items():
+        if key not in old:
+            yield "+", key[1], element
+        elif (element.title, element.label_names) != (old[key].title, old[key].label_names):
+            yield "~", key[1], element
+    for key, element in old.items():
+        if key not in new:
+            yield "-", key[1], element
+
+
+def format_change(mark: str, repo_name: str, element: GithubElement) -> str:
+    cells = [
+        time.strftime("%H:%M:%S"),
+        click.style(mark, fg=CHANGE_COLORS[mark], bold=True),
+        click.style(repo_name, bold=True),
+        *element.get_formatted_args_for_table(),
+    ]
+    return " ".join(cell for cell in cells if cell)
+
+
+def watch_command(
+    ctx: click.Context,
+    spec: str,
+    color: bool,
+    asc: bool,
+    repo_name: str,
+    unassigned: bool,
+    *,
+    interval: int,
+    cache: bool,
+    max_age: int,
+    backend: str,
+    concurrency: int,
+    filters: IssueFilters,
+    host_names: Sequence[str],
+) -> None:
+    """Implementation of *get --watch*.
+
+    Every poll repeats the requests of *get*. Their responses are cached, so unchanged
+    listings are revalidated with conditional requests, whose 304s do not count against
+    the rate limit. The first poll prints the tables of *get*, the next ones only what changed.
+    """
+    hosts, repo_name = select_hosts(ctx.obj.hosts(), host_names, repo_name or "")
+    set_response_cache(ResponseCache(GHP_CACHE_DIR, max_age=max_age) if cache else None)
+    set_scheduler(RequestScheduler(concurrency))
+
+    def poll() -> List[Tuple[str, RepoDict]]:
+        sections = []
+        if spec in ("issues", "all"):
+            issues = fan_out(
+                hosts,
+                lambda host: get_issues(
+                    unassigned,
+                    asc,
+                    color,
+                    repo_name,
+                    headers=host.headers,
+                    backend=backend,
+                    concurrency=concurrency,
+                    filters=filters,
+                ),
+            )
+            sections.append(("issues", merge_by_host(issues)))
+        if spec in ("prs", "all"):
+            prs = fan_out(
+                hosts,
+                lambda host: get_prs(
+                    host.username,
+                    color,
+                    host.headers,
+                    asc=asc,
+                    backend=backend,
+                    concurrency=concurrency,
+                    filters=filters,
+                ),
+            )
+            sections.append(("prs", merge_by_host(prs)))
+        return sections
+
+    click.echo(f"Watching {spec}, polling every {interval}s. Press Ctrl+C to stop.")
+    try:
+        with log_duration("Polling"):
+            sections = poll()
+        click.echo(
+            f"\n{SECTION_SEPARATOR}\n".join(format_info(repos, elem) for elem, repos in sections)
+        )
+        previous = take_snapshot(sections)
+        while True:
+            time.sleep(_next_poll_delay(hosts, interval))
+            try:
+                with log_duration("Polling"):
+                    current = take_snapshot(poll())
+            except click.ClickException as e:
+                logger.warning(f"Polling failed: {e.format_message()}")
+                continue
+            for mark, name, element in diff_snapshots(previous, current):
+                click.echo(format_change(mark, name, element))
+            previous = current
+    except KeyboardInterrupt:
+        pass
+
+
+def _next_poll_delay(hosts: Sequence[Host], interval: float) -> float:
+    """Seconds until the next poll, never sooner than the rate limit allows."""
+    delay = float(interval)
+    for host in hosts:
+        with use_host(host):
+            schedulers = [get_scheduler(CORE_RESOURCE), get_scheduler(SEARCH_RESOURCE)]
+        for scheduler in schedulers:
+            delay = max(delay, scheduler.paused_until - time.time())
+    return delay
@@ -13,3 +13,27 @@ LABELS_COLOR = "cyan"
 OK_DELTA_COLOR = "green"
 WARNING_DELTA_COLOR = "yellow"
 DANGER_DELTA_COLOR = "red"
+
+# Fetch backends
+THREADS_BACKEND = "threads"
+ASYNC_BACKEND = "async"
+GRAPHQL_BACKEND = "graphql"
+DEFAULT_CONCURRENCY = 5
+
+# Printed between the issues and the PRs of *get all*
+SECTION_SEPARATOR = "* " * 20
+
+# Daemon
+DEFAULT_REFRESH_INTERVAL = 60
+
+# Output formats of *get*; all but the table are written as plain records, for piping
+TABLE_FORMAT = "table"
+JSON_FORMAT = "json"
+JSONL_FORMAT = "jsonl"
+CSV_FORMAT = "csv"
+
+# Watch mode
+DEFAULT_POLL_INTERVAL = 60
+
+# go: searches sync the local index in the background when it is older than this, in seconds
+DEFAULT_GO_MAX_STALENESS = 60 * 60
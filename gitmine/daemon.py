@@ -0,0 +1,98 @@
+# Client side of *gitmine daemon*, kept free of the heavy imports of the commands so that
+# asking a running daemon costs little more than starting Python.
+import json
+import logging
+from pathlib import Path
+import socket
+from typing import Any, Dict, Optional, Sequence
+
+import click
+
+from gitmine.constants import SECTION_SEPARATOR, TABLE_FORMAT
+
+logger = logging.getLogger()
+
+# Seconds to wait for the daemon before fetching directly
+DAEMON_TIMEOUT = 10.0
+
+
+def request_daemon(path: Path, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Send one request to the daemon listening at *path*; None if it cannot answer it."""
+    if not path.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(DAEMON_TIMEOUT)
+            sock.connect(str(path))
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+    except OSError as e:
+        logger.info(f"Daemon at {path} is not answering: {e}")
+        return None
+    if not line:
+        return None
+
+    reply: Dict[str, Any] = json.loads(line)
+    if "error" in reply:
+        logger.info(f"Daemon could not answer: {reply['error']}")
+        return None
+    return reply
+
+
+def daemon_may_answer(
+    *,
+    output_format: str,
+    limit: Optional[int],
+    explain: bool,
+    cache: bool,
+    offline: bool,
+    filtered: bool,
+    max_staleness: Optional[int],
+) -> bool:
+    """Whether a *get* with these options may be answered by the daemon, which prints the
+    tables of everything it synced, as fresh as its last refresh."""
+    return (
+        output_format == TABLE_FORMAT
+        and limit is None
+        and not explain
+        and cache
+        and not (offline or filtered)
+        and max_staleness is None
+    )
+
+
+def get_from_daemon(
+    path: Path,
+    spec: str,
+    color: bool,
+    asc: bool,
+    repo_name: str,
+    unassigned: bool,
+    host_names: Sequence[str] = (),
+) -> bool:
+    """Print the answer of the daemon to a *get* command; return whether it answered."""
+    reply = request_daemon(
+        path,
+        {
+            "spec": spec,
+            "color": color,
+            "asc": asc,
+            "repo_name": repo_name,
+            "unassigned": unassigned,
+            "hosts": list(host_names),
+        },
+    )
+    if reply is None:
+        return False
+
+    logger.info(f"Answered by the daemon, synced {reply['age']:.0f}s ago")
+    for i, section in enumerate(reply["sections"]):
+        if i:
+            click.echo(SECTION_SEPARATOR)
+        # Same as *echo_info*: tables go through the pager, the empty message does not
+        if section["empty"]:
+            click.echo(section["text"])
+        else:
+            click.echo_via_pager(section["text"])
+    return True
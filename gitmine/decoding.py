@@ -0,0 +1,46 @@
+import json
+from typing import Any, Callable, Dict, Mapping, Optional
+
+_fast_loads: Optional[Callable[[bytes], Any]]
+try:
+    from orjson import loads as _fast_loads
+except ImportError:  # pragma: no cover
+    _fast_loads = None
+
+# Fields of the Issue / PR objects of REST listings that gitmine reads: elements, the local
+# index, unassigned sweeps and triage statistics
+ISSUE_FIELDS = (
+    "title",
+    "number",
+    "html_url",
+    "created_at",
+    "updated_at",
+    "state",
+    "repository_url",
+    "pull_request",
+)
+
+
+def loads(body: bytes) -> Any:
+    """Decode a JSON response body, with orjson if it is installed (pip install 'gitmine[fast]').
+
+    Both decode bytes directly, skipping the text decoding of *Response.json*.
+    """
+    if _fast_loads is not None:
+        return _fast_loads(body)
+    return json.loads(body)
+
+
+def project_issue(obj: Mapping[str, Any]) -> Dict[str, Any]:
+    """Copy of a listed Issue / PR restricted to the fields gitmine reads.
+
+    Listings repeat the full user, reactions, milestone and body of every element; dropping
+    them right after a page is decoded keeps sweeps from holding megabytes of it.
+    """
+    slim = {field: obj[field] for field in ISSUE_FIELDS if field in obj}
+    slim["labels"] = [{"name": label["name"]} for label in obj.get("labels") or ()]
+    if obj.get("assignees"):
+        slim["assignees"] = [{"login": assignee["login"]} for assignee in obj["assignees"]]
+    if "repository" in obj:
+        slim["repository"] = {"full_name": obj["repository"]["full_name"]}
+    return slim
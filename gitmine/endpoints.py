@@ -1,7 +1,12 @@
 from furl import furl
 
-BASE_GH_API = "https://api.github.com"
+from gitmine.hosts import GITHUB_API_URL
+
+# Endpoints of github.com; requests made for another host are resolved against its API root
+BASE_GH_API = GITHUB_API_URL
 ISSUES_ENDPOINT = furl(BASE_GH_API, path="/issues")
+ORGS_ENDPOINT = furl(BASE_GH_API, path="/orgs")
 REPOS_ENDPOINT = furl(BASE_GH_API, path="/repos")
 SEARCH_ENDPOINT = furl(BASE_GH_API, path="/search")
 USER_ENDPOINT = furl(BASE_GH_API, path="/user")
+GRAPHQL_ENDPOINT = furl(BASE_GH_API, path="/graphql")
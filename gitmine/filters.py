@@ -0,0 +1,44 @@
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class IssueFilters(NamedTuple):
+    """Filters of the *get* command, pushed to the Github API instead of applied locally.
+
+    REST listings take *labels* and *since* as query parameters; a *milestone* is given by
+    title, which only the search API accepts, so listings resolve it to a number first.
+    """
+
+    labels: Tuple[str, ...] = ()
+    milestone: Optional[str] = None
+    since: Optional[datetime] = None
+
+    def __bool__(self) -> bool:
+        return bool(self.labels or self.milestone or self.since)
+
+    @property
+    def since_iso(self) -> Optional[str]:
+        if self.since is None:
+            return None
+        since = self.since
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        return since.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def params(self) -> Dict[str, str]:
+        """Query parameters of the REST issue listings, *milestone* excepted."""
+        params = {}
+        if self.labels:
+            params["labels"] = ",".join(self.labels)
+        if self.since_iso:
+            params["since"] = self.since_iso
+        return params
+
+    def qualifiers(self) -> List[str]:
+        """Qualifiers of the search API."""
+        qualifiers = [f'label:"{label}"' for label in self.labels]
+        if self.milestone:
+            qualifiers.append(f'milestone:"{self.milestone}"')
+        if self.since_iso:
+            qualifiers.append(f"updated:>={self.since_iso}")
+        return qualifiers
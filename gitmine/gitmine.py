@@ -1,21 +1,48 @@
-from typing import Callable, List, Optional, TypeVar
+from datetime import datetime
+import sys
+from typing import Callable, List, Optional, Tuple, TypeVar
 
 import click
 
-from gitmine.commands.config import config_command, get_or_create_github_config
-from gitmine.commands.get import get_command
-from gitmine.commands.go import go_command
-from gitmine.utils import set_verbosity
+from gitmine.commands.config import LazyGithubConfig
+from gitmine.constants import (
+    ASYNC_BACKEND,
+    CSV_FORMAT,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_GO_MAX_STALENESS,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_REFRESH_INTERVAL,
+    GRAPHQL_BACKEND,
+    JSON_FORMAT,
+    JSONL_FORMAT,
+    TABLE_FORMAT,
+    THREADS_BACKEND,
+)
+from gitmine.hosts import GITHUB_HOST
+from gitmine.verbosity import set_verbosity
 from gitmine.version import __version__
 
+# Command implementations, and the heavy dependencies they bring (requests, furl, tabulate,
+# yaml), are imported when their command runs so that startup stays fast.
+# pylint: disable=import-outside-toplevel
+
 
 @click.group()
 @click.version_option(__version__)
 @click.pass_context
 def gitmine(ctx: click.Context) -> None:
     """Simple CLI for querying assigned Issues and PR reviews from Github."""
-    # Set the context object
-    ctx.obj = get_or_create_github_config()
+    # Set the context object, read from disk only once a command needs it
+    ctx.obj = LazyGithubConfig()
+    ctx.call_on_close(_log_connection_stats)
+
+
+def _log_connection_stats() -> None:
+    """Log, at -vv, how many connections the requests of the command needed."""
+    utils = sys.modules.get("gitmine.utils")
+    # Never imported by commands that do not talk to Github
+    if utils is not None:
+        utils.log_connection_stats()
 
 
 _verbose_cmd = [
@@ -27,6 +54,28 @@ _verbose_cmd = [
     )
 ]
 
+_trace_cmd = [
+    click.option(
+        "--trace",
+        is_flag=True,
+        default=False,
+        help="Print to stderr where the time went: connecting, waiting for and downloading "
+        "responses, decoding, rendering, cache hits, retries and rate limit headroom.",
+    ),
+    click.option(
+        "--trace-file",
+        type=click.Path(dir_okay=False, writable=True),
+        default=None,
+        help="Write every timed request and phase to this Chrome trace-event JSON file.",
+    ),
+    click.option(
+        "--profile",
+        type=click.Path(dir_okay=False, writable=True),
+        default=None,
+        help="Profile the command with cProfile and write its stats to this file.",
+    ),
+]
+
 T = TypeVar("T")
 
 
@@ -42,23 +91,32 @@ def add_options(
 
 
 @gitmine.command()
-@click.argument("prop", nargs=1, required=True, type=click.Choice(["username", "token"]))
+@click.option(
+    "--host",
+    type=click.STRING,
+    default=GITHUB_HOST,
+    help="Host of the account, e.g. a Github Enterprise instance. Defaults to github.com.",
+)
+@click.argument("prop", nargs=1, required=True, type=click.Choice(["username", "token", "api_url"]))
 @click.argument("value", nargs=1, required=False, type=click.STRING)
 @add_options(_verbose_cmd)
 @click.pass_context
 def config(
     ctx: click.Context,
+    host: str,
     prop: str,
     value: str,
     verbose: int,
 ) -> None:
     """Set or Access Github Config information. Currently, config requires a Github username and Bearer token.
 
-    [username|token] is the property to be set if *value* is also provided. If not, will return the current value of *prop* if it exists.\n
+    [username|token|api_url] is the property to be set if *value* is also provided. If not, will return the current value of *prop* if it exists. *api_url* only applies to hosts other than github.com, and defaults to https://HOST/api/v3.\n
     VALUE is the value of property to be set.
     """
     set_verbosity(verbose)
-    config_command(ctx, prop, value)
+    from gitmine.commands.config import config_command
+
+    config_command(ctx, prop, value, host)
 
 
 @gitmine.command()
@@ -85,7 +143,118 @@ def config(
     default=False,
     help="Get all unassigned Issues / PRs from your repositories.",
 )
+@click.option(
+    "--cache/--no-cache",
+    default=True,
+    help="Reuse responses cached on disk, revalidating them with Github.",
+)
+@click.option(
+    "--max-age",
+    type=click.INT,
+    default=0,
+    help="Seconds during which a cached response is used without revalidating it.",
+)
+@click.option(
+    "--backend",
+    type=click.Choice([THREADS_BACKEND, ASYNC_BACKEND, GRAPHQL_BACKEND]),
+    default=THREADS_BACKEND,
+    help="How to query Github. The async backend requires aiohttp; "
+    "the graphql backend batches all queries into a few requests.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CONCURRENCY,
+    help="Maximum number of requests in flight at once.",
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    default=False,
+    help="Answer from the local index written by *gitmine sync*, without network calls.",
+)
+@click.option(
+    "--max-staleness",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Answer from the local index if it was synced at most this many seconds ago.",
+)
+@click.option(
+    "--label",
+    "-l",
+    "labels",
+    type=click.STRING,
+    multiple=True,
+    help="Only get Issues / PRs with this label. Repeat to require several labels.",
+)
+@click.option(
+    "--milestone",
+    type=click.STRING,
+    default=None,
+    help="Only get Issues / PRs in the milestone with this title.",
+)
+@click.option(
+    "--since",
+    type=click.DateTime(),
+    default=None,
+    help="Only get Issues / PRs updated at or after this UTC date.",
+)
+@click.option(
+    "--host",
+    "host_names",
+    type=click.STRING,
+    multiple=True,
+    help="Only query this configured host. Repeat to query several; defaults to all of them.",
+)
+@click.option(
+    "--org",
+    type=click.STRING,
+    default=None,
+    help="Sweep every repo of this organization and print counts of its open Issues / PRs "
+    "by age, assignee, label and repo, on every selected host; as host/org, on that host only.",
+)
+@click.option(
+    "--daemon/--no-daemon",
+    "use_daemon",
+    default=True,
+    help="Answer from a running *gitmine daemon* when there is one.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice([TABLE_FORMAT, JSON_FORMAT, JSONL_FORMAT, CSV_FORMAT]),
+    default=TABLE_FORMAT,
+    help="Print a table, or uncolored records to pipe into other tools. "
+    "jsonl and csv records are written as each repo is fetched.",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    default=False,
+    help="Keep polling Github and print the Issues / PRs that were opened, closed or "
+    "relabelled since the previous poll. Stop with Ctrl+C.",
+)
+@click.option(
+    "--interval",
+    type=click.IntRange(min=1),
+    default=DEFAULT_POLL_INTERVAL,
+    help="Seconds between two polls of --watch.",
+)
+@click.option(
+    "--limit",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Only print the N oldest (--asc) or newest Issues / PRs across all repos, in order. "
+    "Fetching stops as soon as no other page could make it into them.",
+)
+@click.option(
+    "--explain",
+    is_flag=True,
+    default=False,
+    help="Print the requests that would be sent to Github, without sending them.",
+)
 @click.argument("spec", nargs=1, required=True, type=click.Choice(["issues", "prs", "all"]))
+@add_options(_trace_cmd)
 @add_options(_verbose_cmd)
 @click.pass_context
 def get(
@@ -95,6 +264,26 @@ def get(
     asc: bool,
     repo: str,
     unassigned: bool,
+    cache: bool,
+    max_age: int,
+    backend: str,
+    concurrency: int,
+    offline: bool,
+    max_staleness: Optional[int],
+    labels: Tuple[str, ...],
+    milestone: Optional[str],
+    since: Optional[datetime],
+    host_names: Tuple[str, ...],
+    org: Optional[str],
+    use_daemon: bool,
+    output_format: str,
+    watch: bool,
+    interval: int,
+    limit: Optional[int],
+    explain: bool,
+    trace: bool,
+    trace_file: Optional[str],
+    profile: Optional[str],
     verbose: int,
 ) -> None:
     """Get assigned Github Issues and/or Github PRs.
@@ -102,24 +291,217 @@ def get(
     [issues|prs|all] is what information to pull.
     """
     set_verbosity(verbose)
-    get_command(ctx, spec, color, asc, repo, unassigned)
+    from gitmine.tracing import trace_command
+
+    with trace_command(trace, trace_file, profile):
+        from gitmine.filters import IssueFilters
+
+        filters = IssueFilters(labels, milestone, since)
+        if org:
+            if repo or offline or output_format != TABLE_FORMAT or limit is not None or explain:
+                raise click.BadOptionUsage(
+                    "org",
+                    "--org cannot be used with --repo, --offline, --format, --limit or --explain.",
+                )
+            from gitmine.commands.triage import triage_command
+
+            triage_command(
+                ctx,
+                org,
+                spec,
+                unassigned=unassigned,
+                cache=cache,
+                max_age=max_age,
+                concurrency=concurrency,
+                filters=filters,
+                host_names=host_names,
+            )
+            return
+
+        if watch:
+            if (
+                offline
+                or max_staleness is not None
+                or output_format != TABLE_FORMAT
+                or limit is not None
+                or explain
+            ):
+                raise click.BadOptionUsage(
+                    "watch",
+                    "--watch cannot be used with --offline, --max-staleness, --format, --limit "
+                    "or --explain.",
+                )
+            from gitmine.commands.watch import watch_command
+
+            watch_command(
+                ctx,
+                spec,
+                color,
+                asc,
+                repo,
+                unassigned,
+                interval=interval,
+                cache=cache,
+                max_age=max_age,
+                backend=backend,
+                concurrency=concurrency,
+                filters=filters,
+                host_names=host_names,
+            )
+            return
+
+        from gitmine.daemon import daemon_may_answer, get_from_daemon
+
+        if use_daemon and daemon_may_answer(
+            output_format=output_format,
+            limit=limit,
+            explain=explain,
+            cache=cache,
+            offline=offline,
+            filtered=bool(filters),
+            max_staleness=max_staleness,
+        ):
+            from gitmine.paths import GHP_DAEMON_SOCKET
+
+            if get_from_daemon(
+                GHP_DAEMON_SOCKET, spec, color, asc, repo or "", unassigned, host_names
+            ):
+                return
+
+        from gitmine.commands.get import get_command
+
+        get_command(
+            ctx,
+            spec,
+            color,
+            asc,
+            repo,
+            unassigned,
+            cache=cache,
+            max_age=max_age,
+            backend=backend,
+            concurrency=concurrency,
+            offline=offline,
+            max_staleness=max_staleness,
+            filters=filters,
+            host_names=host_names,
+            output_format=output_format,
+            limit=limit,
+            explain=explain,
+        )
+
+
+@gitmine.command()
+@click.option(
+    "--unassigned",
+    "-u",
+    is_flag=True,
+    default=False,
+    help="Also sync unassigned Issues from your repositories.",
+)
+@click.option(
+    "--full",
+    is_flag=True,
+    default=False,
+    help="Rebuild the index from scratch instead of fetching only what changed.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CONCURRENCY,
+    help="Maximum number of requests in flight at once.",
+)
+@add_options(_trace_cmd)
+@add_options(_verbose_cmd)
+@click.pass_context
+def sync(
+    ctx: click.Context,
+    unassigned: bool,
+    full: bool,
+    concurrency: int,
+    trace: bool,
+    trace_file: Optional[str],
+    profile: Optional[str],
+    verbose: int,
+) -> None:
+    """Mirror your Issues and PRs into a local index for fast *get --offline* queries."""
+    set_verbosity(verbose)
+    from gitmine.commands.sync import sync_command
+    from gitmine.tracing import trace_command
+
+    with trace_command(trace, trace_file, profile):
+        sync_command(ctx, unassigned, full, concurrency)
+
+
+@gitmine.command()
+@click.option(
+    "--unassigned",
+    "-u",
+    is_flag=True,
+    default=False,
+    help="Also keep unassigned Issues from your repositories fresh.",
+)
+@click.option(
+    "--interval",
+    type=click.IntRange(min=1),
+    default=DEFAULT_REFRESH_INTERVAL,
+    help="Seconds between two refreshes of the index.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CONCURRENCY,
+    help="Maximum number of requests in flight at once.",
+)
+@add_options(_verbose_cmd)
+@click.pass_context
+def daemon(
+    ctx: click.Context,
+    unassigned: bool,
+    interval: int,
+    concurrency: int,
+    verbose: int,
+) -> None:
+    """Keep your Issues and PRs fresh in the background and answer *get* from them."""
+    set_verbosity(verbose)
+    from gitmine.commands.daemon import daemon_command
+
+    daemon_command(ctx, unassigned, interval, concurrency)
 
 
 @gitmine.command()
-@click.argument("repo", nargs=1, required=True, type=click.STRING)
-@click.argument("number", nargs=1, required=False, type=click.INT)
+@click.argument("query", nargs=-1, required=True, type=click.STRING)
+@click.option(
+    "--max-staleness",
+    type=click.IntRange(min=0),
+    default=DEFAULT_GO_MAX_STALENESS,
+    help="Sync the local index in the background if it is older than this many seconds.",
+)
+@click.option(
+    "--list",
+    "list_only",
+    is_flag=True,
+    default=False,
+    help="Only print the best matches of QUERY, without opening any.",
+)
 @add_options(_verbose_cmd)
 @click.pass_context
 def go(
     ctx: click.Context,  # pylint: disable=unused-argument
-    repo: str,
-    number: Optional[int],
+    query: Tuple[str, ...],
+    max_staleness: int,
+    list_only: bool,
     verbose: int,
 ) -> None:
-    """Open a browser page for the given repositiory / issue.
+    """Open a browser page for the given repository / issue, or the best match of a search.
 
-    REPO is the full name of the repository to query.\n
-    NUMBER is the issue number of the repository to query. If this is not provided, will open a page to the main page of the repository.
+    QUERY is either the full name of a repository, optionally followed by an issue number
+    (the main page of the repository is opened without one), or words of the title, repo or
+    number of an Issue / PR, e.g. *gitmine go login safari*.\n
+    Searches are answered from the local index written by *gitmine sync*, even misspelled,
+    without network calls. Given several matches, you pick one.
     """
     set_verbosity(verbose)
-    go_command(repo, number)
+    from gitmine.commands.go import go_command
+
+    go_command(query, max_staleness=max_staleness, list_only=list_only)
@@ -0,0 +1,67 @@
+import contextlib
+import contextvars
+import os
+from typing import Dict, Iterator, NamedTuple, Optional
+
+GITHUB_HOST = "github.com"
+# Overridable to point gitmine at a stand-in server, e.g. for benchmarks
+GITHUB_API_URL = os.environ.get("GITMINE_API_URL", "https://api.github.com")
+
+
+def default_api_url(name: str) -> str:
+    """REST API root of a host: api.github.com, or /api/v3 of a Github Enterprise instance."""
+    return GITHUB_API_URL if name == GITHUB_HOST else f"https://{name}/api/v3"
+
+
+class Host(NamedTuple):
+    """A Github instance and the account gitmine queries it with."""
+
+    name: str
+    username: str
+    token: str
+    api_url: str
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+    @property
+    def graphql_url(self) -> str:
+        # Github Enterprise serves GraphQL next to the REST API, at /api/graphql
+        if self.api_url.endswith("/v3"):
+            return self.api_url[: -len("v3")] + "graphql"
+        return f"{self.api_url}/graphql"
+
+    def resolve(self, url: str) -> str:
+        """Point a URL built from the github.com endpoints at this host."""
+        for base, target in (
+            (f"{GITHUB_API_URL}/graphql", self.graphql_url),
+            (GITHUB_API_URL, self.api_url),
+        ):
+            if url.startswith(base):
+                return target + url[len(base) :]
+        return url
+
+    def repo_key(self, repo_name: str) -> str:
+        """Key of a repo of this host in a RepoDict merged across hosts."""
+        return repo_name if self.name == GITHUB_HOST else f"{self.name}/{repo_name}"
+
+
+_current_host: contextvars.ContextVar[Optional[Host]] = contextvars.ContextVar(
+    "current_host", default=None
+)
+
+
+def current_host() -> Optional[Host]:
+    """The host requests are sent to, None for github.com as configured by default."""
+    return _current_host.get()
+
+
+@contextlib.contextmanager
+def use_host(host: Host) -> Iterator[None]:
+    """Send the requests made in this context, and the tasks it submits, to *host*."""
+    token = _current_host.set(host)
+    try:
+        yield
+    finally:
+        _current_host.reset(token)
@@ -0,0 +1,289 @@
+import json
+import logging
+import math
+from pathlib import Path
+import re
+import sqlite3
+import time
+from typing import Any, Callable, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple, cast
+
+from gitmine.constants import ISSUE, PULL_REQUEST
+from gitmine.models.github_elements import GithubElement, RepoDict
+
+logger = logging.getLogger()
+
+# What an indexed element was fetched as; also the scope of its sync watermark
+ASSIGNED = "assigned"
+REVIEW_REQUESTED = "review_requested"
+UNASSIGNED = "unassigned"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS elements (
+    kind TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    elem_type TEXT NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (kind, repo, number)
+);
+CREATE TABLE IF NOT EXISTS watermarks (
+    scope TEXT PRIMARY KEY,
+    updated_at TEXT,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS trigrams (
+    gram TEXT NOT NULL,
+    element INTEGER NOT NULL,
+    PRIMARY KEY (gram, element)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS trigrams_by_element ON trigrams (element);
+"""
+# Stored in PRAGMA user_version; indexes written by an older version have their trigrams
+# rebuilt when opened
+_SCHEMA_VERSION = 1
+
+# Share of the trigrams of a query an element must contain to match it
+MIN_MATCH_SCORE = 0.5
+
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of the words of *text*, lowercased.
+
+    Words are padded as PostgreSQL's pg_trgm does, so that word starts weigh more and short
+    words count too: "bug" gives "  b", " bu", "bug" and "ug ".
+    """
+    grams: Set[str] = set()
+    for word in _SEPARATORS.split(text.lower()):
+        if word:
+            padded = f"  {word} "
+            grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class Match(NamedTuple):
+    repo: str
+    number: int
+    elem_type: str
+    title: str
+    url: str
+    score: float
+
+
+class IssueIndex:
+    """Local SQLite mirror of the Issues and PRs gitmine shows.
+
+    Each sync scope (assigned issues, review requests, and the unassigned issues of each
+    repo) keeps the newest *updated_at* it has seen, so the next sync only asks Github for
+    what changed since.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.executescript(_SCHEMA)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+            self._rebuild_trigrams()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def watermark(self, scope: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT updated_at FROM watermarks WHERE scope = ?", (scope,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def synced_at(self, scope: str) -> Optional[float]:
+        row = self.conn.execute(
+            "SELECT synced_at FROM watermarks WHERE scope = ?", (scope,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def is_fresh(self, scope: str, max_staleness: int) -> bool:
+        synced_at = self.synced_at(scope)
+        return synced_at is not None and time.time() - synced_at <= max_staleness
+
+    def mark_synced(self, scope: str, updated_at: Optional[str] = None) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO watermarks VALUES "
+                "(?, COALESCE(?, (SELECT updated_at FROM watermarks WHERE scope = ?)), ?)",
+                (scope, updated_at, scope, time.time()),
+            )
+
+    def apply(
+        self,
+        kind: str,
+        items: Iterable[Tuple[str, Mapping[str, Any]]],
+        *,
+        scope: str,
+        keep: Optional[Callable[[Mapping[str, Any]], bool]] = None,
+        replace: bool = False,
+    ) -> int:
+        """Upsert or delete *(repo, API object)* pairs and advance the watermark of *scope*.
+
+        Objects that are closed, or rejected by the optional *keep* predicate, are removed.
+        With *replace*, every other element of *kind* is removed in the same transaction, so
+        readers never see the kind empty. Returns the number of elements upserted.
+        """
+        newest = self.watermark(scope)
+        upserted = 0
+        with self.conn:
+            if replace:
+                self.conn.execute(
+                    "DELETE FROM trigrams WHERE element IN "
+                    "(SELECT rowid FROM elements WHERE kind = ?)",
+                    (kind,),
+                )
+                self.conn.execute("DELETE FROM elements WHERE kind = ?", (kind,))
+            for repo, obj in items:
+                if newest is None or obj["updated_at"] > newest:
+                    newest = obj["updated_at"]
+                self._delete_trigrams(kind, repo, obj["number"])
+                if obj.get("state", "open") != "open" or (keep and not keep(obj)):
+                    self.conn.execute(
+                        "DELETE FROM elements WHERE kind = ? AND repo = ? AND number = ?",
+                        (kind, repo, obj["number"]),
+                    )
+                    continue
+                cursor = self.conn.execute(
+                    "INSERT OR REPLACE INTO elements VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        kind,
+                        repo,
+                        obj["number"],
+                        PULL_REQUEST if kind == REVIEW_REQUESTED else ISSUE,
+                        obj["title"],
+                        obj["html_url"],
+                        json.dumps([label["name"] for label in obj["labels"]]),
+                        obj["created_at"],
+                        obj["updated_at"],
+                    ),
+                )
+                # Always set after an INSERT
+                element = cast(int, cursor.lastrowid)
+                self._insert_trigrams(element, f"{repo} {obj['number']} {obj['title']}")
+                upserted += 1
+        self.mark_synced(scope, newest)
+        return upserted
+
+    def retain(self, kind: str, keys: Set[Tuple[str, int]]) -> int:
+        """Remove the elements of *kind* whose *(repo, number)* is not in *keys*.
+
+        Returns the number of elements removed.
+        """
+        rows = self.conn.execute("SELECT rowid, repo, number FROM elements WHERE kind = ?", (kind,))
+        stale = [(rowid,) for rowid, repo, number in rows if (repo, number) not in keys]
+        with self.conn:
+            self.conn.executemany("DELETE FROM trigrams WHERE element = ?", stale)
+            self.conn.executemany("DELETE FROM elements WHERE rowid = ?", stale)
+        return len(stale)
+
+    def delete(self, kind: str, *, repo: Optional[str] = None) -> None:
+        with self.conn:
+            selection = "kind = ?" if repo is None else "kind = ? AND repo = ?"
+            args = (kind,) if repo is None else (kind, repo)
+            self.conn.execute(
+                f"DELETE FROM trigrams WHERE element IN "
+                f"(SELECT rowid FROM elements WHERE {selection})",
+                args,
+            )
+            self.conn.execute(f"DELETE FROM elements WHERE {selection}", args)
+
+    def clear(self) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM elements")
+            self.conn.execute("DELETE FROM watermarks")
+            self.conn.execute("DELETE FROM trigrams")
+
+    def repos(self, kind: str) -> List[str]:
+        rows = self.conn.execute("SELECT DISTINCT repo FROM elements WHERE kind = ?", (kind,))
+        return [row[0] for row in rows]
+
+    def load(self, kind: str, *, repo_name: str = "", asc: bool, color: bool) -> RepoDict:
+        """Build the same RepoDict a live fetch of *kind* would have returned."""
+        query = (
+            "SELECT repo, number, elem_type, title, url, labels, created_at FROM elements "
+            "WHERE kind = ?"
+        )
+        args: Tuple[str, ...] = (kind,)
+        if repo_name:
+            query += " AND repo = ?"
+            args += (repo_name,)
+        query += f" ORDER BY created_at {'ASC' if asc else 'DESC'}"
+
+        repositories = RepoDict()
+        for repo, number, elem_type, title, url, labels, created_at in self.conn.execute(
+            query, args
+        ):
+            obj = {
+                "title": title,
+                "number": number,
+                "html_url": url,
+                "labels": [{"name": name} for name in json.loads(labels)],
+                "created_at": created_at,
+            }
+            elem = GithubElement.from_dict(obj, elem_type=elem_type, color_coded=color)
+            if elem_type == PULL_REQUEST:
+                repositories[repo].add_pr(elem)
+            else:
+                repositories[repo].add_issue(elem)
+        return repositories
+
+    def search(self, query: str, limit: int = 10) -> List[Match]:
+        """The elements whose repo, number and title best match *query*, even misspelled.
+
+        Candidates are looked up by the trigrams they share with *query*, then ranked by the
+        share of the trigrams of *query* they contain and, among equals, newest first.
+        """
+        grams = trigrams(query)
+        if not grams:
+            return []
+        min_shared = max(1, math.ceil(MIN_MATCH_SCORE * len(grams)))
+        rows = self.conn.execute(
+            "SELECT e.repo, e.number, e.elem_type, e.title, e.url, c.shared FROM "
+            "(SELECT element, COUNT(*) AS shared FROM trigrams "
+            f"WHERE gram IN ({', '.join('?' * len(grams))}) "
+            "GROUP BY element HAVING shared >= ?) AS c "
+            "JOIN elements AS e ON e.rowid = c.element "
+            "ORDER BY c.shared DESC, e.created_at DESC",
+            (*grams, min_shared),
+        )
+        matches: List[Match] = []
+        urls = set()
+        for repo, number, elem_type, title, url, shared in rows:
+            if len(matches) == limit:
+                break
+            # An element indexed under several kinds is listed once
+            if url not in urls:
+                urls.add(url)
+                matches.append(Match(repo, number, elem_type, title, url, shared / len(grams)))
+        return matches
+
+    def _insert_trigrams(self, element: int, text: str) -> None:
+        self.conn.executemany(
+            "INSERT INTO trigrams VALUES (?, ?)", ((gram, element) for gram in trigrams(text))
+        )
+
+    def _delete_trigrams(self, kind: str, repo: str, number: int) -> None:
+        self.conn.execute(
+            "DELETE FROM trigrams WHERE element = "
+            "(SELECT rowid FROM elements WHERE kind = ? AND repo = ? AND number = ?)",
+            (kind, repo, number),
+        )
+
+    def _rebuild_trigrams(self) -> None:
+        with self.conn:
+            self.conn.execute("DROP TABLE IF EXISTS trigrams")
+            self.conn.executescript(_SCHEMA)
+            rows = self.conn.execute("SELECT rowid, repo, number, title FROM elements").fetchall()
+            for element, repo, number, title in rows:
+                self._insert_trigrams(element, f"{repo} {number} {title}")
+            self.conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
@@ -1,23 +1,71 @@
-from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Any, List, Mapping, Optional
+import calendar
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+import functools
+import sys
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 
 import click
 
 from gitmine.constants import (
     DANGER_DELTA_COLOR,
     ELEM_NUM_COLOR,
+    ISSUE,
     LABELS_COLOR,
     OK_DELTA,
     OK_DELTA_COLOR,
+    PULL_REQUEST,
     REPO_NAME_COLOR,
     WARNING_DELTA,
     WARNING_DELTA_COLOR,
 )
 
+_EPOCH = datetime(1970, 1, 1)
+
+
+def parse_timestamp(timestamp: str) -> int:
+    """Parse a Github "%Y-%m-%dT%H:%M:%SZ" timestamp into a UTC epoch.
+
+    Slicing the fixed-width fields is several times faster than *datetime.strptime*.
+    """
+    return calendar.timegm(
+        (
+            int(timestamp[0:4]),
+            int(timestamp[5:7]),
+            int(timestamp[8:10]),
+            int(timestamp[11:13]),
+            int(timestamp[14:16]),
+            int(timestamp[17:19]),
+            0,
+            0,
+            0,
+        )
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _style_affixes(fg: str, dim: bool, bold: bool) -> Tuple[str, str]:
+    prefix, suffix = click.style("\0", fg=fg, dim=dim, bold=bold).split("\0")
+    return prefix, suffix
+
+
+def style(text: str, fg: str, *, dim: bool = False, bold: bool = False) -> str:
+    """*click.style(text, fg=fg, dim=dim, bold=bold)*, with the escape codes of each style
+    computed only once."""
+    prefix, suffix = _style_affixes(fg, dim, bold)
+    return prefix + text + suffix
+
 
 class GithubElement:
-    """Container for Github Issue or Pull Request."""
+    """Container for Github Issue or Pull Request.
+
+    Sweeps can hold tens of thousands of these, so they are slotted, keep only the names of
+    their labels (interned, as few distinct labels are shared by many elements) and store
+    their creation time as an integer UTC epoch, turned into a datetime only when asked for.
+    """
+
+    __slots__ = ("elem_type", "title", "number", "url", "label_names", "created_ts", "color_coded")
 
     def __init__(
         self,
@@ -25,29 +73,59 @@ class GithubElement:
         title: str,
         number: int,
         url: str,
-        created_at: datetime,
+        created_at: Union[datetime, int],
         color_coded: bool,
-        labels: Optional[List[Mapping[str, Any]]] = None,
+        labels: Optional[Iterable[Union[str, Mapping[str, Any]]]] = None,
     ) -> None:
         self.elem_type = elem_type
         self.title = title
         self.number = number
         self.url = url
-        self.labels = labels
-        self.created_at = created_at
+        self.label_names: Tuple[str, ...] = tuple(
+            sys.intern(label if isinstance(label, str) else label["name"]) for label in labels or ()
+        )
+        if isinstance(created_at, datetime):
+            created_at = calendar.timegm(created_at.timetuple())
+        self.created_ts = created_at
         self.color_coded = color_coded
 
-    def get_formatted_args_for_table(self) -> List[Optional[str]]:
+    @property
+    def labels(self) -> List[Dict[str, str]]:
+        return [{"name": name} for name in self.label_names]
+
+    @property
+    def created_at(self) -> datetime:
+        """Creation time as a naive UTC datetime."""
+        return _EPOCH + timedelta(seconds=self.created_ts)
+
+    def to_record(self, repo_name: str) -> Dict[str, Any]:
+        """Plain fields of the element, for the machine-readable output formats."""
+        return {
+            "repo": repo_name,
+            "type": self.elem_type,
+            "number": self.number,
+            "title": self.title,
+            "url": self.url,
+            "labels": list(self.label_names),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.created_ts)),
+        }
+
+    def get_formatted_args_for_table(self, now: Optional[float] = None) -> List[Optional[str]]:
         """Format arguments for Tabulate table.
 
+        Args:
+            now: UTC epoch the age is computed against, the current time by default. Tables
+                pass one for all their rows.
+
         Returns:
             List comprised of Issue/PR number, name, labels, and date
         """
-        issue_num_with_color = click.style(f"#{self.number}", fg=ELEM_NUM_COLOR)
+        issue_num_with_color = style(f"#{self.number}", ELEM_NUM_COLOR)
 
-        date = click.style(
-            f"{self._get_elapsed_time().days} days ago",
-            fg=self._elapsed_time_to_color(self._get_elapsed_time()),
+        elapsed_time = self._get_elapsed_time(now)
+        date = style(
+            f"{elapsed_time.days} days ago",
+            self._elapsed_time_to_color(elapsed_time),
             dim=True,
         )
         return [issue_num_with_color, self.title, self._parse_labels_for_repr(), date]
@@ -68,15 +146,15 @@ class GithubElement:
 
     def _parse_labels_for_repr(self) -> str:
         """Parses Issue/PR labels as one string in parens."""
-        if self.labels:
-            label_names = [label["name"] for label in self.labels]
-            all_names = ", ".join(label_names)
-            if all_names:
-                return str(click.style(f"({all_names})", fg=LABELS_COLOR, dim=True))
+        all_names = ", ".join(self.label_names)
+        if all_names:
+            return style(f"({all_names})", LABELS_COLOR, dim=True)
         return ""
 
-    def _get_elapsed_time(self) -> timedelta:
-        return datetime.now() - self.created_at
+    def _get_elapsed_time(self, now: Optional[float] = None) -> timedelta:
+        if now is None:
+            now = datetime.now(timezone.utc).timestamp()
+        return timedelta(seconds=now - self.created_ts)
 
     @classmethod
     def from_dict(
@@ -89,7 +167,7 @@ class GithubElement:
             number=obj["number"],
             labels=obj["labels"],
             url=obj["html_url"],
-            created_at=datetime.strptime(obj["created_at"], "%Y-%m-%dT%H:%M:%SZ"),
+            created_at=parse_timestamp(obj["created_at"]),
             color_coded=color_coded,
         )
 
@@ -114,14 +192,18 @@ class Repository:
     def has_prs(self) -> bool:
         return bool(self.prs)
 
-    def format_for_table(self, elem: str) -> List[List[Optional[str]]]:
-        res = list([[None, click.style(self.name, fg=REPO_NAME_COLOR, bold=True), None]])
+    def records(self, elem: str) -> Iterator[Dict[str, Any]]:
+        for element in self.issues if elem == "issues" else self.prs:
+            yield element.to_record(self.name)
+
+    def format_for_table(self, elem: str, now: Optional[float] = None) -> List[List[Optional[str]]]:
+        res = list([[None, style(self.name, REPO_NAME_COLOR, bold=True), None]])
         if elem == "issues":
             for issue in self.issues:
-                res.append(issue.get_formatted_args_for_table())
+                res.append(issue.get_formatted_args_for_table(now))
         elif elem == "prs":
             for pr in self.prs:
-                res.append(pr.get_formatted_args_for_table())
+                res.append(pr.get_formatted_args_for_table(now))
         # Append row of None's for space between Repos
         res.append([None, None, None])
         return res
@@ -139,3 +221,62 @@ class RepoDict(defaultdict):  # type: ignore
 
     def total_num_of_prs(self) -> int:
         return sum(len(r.prs) for r in self.values())
+
+
+# Age buckets of the OK_DELTA / WARNING_DELTA thresholds, youngest first
+AGE_BUCKETS = (
+    f"< {OK_DELTA} days",
+    f"{OK_DELTA}-{WARNING_DELTA} days",
+    f">= {WARNING_DELTA} days",
+)
+NO_ASSIGNEE = "(unassigned)"
+
+
+def age_bucket(elapsed: timedelta) -> str:
+    if elapsed < timedelta(days=OK_DELTA):
+        return AGE_BUCKETS[0]
+    if elapsed < timedelta(days=WARNING_DELTA):
+        return AGE_BUCKETS[1]
+    return AGE_BUCKETS[2]
+
+
+class ElementStats:
+    """Counts of Issues / PRs by age, label, assignee and repo.
+
+    Built one API object at a time, so that a sweep never holds more than a page of them.
+    Every count is keyed by element type first.
+    """
+
+    def __init__(self) -> None:
+        self.totals: "Counter[str]" = Counter()
+        self.by_age: "Counter[Tuple[str, str]]" = Counter()
+        self.by_label: "Counter[Tuple[str, str]]" = Counter()
+        self.by_assignee: "Counter[Tuple[str, str]]" = Counter()
+        self.by_repo: "Counter[Tuple[str, str]]" = Counter()
+
+    def add(self, repo_name: str, obj: Mapping[str, Any], elem_type: str, now: float) -> None:
+        """Count an object of a REST issue listing."""
+        self.totals[elem_type] += 1
+        elapsed = timedelta(seconds=now - parse_timestamp(obj["created_at"]))
+        self.by_age[elem_type, age_bucket(elapsed)] += 1
+        for label in obj["labels"]:
+            self.by_label[elem_type, label["name"]] += 1
+        for assignee in obj.get("assignees") or [{"login": NO_ASSIGNEE}]:
+            self.by_assignee[elem_type, assignee["login"]] += 1
+        self.by_repo[elem_type, repo_name] += 1
+
+    def merge(self, other: "ElementStats") -> None:
+        self.totals.update(other.totals)
+        self.by_age.update(other.by_age)
+        self.by_label.update(other.by_label)
+        self.by_assignee.update(other.by_assignee)
+        self.by_repo.update(other.by_repo)
+
+    def total_num_of_issues(self) -> int:
+        return self.totals[ISSUE]
+
+    def total_num_of_prs(self) -> int:
+        return self.totals[PULL_REQUEST]
+
+    def num_of_repos(self) -> int:
+        return len({repo for _, repo in self.by_repo})
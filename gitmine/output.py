@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+from typing import Any, Iterable, Mapping, Tuple
+
+import click
+
+from gitmine.constants import CSV_FORMAT, JSON_FORMAT, JSONL_FORMAT
+from gitmine.models.github_elements import GithubElement, Repository
+
+RECORD_FIELDS = ("repo", "type", "number", "title", "url", "labels", "created_at")
+
+
+class RecordWriter:
+    """Writes Issues / PRs to stdout as JSON, JSON Lines or CSV records.
+
+    Records are written one repository at a time as the repositories arrive, without styling
+    or pager, so that a sweep can be piped into jq or a loader and never be held whole.
+    """
+
+    def __init__(self, output_format: str) -> None:
+        if output_format not in (JSON_FORMAT, JSONL_FORMAT, CSV_FORMAT):
+            raise ValueError(f"Unknown output format: {output_format}")
+        self.output_format = output_format
+        self.count = 0
+        self._buffer = io.StringIO()
+        self._csv = csv.writer(self._buffer, lineterminator="\n")
+
+    def write(self, repos: Iterable[Repository], elem: str) -> None:
+        for repo in repos:
+            self._write(repo.records(elem))
+
+    def write_elements(self, elements: Iterable[Tuple[str, GithubElement]]) -> None:
+        """Write (repo name, element) pairs in their order, e.g. those of *--limit*."""
+        self._write(element.to_record(repo_name) for repo_name, element in elements)
+
+    def close(self) -> None:
+        if self.output_format == JSON_FORMAT:
+            click.echo("\n]" if self.count else "[]")
+        elif self.output_format == CSV_FORMAT and not self.count:
+            click.echo(self._csv_row(RECORD_FIELDS), nl=False)
+
+    def _write(self, records: Iterable[Mapping[str, Any]]) -> None:
+        chunk = "".join(self._format(record) for record in records)
+        if chunk:
+            click.echo(chunk, nl=False)
+
+    def _format(self, record: Mapping[str, Any]) -> str:
+        first = not self.count
+        self.count += 1
+        if self.output_format == JSONL_FORMAT:
+            return json.dumps(record) + "\n"
+        if self.output_format == JSON_FORMAT:
+            return ("[\n  " if first else ",\n  ") + json.dumps(record)
+        row = self._csv_row(
+            [
+                ",".join(record[field]) if field == "labels" else record[field]
+                for field in RECORD_FIELDS
+            ]
+        )
+        return self._csv_row(RECORD_FIELDS) + row if first else row
+
+    def _csv_row(self, values: Iterable[Any]) -> str:
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._csv.writerow(values)
+        return self._buffer.getvalue()
@@ -3,3 +3,7 @@ from pathlib import Path
 GH_CREDENTIALS_PATH = Path.home() / ".config" / "gh" / "hosts.yml"
 GHP_CREDENTIALS_DIR = Path.home() / ".config" / "ghp"
 GHP_CREDENTIALS_PATH = GHP_CREDENTIALS_DIR / "hosts.yml"
+GHP_CACHE_DIR = GHP_CREDENTIALS_DIR / "cache"
+GHP_INDEX_PATH = GHP_CREDENTIALS_DIR / "index.sqlite3"
+GHP_DAEMON_SOCKET = GHP_CREDENTIALS_DIR / "daemon.sock"
+GHP_SYNC_PIDFILE = GHP_CREDENTIALS_DIR / "sync.pid"
@@ -0,0 +1,128 @@
+import concurrent.futures
+import logging
+import time
+from typing import Any, Callable, Iterator, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+from requests import Response
+
+from gitmine.constants import DEFAULT_CONCURRENCY
+from gitmine.decoding import loads
+from gitmine.endpoints import SEARCH_ENDPOINT
+from gitmine.models.github_elements import parse_timestamp
+from gitmine.tracing import span
+from gitmine.utils import PER_PAGE, follow_pages, get_executor, get_session
+
+logger = logging.getLogger()
+
+# Most results the Search API returns for a query, however many match it
+SEARCH_RESULTS_CAP = 1000
+# Start of the first shard: nothing on Github was created before
+SEARCH_EPOCH = parse_timestamp("2008-01-01T00:00:00Z")
+# End of the last shard, past the current time to allow for clock skew
+SEARCH_HORIZON = 24 * 60 * 60
+
+
+def _iso(timestamp: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(timestamp))
+
+
+class Shard(NamedTuple):
+    """Part of a search: the results created between two UTC epochs, both included.
+
+    The whole search is the shard without bounds.
+    """
+
+    start: Optional[int] = None
+    end: Optional[int] = None
+
+    def query(self, query: str) -> str:
+        if self.start is None or self.end is None:
+            return query
+        return f"{query} created:{_iso(self.start)}..{_iso(self.end)}"
+
+    def can_split(self) -> bool:
+        return self.start is None or self.end is None or self.end > self.start
+
+    def halves(self) -> Tuple["Shard", "Shard"]:
+        start = SEARCH_EPOCH if self.start is None else self.start
+        end = int(time.time()) + SEARCH_HORIZON if self.end is None else self.end
+        middle = (start + end) // 2
+        return Shard(start, middle), Shard(middle + 1, end)
+
+
+class _FirstPage(NamedTuple):
+    shard: Shard
+    total: int
+    items: List[Any]
+    response: Response
+    params: Mapping[str, str]
+
+
+def search_issues(
+    query: str,
+    headers: Mapping[str, str],
+    *,
+    project: Optional[Callable[[Any], Any]] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> Iterator[Any]:
+    """Yield every Issue / PR matching a search *query*, in no particular order.
+
+    The Search API returns at most 1000 results per query. A query whose *total_count* is
+    over that is split in two by *created:* ranges, and each half again until every shard
+    has at most 1000 results; shards are then paginated in parallel. Searches are paced by
+    the scheduler of the search rate limit. Results are deduplicated, as an element may
+    move between pages, and so be listed twice, while a query is paginated.
+    """
+    url = SEARCH_ENDPOINT.copy()
+    url.add(path="/issues")
+    executor = get_executor(concurrency)
+
+    def first_page(shard: Shard) -> _FirstPage:
+        params = {"q": shard.query(query), "per_page": str(PER_PAGE)}
+        response = get_session().safe_get(url, headers=headers, params=params)
+        with span("decode", "json"):
+            body = loads(response.content)
+            items = [project(item) for item in body["items"]] if project else body["items"]
+        return _FirstPage(shard, body["total_count"], items, response, params)
+
+    def next_pages(page: _FirstPage) -> List[Any]:
+        return list(
+            follow_pages(
+                page.response, url, headers, page.params, items_key="items", project=project
+            )
+        )
+
+    seen: Set[str] = set()
+    # Futures of first pages (a _FirstPage) and of the next pages of shards (their items)
+    pending: Set["concurrent.futures.Future[Any]"] = {executor.submit(first_page, Shard())}
+    try:
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                page = future.result()
+                if not isinstance(page, _FirstPage):
+                    items = page
+                elif page.total > SEARCH_RESULTS_CAP and page.shard.can_split():
+                    logger.debug(f"{page.total} results for {page.params['q']}, splitting it")
+                    pending.update(
+                        executor.submit(first_page, half) for half in page.shard.halves()
+                    )
+                    continue
+                else:
+                    if page.total > SEARCH_RESULTS_CAP:
+                        logger.warning(
+                            f"Only {SEARCH_RESULTS_CAP} of the {page.total} results of "
+                            f"{page.params['q']} can be fetched"
+                        )
+                    if page.response.links.get("next"):
+                        pending.add(executor.submit(next_pages, page))
+                    items = page.items
+                for item in items:
+                    if item["html_url"] not in seen:
+                        seen.add(item["html_url"])
+                        yield item
+    finally:
+        for future in pending:
+            future.cancel()
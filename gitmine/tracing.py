@@ -0,0 +1,276 @@
+import contextlib
+import functools
+import json
+from pathlib import Path
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import click
+
+# Per-request timings collected by *Tracer.timed_request*, in the order they happen
+REQUEST_PHASES = ("connect", "ttfb", "download")
+
+_connect_time = threading.local()
+
+
+class Tracer:
+    """Collects timed spans and counters of one command run.
+
+    Spans are kept as Chrome trace events (see *chrome_trace*), so that a run can be opened
+    in chrome://tracing or Perfetto, and are also reduced to the table printed by *summary*.
+    """
+
+    def __init__(self) -> None:
+        self.origin = time.perf_counter()
+        self.events: List[Dict[str, Any]] = []
+        self.counters: Dict[str, int] = {}
+        self.rate_limit_remaining: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _timestamp(self, at: float) -> float:
+        return (at - self.origin) * 1e6
+
+    def add_span(self, name: str, category: str, start: float, end: float, **args: Any) -> None:
+        """Record a span between two *time.perf_counter* readings."""
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": self._timestamp(start),
+            "dur": (end - start) * 1e6,
+            "pid": 1,
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def count(self, counter: str, url: str = "") -> None:
+        """Bump *counter* and mark when it happened, e.g. a cache hit or a retry."""
+        event = {
+            "name": counter,
+            "cat": "counter",
+            "ph": "i",
+            "s": "t",
+            "ts": self._timestamp(time.perf_counter()),
+            "pid": 1,
+            "tid": threading.get_ident(),
+            "args": {"url": url},
+        }
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + 1
+            self.events.append(event)
+
+    def observe_rate_limit(self, headers: Mapping[str, str]) -> None:
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        event = {
+            "name": "rate limit remaining",
+            "cat": "rate limit",
+            "ph": "C",
+            "ts": self._timestamp(time.perf_counter()),
+            "pid": 1,
+            "args": {"remaining": int(remaining)},
+        }
+        with self._lock:
+            if self.rate_limit_remaining is None or int(remaining) < self.rate_limit_remaining:
+                self.rate_limit_remaining = int(remaining)
+            self.events.append(event)
+
+    def timed_request(self, send: Callable[..., Any], url: Any, **kwargs: Any) -> Any:
+        """Call *send* (e.g. *Session.get*), recording its connect, TTFB and download times.
+
+        The body is streamed so that waiting for the first byte and downloading the rest are
+        told apart; connecting, TLS included, is only timed on sessions set up by
+        *instrument_session*.
+        """
+        _connect_time.seconds = 0.0
+        start = time.perf_counter()
+        response = send(url, stream=True, **kwargs)
+        headers_at = time.perf_counter()
+        response.content  # pylint: disable=pointless-statement
+        end = time.perf_counter()
+        self.add_request(
+            response.request.method,
+            response.url,
+            response.status_code,
+            response.headers,
+            start=start,
+            headers_at=headers_at,
+            end=end,
+            connect=_connect_time.seconds,
+        )
+        return response
+
+    def add_request(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        headers: Mapping[str, str],
+        *,
+        start: float,
+        headers_at: float,
+        end: float,
+        connect: float = 0.0,
+    ) -> None:
+        """Record a request sent at *start*, whose headers came at *headers_at*."""
+        self.add_span(
+            f"{method} {url}",
+            "request",
+            start,
+            end,
+            status=status,
+            connect=connect,
+            ttfb=headers_at - start - connect,
+            download=end - headers_at,
+        )
+        self.observe_rate_limit(headers)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+    def summary(self) -> str:
+        """Table of where the time went: request phases, decoding, rendering and more."""
+        from tabulate import tabulate  # pylint: disable=import-outside-toplevel
+
+        timings: Dict[Tuple[str, str], List[float]] = {}
+        with self._lock:
+            for event in self.events:
+                if event["ph"] != "X":
+                    continue
+                if event["cat"] == "request":
+                    for phase in REQUEST_PHASES:
+                        timings.setdefault(("request", phase), []).append(event["args"][phase])
+                else:
+                    key = (event["cat"], event["name"])
+                    timings.setdefault(key, []).append(event["dur"] / 1e6)
+            counters = dict(self.counters)
+            remaining = self.rate_limit_remaining
+
+        rows = [
+            [
+                f"{category}: {name}",
+                len(durations),
+                f"{sum(durations):.3f}",
+                f"{sum(durations) / len(durations) * 1000:.1f}",
+                f"{max(durations) * 1000:.1f}",
+            ]
+            for (category, name), durations in timings.items()
+        ]
+        table = tabulate(rows, headers=["Span", "Count", "Total (s)", "Mean (ms)", "Max (ms)"])
+        totals = [
+            f"{len(timings.get(('request', 'ttfb'), []))} requests",
+            *(f"{count} {counter}" for counter, count in sorted(counters.items())),
+        ]
+        if remaining is not None:
+            totals.append(f"{remaining} requests left in the rate limit")
+        return f"{table}\n\n{', '.join(totals)}"
+
+
+_tracer: Optional[Tracer] = None
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Install the tracer that requests and phases report to, or disable tracing with None."""
+    global _tracer  # pylint: disable=global-statement
+    _tracer = tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+@contextlib.contextmanager
+def span(name: str, category: str, **args: Any) -> Iterator[None]:
+    """Record the enclosed block as a span of the installed tracer, if any."""
+    tracer = _tracer
+    if tracer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        tracer.add_span(name, category, start, time.perf_counter(), **args)
+
+
+def count(counter: str, url: Any = "") -> None:
+    if _tracer is not None:
+        _tracer.count(counter, str(url))
+
+
+def instrument_session(session: Any) -> None:
+    """Time how long the connections opened by a *requests* session take to connect."""
+    pool_classes = _timed_pool_classes()
+    for adapter in session.adapters.values():
+        adapter.poolmanager.pool_classes_by_scheme = pool_classes
+
+
+@functools.lru_cache(maxsize=None)
+def _timed_pool_classes() -> Dict[str, type]:
+    # pylint: disable=import-outside-toplevel
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class TimedHTTPConnection(HTTPConnection):
+        def connect(self) -> None:
+            start = time.perf_counter()
+            try:
+                super().connect()
+            finally:
+                _add_connect_time(time.perf_counter() - start)
+
+    class TimedHTTPSConnection(HTTPSConnection):
+        def connect(self) -> None:
+            start = time.perf_counter()
+            try:
+                super().connect()
+            finally:
+                _add_connect_time(time.perf_counter() - start)
+
+    class TimedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = TimedHTTPConnection
+
+    class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = TimedHTTPSConnection
+
+    return {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+
+
+def _add_connect_time(seconds: float) -> None:
+    _connect_time.seconds = getattr(_connect_time, "seconds", 0.0) + seconds
+
+
+@contextlib.contextmanager
+def trace_command(
+    summary: bool, trace_file: Optional[str], profile_file: Optional[str]
+) -> Iterator[None]:
+    """Trace and/or profile the enclosed command, for *--trace*, *--trace-file* and *--profile*.
+
+    Reports are written to stderr, out of the way of records piped from stdout.
+    """
+    tracer = Tracer() if summary or trace_file else None
+    set_tracer(tracer)
+    profiler = None
+    if profile_file:
+        import cProfile  # pylint: disable=import-outside-toplevel
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None and profile_file:
+            profiler.disable()
+            profiler.dump_stats(profile_file)
+            click.echo(f"Profile written to {profile_file}", err=True)
+        set_tracer(None)
+        if tracer is not None and trace_file:
+            Path(trace_file).write_text(json.dumps(tracer.chrome_trace()))
+            click.echo(f"Trace written to {trace_file}", err=True)
+        if tracer is not None and summary:
+            click.echo(tracer.summary(), err=True)
@@ -1,20 +1,361 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import contextvars
 import logging
-from typing import Callable, Mapping
+import random
+import threading
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
 
 import click
 from furl import furl
 import requests
 from requests import Response, Session
+from requests.adapters import HTTPAdapter
 
+from gitmine.cache import get_response_cache
+from gitmine.constants import DEFAULT_CONCURRENCY
+from gitmine.decoding import loads
+from gitmine.hosts import GITHUB_HOST, current_host
+from gitmine.tracing import count, get_tracer, instrument_session, span
 
-def set_verbosity(verbose: int) -> None:
-    """Sets the Log Level given a verbose number."""
-    if verbose == 1:
-        click.echo("Logging level set to INFO.")
-        logging.basicConfig(level=logging.INFO)
-    elif verbose >= 2:
-        click.echo("Logging level set to DEBUG.")
-        logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger()
+
+T = TypeVar("T")
+
+# Largest page size accepted by the Github REST API
+PER_PAGE = 100
+MAX_PAGE_WORKERS = 5
+
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0  # seconds
+BACKOFF_CAP = 60.0  # seconds
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+# A response this many times slower than the fastest one seen counts as congestion
+LATENCY_TOLERANCE = 3.0
+# Share of a rate limit left below which requests are spread out evenly until it resets
+PACING_SHARE = 0.5
+
+# Rate limits of the Github API: search requests have a (much smaller) budget of their own
+CORE_RESOURCE = "core"
+SEARCH_RESOURCE = "search"
+RATE_LIMIT_RESOURCES = (CORE_RESOURCE, SEARCH_RESOURCE)
+
+
+_sessions: Dict[str, "SafeSession"] = {}
+_sessions_lock = threading.Lock()
+
+_executor: Optional["ContextExecutor"] = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+class RequestScheduler:
+    """Gate shared by every request to the Github API.
+
+    * Spreads requests out once less than half of the rate limit is left, so that what is
+      left lasts until *X-RateLimit-Reset*; pauses new requests until then only when it
+      would not cover the requests already in flight.
+    * Retries transient failures (5xx, 429, secondary rate limits and connection errors),
+      honouring *Retry-After* and otherwise backing off exponentially with full jitter.
+    * Adapts the number of requests in flight: additive increase while latency stays low,
+      multiplicative decrease on errors or congestion.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = DEFAULT_CONCURRENCY,
+        *,
+        max_retries: int = MAX_RETRIES,
+        backoff_base: float = BACKOFF_BASE,
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.limit = float(max_in_flight)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        # Seconds between the starts of two requests while paced, until *paced_until*
+        self.spacing = 0.0
+        self.paced_until = 0.0
+        self._next_start = 0.0
+        self._best_latency: Optional[float] = None
+        self._cond = threading.Condition()
+
+    def run(self, send: Callable[[], Response]) -> Response:
+        """Call *send* under the scheduler, retrying it while it fails transiently."""
+        attempt = 0
+        while True:
+            with span("wait for a slot", "scheduler"):
+                self._acquire()
+            start = time.monotonic()
+            try:
+                response = send()
+            except requests.exceptions.ConnectionError:
+                delay = self._after_connection_error(start, attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self._after_response(response, start, attempt)
+                if delay is None:
+                    return response
+            count("retries")
+            time.sleep(delay)
+            attempt += 1
+
+    async def run_async(self, send: Callable[[], Awaitable[Response]]) -> Response:
+        """*run* for a coroutine *send*, waiting for a slot without blocking the event loop.
+
+        *send* must raise *requests.exceptions.ConnectionError* for connection errors.
+        """
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            with span("wait for a slot", "scheduler"):
+                await loop.run_in_executor(None, self._acquire)
+            start = time.monotonic()
+            try:
+                response = await send()
+            except requests.exceptions.ConnectionError:
+                delay = self._after_connection_error(start, attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self._after_response(response, start, attempt)
+                if delay is None:
+                    return response
+            count("retries")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _after_connection_error(self, start: float, attempt: int) -> Optional[float]:
+        """Release the slot of a failed attempt; return how long to wait before retrying it."""
+        self._release(time.monotonic() - start, ok=False)
+        if attempt >= self.max_retries:
+            return None
+        delay = self._backoff(attempt)
+        logger.info(f"Connection error, retrying in {delay:.1f}s")
+        return delay
+
+    def _after_response(self, response: Response, start: float, attempt: int) -> Optional[float]:
+        """Release the slot of an attempt; return how long to wait before retrying it, if at all."""
+        self._observe_rate_limit(response)
+        retry_delay = self._retry_delay(response, attempt)
+        self._release(time.monotonic() - start, ok=retry_delay is None)
+        if retry_delay is None or attempt >= self.max_retries:
+            return None
+        logger.info(
+            f"Got status {response.status_code} for {response.url}, "
+            f"retrying in {retry_delay:.1f}s"
+        )
+        return retry_delay
+
+    def _acquire(self) -> None:
+        with self._cond:
+            while True:
+                now = time.time()
+                wait = max(self.paused_until, self._next_start) - now
+                if wait <= 0 and self.in_flight < max(1, int(self.limit)):
+                    break
+                self._cond.wait(timeout=wait if wait > 0 else None)
+            self.in_flight += 1
+            if now < self.paced_until:
+                self._next_start = now + self.spacing
+
+    def _release(self, latency: float, *, ok: bool) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            if not ok:
+                self.limit = max(1.0, self.limit / 2)
+            elif self._best_latency is None or latency < self._best_latency:
+                self._best_latency = latency
+                self.limit = min(float(self.max_in_flight), self.limit + 1 / self.limit)
+            elif latency > LATENCY_TOLERANCE * self._best_latency:
+                self.limit = max(1.0, self.limit * 0.9)
+            else:
+                self.limit = min(float(self.max_in_flight), self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def _observe_rate_limit(self, response: Response) -> None:
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        limit = int(response.headers.get("X-RateLimit-Limit", 0))
+        with self._cond:
+            # Sent, but not yet counted in *remaining*; this request is still in flight
+            budget = int(remaining) - (self.in_flight - 1)
+            if budget <= 0:
+                if float(reset) > self.paused_until:
+                    logger.warning(
+                        f"Only {remaining} requests left in the Github rate limit, "
+                        f"waiting {max(0.0, float(reset) - time.time()):.0f}s for it to reset"
+                    )
+                    self.paused_until = float(reset)
+            elif int(remaining) < PACING_SHARE * limit:
+                spacing = max(0.0, float(reset) - time.time()) / budget
+                if self.paced_until < time.time():
+                    logger.info(
+                        f"Only {remaining} of {limit} requests left in the Github rate limit, "
+                        f"spacing requests {spacing:.1f}s apart until it resets"
+                    )
+                self.spacing = spacing
+                self.paced_until = float(reset)
+            else:
+                self.paced_until = 0.0
+
+    def _retry_delay(self, response: Response, attempt: int) -> Optional[float]:
+        """Return how long to wait before retrying *response*, or None if it is final."""
+        status = response.status_code
+        if status in (403, 429):
+            if "Retry-After" in response.headers:
+                return float(response.headers["Retry-After"])
+            if response.headers.get("X-RateLimit-Remaining") == "0":
+                reset = float(response.headers.get("X-RateLimit-Reset", 0))
+                return max(0.0, reset - time.time()) + 1
+            if status == 429 or "rate limit" in response.text.lower():
+                return self._backoff(attempt)
+            return None
+        if status in TRANSIENT_STATUS_CODES:
+            return self._backoff(attempt)
+        return None
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(BACKOFF_CAP, self.backoff_base * 2**attempt))
+
+
+_scheduler = RequestScheduler()
+
+
+class SingleFlight:
+    """Runs a call once for all the threads asking for it while it is in flight.
+
+    The first thread to ask for a key runs the call; the others wait for, and share, its
+    result or exception.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, "concurrent.futures.Future[Any]"] = {}
+
+    def run(self, key: Hashable, call: Callable[[], T], *, label: str = "") -> T:
+        """Run *call*, or wait for the run of *key* in flight; *label* names it in traces."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if future is None:
+                future = self._calls[key] = concurrent.futures.Future()
+        if not leader:
+            count("coalesced requests", label)
+            return cast(T, future.result())
+        try:
+            result = call()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+_single_flight = SingleFlight()
+
+
+_host_schedulers: Dict[Tuple[str, str], RequestScheduler] = {}
+_host_schedulers_lock = threading.Lock()
+
+
+def set_scheduler(scheduler: RequestScheduler) -> None:
+    """Replace the scheduler used by *safe_request*, e.g. to match the configured concurrency.
+
+    Sessions are recreated too, with connection pools of the new size.
+    """
+    global _scheduler  # pylint: disable=global-statement
+    with _host_schedulers_lock:
+        _scheduler = scheduler
+        _host_schedulers.clear()
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def get_scheduler(resource: str = CORE_RESOURCE) -> RequestScheduler:
+    """The scheduler of a rate limit *resource* of the current host.
+
+    Each host, and each resource of a host, has a rate limit budget of its own, so that e.g.
+    searches waiting for theirs to reset do not hold up the other requests.
+    """
+    host = current_host()
+    name = host.name if host is not None else GITHUB_HOST
+    if name == GITHUB_HOST and resource == CORE_RESOURCE:
+        return _scheduler
+    with _host_schedulers_lock:
+        if (name, resource) not in _host_schedulers:
+            _host_schedulers[name, resource] = RequestScheduler(
+                _scheduler.max_in_flight,
+                max_retries=_scheduler.max_retries,
+                backoff_base=_scheduler.backoff_base,
+            )
+        return _host_schedulers[name, resource]
+
+
+def rate_limit_resource(url: furl) -> str:
+    """The rate limit resource a request to *url* spends."""
+    segments = list(url.path.segments)
+    if segments[:2] == ["api", "v3"]:  # REST API root of Github Enterprise
+        segments = segments[2:]
+    return SEARCH_RESOURCE if segments[:1] == ["search"] else CORE_RESOURCE
+
+
+class ContextExecutor(concurrent.futures.ThreadPoolExecutor):
+    """Thread pool whose tasks run in the context they were submitted from, e.g. its host."""
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:  # type: ignore
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def get_executor(max_workers: int = DEFAULT_CONCURRENCY) -> concurrent.futures.ThreadPoolExecutor:
+    """Return the executor shared by every per-repo fan-out of the process.
+
+    Tasks submitted to it must not wait on other tasks of the same executor.
+    """
+    global _executor, _executor_workers  # pylint: disable=global-statement
+    with _executor_lock:
+        if _executor is None or _executor_workers != max_workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ContextExecutor(max_workers=max_workers)
+            _executor_workers = max_workers
+        return _executor
+
+
+@contextlib.contextmanager
+def log_duration(phase: str) -> Iterator[None]:
+    """Log how long the enclosed block took at DEBUG level, and trace it with *--trace*."""
+    start = time.perf_counter()
+    try:
+        with span(phase, "phase"):
+            yield
+    finally:
+        logger.debug(f"{phase} took {time.perf_counter() - start:.2f}s")
 
 
 def safe_request(
@@ -22,22 +363,131 @@ def safe_request(
     url: furl,
     headers: Mapping[str, str],
     params: Mapping[str, str],
+    *,
+    cacheable: bool = True,
 ) -> Response:
-    """Wrapper around request to safely return ConnectionError's and bad responses."""
+    """Wrapper around request to safely return ConnectionError's and bad responses.
+
+    If a response cache is installed, fresh entries are served without a request and stale
+    ones are revalidated with a conditional request. Requests whose response depends on
+    more than the URL and parameters (e.g. a POST body) must pass ``cacheable=False``;
+    the others are coalesced: threads asking for a request already in flight wait for its
+    response (or error) instead of sending it again.
+    """
+    host = current_host()
+    if host is not None:
+        url = furl(host.resolve(str(url)))
+    if not cacheable:
+        return _send_request(request_func, url, headers, params, cacheable=False)
+    key = (str(url), tuple(sorted(params.items())), tuple(sorted(headers.items())))
+    return _single_flight.run(
+        key,
+        lambda: _send_request(request_func, url, headers, params, cacheable=True),
+        label=str(url),
+    )
+
+
+class _CacheLookup:
+    """The response cache's part in one request.
+
+    Either *hit* is a fresh cached response to return without sending the request, or
+    *headers* carry the validators of a stale entry, to revalidate it with a conditional
+    request.
+    """
+
+    def __init__(
+        self, url: furl, headers: Mapping[str, str], params: Mapping[str, str], cacheable: bool
+    ) -> None:
+        self.cache = get_response_cache() if cacheable else None
+        self.headers = headers
+        self.hit: Optional[Response] = None
+        self.cached = None
+        if self.cache is None:
+            return
+        self.key = self.cache.key(url, params, headers)
+        self.cached = self.cache.get(self.key)
+        if self.cached is None:
+            return
+        if self.cached.is_fresh(self.cache.max_age):
+            logger.debug(f"Cache hit for {url}")
+            count("cache hits", url)
+            self.hit = self.cached.to_response()
+        else:
+            self.headers = {**headers, **self.cached.validators()}
+
+    def finish(self, url: furl, response: Response) -> Response:
+        """Check the status of *response*, and answer a 304 from or store a 200 in the cache."""
+        if response.status_code == 304 and self.cache is not None and self.cached is not None:
+            logger.debug(f"Cache revalidated for {url}")
+            count("cache revalidations", url)
+            self.cache.touch(self.key)
+            return self.cached.to_response()
+
+        if response.status_code == 401:
+            message = "Unauthorized Error 401: Bad Credentials"
+            raise click.ClickException(message)
+
+        elif response.status_code != 200:
+            message = f"Error encountered with status code: {response.status_code}"
+            raise click.ClickException(message)
+
+        if self.cache is not None:
+            self.cache.put(self.key, response)
+        return response
+
+
+def _send_request(
+    request_func: Callable[..., Response],
+    url: furl,
+    headers: Mapping[str, str],
+    params: Mapping[str, str],
+    *,
+    cacheable: bool,
+) -> Response:
+    lookup = _CacheLookup(url, headers, params, cacheable)
+    if lookup.hit is not None:
+        return lookup.hit
+
+    tracer = get_tracer()
+
+    def send() -> Response:
+        if tracer is None:
+            return request_func(url, params=params, headers=lookup.headers)
+        return tracer.timed_request(  # type: ignore
+            request_func, url, params=params, headers=lookup.headers
+        )
+
     try:
-        response = request_func(url, params=params, headers=headers)
+        response = get_scheduler(rate_limit_resource(url)).run(send)
     except requests.exceptions.ConnectionError as e:
-        raise click.ClickException(e)
+        raise click.ClickException(str(e)) from e
+    return lookup.finish(url, response)
 
-    if response.status_code == 401:
-        message = "Unauthorized Error 401: Bad Credentials"
-        raise click.ClickException(message)
 
-    elif response.status_code != 200:
-        message = f"Error encountered with status code: {response.status_code}"
-        raise click.ClickException(message)
+async def safe_request_async(
+    send: Callable[[furl, Mapping[str, str], Mapping[str, str]], Awaitable[Response]],
+    url: furl,
+    headers: Mapping[str, str],
+    params: Mapping[str, str],
+) -> Response:
+    """*safe_request* for a coroutine *send(url, params, headers)*, e.g. of the async backend.
 
-    return response
+    It goes through the same response cache, scheduler of the rate limit resource of *url*
+    and status checks; only identical requests in flight are not coalesced.
+    """
+    host = current_host()
+    if host is not None:
+        url = furl(host.resolve(str(url)))
+    lookup = _CacheLookup(url, headers, params, cacheable=True)
+    if lookup.hit is not None:
+        return lookup.hit
+    try:
+        response = await get_scheduler(rate_limit_resource(url)).run_async(
+            lambda: send(url, params, lookup.headers)
+        )
+    except requests.exceptions.ConnectionError as e:
+        raise click.ClickException(str(e)) from e
+    return lookup.finish(url, response)
 
 
 class SafeSession(Session):
@@ -47,3 +497,132 @@ class SafeSession(Session):
         self, url: furl, *, headers: Mapping[str, str], params: Mapping[str, str]
     ) -> Response:
         return safe_request(self.get, url, headers, params)
+
+
+def get_session() -> Any:
+    """Session shared by every thread for the current host, so that each host has one pool.
+
+    Its pool keeps alive as many connections as the schedulers of every rate limit resource
+    of the host let requests be in flight together, so that a run only connects (and does the
+    TLS handshake) that many times per host. Prefetched pages need no more: each request holds
+    a slot of its scheduler while it is in flight.
+    """
+    host = current_host()
+    name = host.name if host is not None else GITHUB_HOST
+    with _sessions_lock:
+        if name not in _sessions:
+            session = SafeSession()
+            pool_size = sum(
+                get_scheduler(resource).max_in_flight for resource in RATE_LIMIT_RESOURCES
+            )
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            if get_tracer() is not None:
+                instrument_session(session)
+            _sessions[name] = session
+        return _sessions[name]
+
+
+def connection_stats() -> Dict[str, Tuple[int, int]]:
+    """Number of requests sent and of connections opened by the session of each host."""
+    stats = {}
+    with _sessions_lock:
+        sessions = dict(_sessions)
+    for name, session in sessions.items():
+        sent = opened = 0
+        for adapter in set(session.adapters.values()):
+            if not isinstance(adapter, HTTPAdapter):
+                continue
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    sent += pool.num_requests
+                    opened += pool.num_connections
+        stats[name] = (sent, opened)
+    return stats
+
+
+def log_connection_stats() -> None:
+    for name, (sent, opened) in connection_stats().items():
+        logger.debug(f"{name}: {sent} requests over {opened} connections")
+
+
+def _page_items(
+    response: Response,
+    items_key: Optional[str],
+    project: Optional[Callable[[Any], Any]] = None,
+) -> List[Any]:
+    with span("decode", "json"):
+        body = loads(response.content)
+        items = body[items_key] if items_key else body
+        return [project(item) for item in items] if project else items
+
+
+def _last_page_number(response: Response) -> Optional[int]:
+    """Return the page number of the *Link: rel="last"* header, if present."""
+    last = response.links.get("last")
+    if not last:
+        return None
+    page = furl(last["url"]).args.get("page")
+    return int(page) if page else None
+
+
+def paginate(
+    url: furl,
+    headers: Mapping[str, str],
+    params: Mapping[str, str],
+    *,
+    items_key: Optional[str] = None,
+    project: Optional[Callable[[Any], Any]] = None,
+    prefetch: bool = True,
+) -> Iterator[Any]:
+    """Yield every item of a paginated Github API listing, in page order.
+
+    The first page tells us how many pages there are through its *Link* header; the
+    remaining pages are then fetched in parallel. If only a *rel="next"* link is given, or
+    without *prefetch*, pages are followed one after the other, each requested only once
+    the items of the previous one were consumed. Search endpoints wrap their results in an
+    object, so pass ``items_key="items"`` for those. *project*, e.g.
+    *decoding.project_issue*, is applied to every item as soon as its page is decoded.
+    """
+    params = {**params, "per_page": str(PER_PAGE)}
+    response = get_session().safe_get(url, headers=headers, params=params)
+    yield from _page_items(response, items_key, project)
+    yield from follow_pages(
+        response, url, headers, params, items_key=items_key, project=project, prefetch=prefetch
+    )
+
+
+def follow_pages(
+    response: Response,
+    url: furl,
+    headers: Mapping[str, str],
+    params: Mapping[str, str],
+    *,
+    items_key: Optional[str] = None,
+    project: Optional[Callable[[Any], Any]] = None,
+    prefetch: bool = True,
+) -> Iterator[Any]:
+    """Yield the items of the pages after *response*, the first page of a listing, as
+    *paginate* does."""
+    last_page = _last_page_number(response)
+    if last_page is not None and prefetch:
+        logger.debug(f"Fetching pages 2-{last_page} of {url}")
+
+        def get_page(page: int) -> List[Any]:
+            page_params = {**params, "page": str(page)}
+            page_response = get_session().safe_get(url, headers=headers, params=page_params)
+            return _page_items(page_response, items_key, project)
+
+        with ContextExecutor(max_workers=MAX_PAGE_WORKERS) as executor:
+            for items in executor.map(get_page, range(2, last_page + 1)):
+                yield from items
+        return
+
+    next_link = response.links.get("next")
+    while next_link:
+        response = get_session().safe_get(furl(next_link["url"]), headers=headers, params={})
+        yield from _page_items(response, items_key, project)
+        next_link = response.links.get("next")
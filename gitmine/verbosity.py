@@ -0,0 +1,13 @@
+import logging
+
+import click
+
+
+def set_verbosity(verbose: int) -> None:
+    """Sets the Log Level given a verbose number."""
+    if verbose == 1:
+        click.echo("Logging level set to INFO.")
+        logging.basicConfig(level=logging.INFO)
+    elif verbose >= 2:
+        click.echo("Logging level set to DEBUG.")
+        logging.basicConfig(level=logging.DEBUG)
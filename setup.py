@@ -18,8 +18,9 @@ setup(
     packages=find_packages(),
     entry_points={"console_scripts": ["gitmine = gitmine.gitmine:gitmine"]},
     install_requires=install_requires,
+    extras_require={"async": ["aiohttp"], "fast": ["orjson"]},
     include_package_data=True,
-    python_requires=">=3.6",
+    python_requires=">=3.7",
     version=__version__,
     license="MIT",
     url="https://github.com/joecummings/gitmine",
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta, timezone
+
+from fake_github import FakeGithub
+from furl import furl
+import pytest
+
+from gitmine import paths, search as search_module
+from gitmine.backends import async_backend, graphql_backend
+from gitmine.cache import set_response_cache
+from gitmine.commands import (
+    daemon as daemon_module,
+    get as get_module,
+    sync as sync_module,
+    triage as triage_module,
+    watch as watch_module,
+)
+from gitmine.hosts import GITHUB_HOST
+
+# Modules holding the endpoints *fake_github* points to the fake
+REQUESTING_MODULES = (
+    get_module,
+    sync_module,
+    triage_module,
+    search_module,
+    async_backend,
+    graphql_backend,
+)
+
+
+def make_issue(
+    repo_name,
+    number,
+    kind="issues",
+    *,
+    labels=(),
+    assignees=(),
+    days_old=None,
+    host=GITHUB_HOST,
+    **fields,
+):
+    """A listed Issue, or PR of *kind* "pull", with *fields* in place of its defaults.
+
+    Labels and assignees are given by name, and the creation by *days_old* to be relative to now.
+    """
+    created_at = "2021-01-01T00:00:00Z"
+    if days_old is not None:
+        created = datetime.now(timezone.utc) - timedelta(days=days_old)
+        created_at = created.strftime("%Y-%m-%dT%H:%M:%SZ")
+    issue = {
+        "title": f"Element {number}",
+        "number": number,
+        "labels": [{"name": label} for label in labels],
+        "assignees": [{"login": login} for login in assignees],
+        "html_url": f"https://{host}/{repo_name}/{kind}/{number}",
+        "created_at": created_at,
+        "updated_at": "2021-01-02T00:00:00Z",
+        "state": "open",
+        "repository": {"full_name": repo_name},
+    }
+    if kind == "pull":
+        issue["pull_request"] = {"url": f"https://api.{host}/repos/{repo_name}/pulls/{number}"}
+    issue.update(fields)
+    return issue
+
+
+@pytest.fixture
+def fake_github(request, monkeypatch):
+    """A FakeGithub that every endpoint of gitmine points to.
+
+    Parametrize it indirectly with keyword arguments of FakeGithub, e.g. a *rate_limit*.
+    """
+    with FakeGithub(**getattr(request, "param", {})) as fake:
+        for module in REQUESTING_MODULES:
+            for name, endpoint in list(vars(module).items()):
+                if name.endswith("_ENDPOINT") and isinstance(endpoint, furl):
+                    monkeypatch.setattr(module, name, furl(fake.url, path=str(endpoint.path)))
+        yield fake
+
+
+@pytest.fixture(autouse=True)
+def response_cache_dir(monkeypatch, tmp_path):
+    """Keep the response cache of commands under test out of the user's config directory."""
+    cache_dir = tmp_path / "cache"
+    for module in (paths, daemon_module, get_module, triage_module, watch_module):
+        monkeypatch.setattr(module, "GHP_CACHE_DIR", cache_dir)
+    yield cache_dir
+    set_response_cache(None)
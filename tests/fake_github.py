@@ -0,0 +1,243 @@
+"""Local stand-in for the parts of the Github API that gitmine talks to."""
+
+from datetime import datetime
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+DEFAULT_PER_PAGE = 30
+
+
+class FakeGithub:
+    """Serves paginated listings registered with *add_listing* from a background thread.
+
+    *latency* delays every response, *max_per_page* caps the page size clients may ask for,
+    and *rate_limit* (requests per *rate_limit_window* seconds) emulates Github's rate limit
+    headers and 403s once the budget is spent.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        max_per_page: int = 100,
+        rate_limit: Optional[int] = None,
+        rate_limit_window: float = 60.0,
+    ) -> None:
+        self.latency = latency
+        self.max_per_page = max_per_page
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self._rate_limit_used = 0
+        self._rate_limit_reset = 0.0
+        self._lock = threading.Lock()
+        self.listings: Dict[str, List[Any]] = {}
+        # path -> single object, e.g. a repo
+        self.objects: Dict[str, Any] = {}
+        self.search_paths: set = set()
+        # Most results served for a search query, however many match it
+        self.search_cap = 1000
+        self.link_last: bool = True
+        self.requests: List[str] = []
+        self.statuses: List[int] = []
+        # path -> extra seconds its responses are delayed, on top of *latency*
+        self.delays: Dict[str, float] = {}
+        # path -> (status, headers) answered before serving the listing, in order
+        self.failures: Dict[str, List[Tuple[int, Dict[str, str]]]] = {}
+        # GraphQL stand-in data: search query -> nodes, repo name -> issue nodes
+        self.graphql_search: Dict[str, List[Any]] = {}
+        self.graphql_repo_issues: Dict[str, List[Any]] = {}
+        self.graphql_collaborator_repos: List[str] = []
+        self.graphql_documents: List[str] = []
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add_listing(self, path: str, items: List[Any], *, search: bool = False) -> None:
+        self.listings[path] = items
+        if search:
+            self.search_paths.add(path)
+
+    def rate_limit_headers(self) -> Tuple[bool, Dict[str, str]]:
+        """Spend one request of the budget; return whether it was allowed and the headers."""
+        if self.rate_limit is None:
+            return True, {}
+        with self._lock:
+            now = time.time()
+            if now >= self._rate_limit_reset:
+                self._rate_limit_used = 0
+                self._rate_limit_reset = now + self.rate_limit_window
+            allowed = self._rate_limit_used < self.rate_limit
+            if allowed:
+                self._rate_limit_used += 1
+            headers = {
+                "X-RateLimit-Limit": str(self.rate_limit),
+                "X-RateLimit-Remaining": str(self.rate_limit - self._rate_limit_used),
+                "X-RateLimit-Reset": str(int(self._rate_limit_reset) + 1),
+            }
+        return allowed, headers
+
+    def __enter__(self) -> "FakeGithub":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(self))
+        threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        ).start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        assert self._server is not None
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _make_handler(fake: FakeGithub) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like api.github.com
+
+        def log_message(self, *args: Any) -> None:  # keep pytest output quiet
+            pass
+
+        def do_GET(self) -> None:
+            fake.requests.append(self.path)
+            parts = urlsplit(self.path)
+            delay = fake.latency + fake.delays.get(parts.path, 0.0)
+            if delay:
+                time.sleep(delay)
+            query = dict(parse_qsl(parts.query))
+            allowed, rate_limit_headers = fake.rate_limit_headers()
+            if not allowed:
+                self._send(403, {"message": "API rate limit exceeded"}, rate_limit_headers)
+                return
+            if fake.failures.get(parts.path):
+                status, headers = fake.failures[parts.path].pop(0)
+                self._send(status, {"message": "Injected failure"}, headers)
+                return
+            if parts.path in fake.objects:
+                self._send(200, fake.objects[parts.path], rate_limit_headers)
+                return
+            if parts.path not in fake.listings:
+                self._send(404, {"message": "Not Found"})
+                return
+
+            items = fake.listings[parts.path]
+            total_count = len(items)
+            if parts.path in fake.search_paths:
+                items = _search(items, query.get("q", ""))
+                total_count = len(items)
+                items = items[: fake.search_cap]
+            page = int(query.get("page", 1))
+            per_page = min(int(query.get("per_page", DEFAULT_PER_PAGE)), fake.max_per_page)
+            last_page = max(1, -(-len(items) // per_page))
+            chunk = items[(page - 1) * per_page : page * per_page]
+
+            links = []
+            if page < last_page:
+                links.append(self._link(parts.path, query, page + 1, "next"))
+                if fake.link_last:
+                    links.append(self._link(parts.path, query, last_page, "last"))
+
+            body: Any = chunk
+            if parts.path in fake.search_paths:
+                body = {"total_count": total_count, "incomplete_results": False, "items": chunk}
+            headers = dict(rate_limit_headers)
+            if links:
+                headers["Link"] = ", ".join(links)
+            etag = '"' + hashlib.sha1(json.dumps(body).encode()).hexdigest() + '"'
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, None, headers)
+                return
+            self._send(200, body, headers)
+
+        def do_POST(self) -> None:
+            fake.requests.append(self.path)
+            if self.path != "/graphql":
+                self._send(404, {"message": "Not Found"})
+                return
+            length = int(self.headers.get("Content-Length", 0))
+            document = json.loads(self.rfile.read(length))["query"]
+            fake.graphql_documents.append(document)
+            self._send(200, _run_graphql(fake, document))
+
+        def _link(self, path: str, query: Dict[str, str], page: int, rel: str) -> str:
+            args = urlencode({**query, "page": page})
+            return f'<{fake.url}{path}?{args}>; rel="{rel}"'
+
+        def _send(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+            fake.statuses.append(status)
+            payload = json.dumps(body).encode() if status != 304 else b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            if status != 304:
+                self.send_header("Content-Length", str(len(payload)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
+
+
+_ALIAS_RE = re.compile(r"^  (\w+): (search|repository|viewer)\b(.*)$", re.MULTILINE)
+
+
+def _search(items: List[Any], query: str) -> List[Any]:
+    """The items of a search listing matching the *created:start..end* qualifier of *query*."""
+    match = re.search(r"created:(\S+)\.\.(\S+)", query)
+    if not match:
+        return items
+    start, end = (datetime.fromisoformat(bound.replace("Z", "+00:00")) for bound in match.groups())
+    return [
+        item
+        for item in items
+        if start <= datetime.fromisoformat(item["created_at"].replace("Z", "+00:00")) <= end
+    ]
+
+
+def _run_graphql(fake: FakeGithub, document: str) -> Dict[str, Any]:
+    """Answer the top-level aliases of a gitmine GraphQL document from the stand-in data."""
+    data: Dict[str, Any] = {}
+    errors = []
+    for alias, field, rest in _ALIAS_RE.findall(document):
+        first = int(re.search(r"first: (\d+)", rest).group(1))  # type: ignore
+        after = re.search(r'after: "(\d+)"', rest)
+        offset = int(after.group(1)) if after else 0
+
+        if field == "search":
+            query = json.loads(re.search(r'query: ("(?:[^"\\]|\\.)*")', rest).group(1))  # type: ignore
+            items = fake.graphql_search.get(query, [])
+        elif field == "viewer":
+            items = [{"nameWithOwner": name} for name in fake.graphql_collaborator_repos]
+        else:
+            owner, name = re.search(r'owner: "(.+?)", name: "(.+?)"', rest).groups()  # type: ignore
+            if f"{owner}/{name}" not in fake.graphql_repo_issues:
+                data[alias] = None
+                errors.append({"message": f"Could not resolve to a Repository {owner}/{name}"})
+                continue
+            items = fake.graphql_repo_issues[f"{owner}/{name}"]
+
+        end = offset + first
+        connection = {
+            "pageInfo": {"hasNextPage": end < len(items), "endCursor": str(end)},
+            "nodes": items[offset:end],
+        }
+        if field == "repository":
+            data[alias] = {"issues": connection}
+        elif field == "viewer":
+            data[alias] = {"repositories": connection}
+        else:
+            data[alias] = connection
+
+    body: Dict[str, Any] = {"data": data}
+    if errors:
+        body["errors"] = errors
+    return body
@@ -0,0 +1,55 @@
+from conftest import make_issue
+import pytest
+
+from gitmine.backends import async_backend
+from gitmine.tracing import Tracer, set_tracer
+from gitmine.utils import RequestScheduler, get_scheduler, set_scheduler
+
+pytest.importorskip("aiohttp")
+
+
+def test_sweeps_every_repo(fake_github):
+    fake_github.add_listing("/repos/a/one/issues", [make_issue("a/one", i) for i in range(150)])
+    fake_github.add_listing("/repos/a/two/issues", [make_issue("a/two", 1)])
+    fake_github.add_listing("/repos/a/empty/issues", [])
+
+    repos = async_backend.get_issues_by_repos(
+        ["a/one", "a/two", "a/empty"], {"assignee": "none"}, {}, color=False, concurrency=2
+    )
+
+    assert sorted(repos) == ["a/one", "a/two"]
+    assert [issue.number for issue in repos["a/one"].issues] == list(range(150))
+    assert repos.total_num_of_issues() == 151
+
+
+def test_bad_status_raises(fake_github):
+    with pytest.raises(Exception, match="status code: 404"):
+        async_backend.get_issues_by_repos(["a/missing"], {}, {}, color=False, concurrency=1)
+
+
+@pytest.fixture
+def scheduler():
+    previous = get_scheduler()
+    scheduler = RequestScheduler(2, max_retries=2, backoff_base=0.01)
+    set_scheduler(scheduler)
+    yield scheduler
+    set_scheduler(previous)
+
+
+def test_transient_errors_are_retried_and_traced(fake_github, scheduler):
+    fake_github.add_listing("/repos/a/one/issues", [make_issue("a/one", 1)])
+    fake_github.failures["/repos/a/one/issues"] = [(502, {})]
+    tracer = Tracer()
+    set_tracer(tracer)
+    try:
+        repos = async_backend.get_issues_by_repos(["a/one"], {}, {}, color=False, concurrency=1)
+    finally:
+        set_tracer(None)
+
+    assert repos.total_num_of_issues() == 1
+    assert fake_github.statuses == [502, 200]
+    assert tracer.counters["retries"] == 1
+    assert [event["args"]["status"] for event in tracer.events if event["cat"] == "request"] == [
+        502,
+        200,
+    ]
@@ -0,0 +1,65 @@
+from furl import furl
+import pytest
+
+from gitmine.cache import ResponseCache, set_response_cache
+from gitmine.utils import SafeSession, safe_request
+
+HEADERS = {"Authorization": "Bearer abc"}
+
+
+@pytest.fixture(autouse=True)
+def issues(fake_github):
+    fake_github.add_listing("/issues", [{"number": 1}, {"number": 2}])
+
+
+@pytest.fixture
+def response_cache(tmp_path):
+    cache = ResponseCache(tmp_path / "cache")
+    set_response_cache(cache)
+    yield cache
+    set_response_cache(None)
+
+
+def get_issues(fake, headers=HEADERS):
+    return safe_request(SafeSession().get, furl(fake.url, path="/issues"), headers, {})
+
+
+def test_revalidates_with_etag(fake_github, response_cache):
+    assert get_issues(fake_github).json() == [{"number": 1}, {"number": 2}]
+    assert get_issues(fake_github).json() == [{"number": 1}, {"number": 2}]
+    assert fake_github.statuses == [200, 304]
+
+
+def test_fresh_entry_skips_request(fake_github, response_cache):
+    response_cache.max_age = 60
+    get_issues(fake_github)
+    assert get_issues(fake_github).json() == [{"number": 1}, {"number": 2}]
+    assert len(fake_github.requests) == 1
+
+
+def test_entries_are_keyed_by_token(fake_github, response_cache):
+    get_issues(fake_github)
+    get_issues(fake_github, headers={"Authorization": "Bearer xyz"})
+    assert fake_github.statuses == [200, 200]
+
+
+def test_evicts_least_recently_used(fake_github, tmp_path):
+    cache = ResponseCache(tmp_path / "cache", max_size=60)
+    set_response_cache(cache)
+    try:
+        for path in ("/a", "/b", "/c"):
+            fake_github.add_listing(path, [{"title": "x" * 20}])
+            safe_request(SafeSession().get, furl(fake_github.url, path=path), HEADERS, {})
+    finally:
+        set_response_cache(None)
+    assert len(list((tmp_path / "cache").glob("*.body"))) < 3
+
+
+def test_overwritten_entries_are_counted_once(fake_github, response_cache):
+    response = get_issues(fake_github)
+    key = response_cache.key(furl(fake_github.url, path="/issues"), {}, HEADERS)
+    for _ in range(3):
+        response_cache.put(key, response)
+    assert response_cache._size == sum(
+        path.stat().st_size for path in response_cache.directory.glob("*.body")
+    )
@@ -0,0 +1,103 @@
+import stat
+import threading
+import time
+
+from click.testing import CliRunner
+from conftest import make_issue
+import pytest
+
+from gitmine import paths
+from gitmine.commands import go as go_module
+from gitmine.commands.daemon import READY_TIMEOUT, GitmineDaemon
+from gitmine.gitmine import gitmine
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def daemon(fake_github, monkeypatch, tmp_path):
+    socket_path = tmp_path / "daemon.sock"
+    monkeypatch.setattr(paths, "GHP_DAEMON_SOCKET", socket_path)
+    fake_github.add_listing("/issues", [make_issue("a/one", 1)])
+    fake_github.add_listing("/search/issues", [make_issue("a/two", 2, "pull")], search=True)
+    daemon = GitmineDaemon(
+        socket_path,
+        tmp_path / "index.sqlite3",
+        "me",
+        {},
+        unassigned=False,
+        interval=60,
+        concurrency=2,
+    )
+    thread = threading.Thread(target=daemon.serve_forever)
+    thread.start()
+    assert daemon.ready.wait(5)
+    yield daemon
+    daemon.shutdown()
+    thread.join()
+    assert not socket_path.exists()
+
+
+def test_get_is_answered_by_the_daemon(daemon, fake_github):
+    direct = runner.invoke(gitmine, ["get", "all", "--no-color", "--no-daemon"])
+    assert direct.exit_code == 0 and "#1" in direct.output and "#2" in direct.output
+    requests_made = len(fake_github.requests)
+
+    result = runner.invoke(gitmine, ["get", "all", "--no-color"])
+
+    assert result.exit_code == 0, result.output
+    assert result.output == direct.output
+    assert len(fake_github.requests) == requests_made
+    assert stat.S_IMODE(daemon.socket_path.stat().st_mode) == 0o600
+
+
+def test_get_falls_back_when_the_daemon_cannot_answer(daemon, fake_github):
+    fake_github.add_listing("/user/repos", [{"full_name": "a/one"}])
+    fake_github.add_listing("/repos/a/one/issues", [make_issue("a/one", 3)])
+
+    result = runner.invoke(gitmine, ["get", "issues", "-u", "--no-color"])
+
+    assert result.exit_code == 0, result.output
+    assert "#3" in result.output
+    assert any(path.startswith("/repos/a/one/issues") for path in fake_github.requests)
+
+
+def test_go_asks_the_daemon_to_refresh_a_stale_index(daemon, fake_github, monkeypatch, tmp_path):
+    monkeypatch.setattr(go_module, "GHP_DAEMON_SOCKET", daemon.socket_path)
+    monkeypatch.setattr(go_module, "GHP_SYNC_PIDFILE", tmp_path / "sync.pid")
+    monkeypatch.setattr(go_module.subprocess, "Popen", None)  # never spawns a sync
+    synced_at = daemon.synced_at
+
+    go_module.sync_in_background(unassigned=False)
+
+    deadline = time.time() + 5
+    while daemon.synced_at == synced_at and time.time() < deadline:
+        time.sleep(0.01)
+    assert daemon.synced_at > synced_at
+
+
+def test_daemon_replies_at_once_when_the_first_sync_failed(fake_github, tmp_path):
+    daemon = GitmineDaemon(
+        tmp_path / "daemon.sock",
+        tmp_path / "index.sqlite3",
+        "me",
+        {},
+        unassigned=False,
+        interval=60,
+        concurrency=2,
+    )
+    thread = threading.Thread(target=daemon.refresh_forever)
+    thread.start()
+    try:
+        assert daemon.refreshed.wait(5)
+        start = time.monotonic()
+        reply = daemon.answer(
+            {"spec": "all", "unassigned": False, "repo_name": "", "asc": False, "color": False}
+        )
+    finally:
+        daemon.stopped.set()
+        daemon.wake.set()
+        thread.join()
+
+    assert reply["error"].startswith("the first sync failed: ")
+    assert time.monotonic() - start < READY_TIMEOUT
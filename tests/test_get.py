@@ -1,13 +1,19 @@
 import json
 from typing import Dict
+from urllib.parse import parse_qs, urlsplit
 
 import click
-import pytest
 from click.testing import CliRunner
+from conftest import make_issue
+import pytest
+from tabulate import tabulate
 from test_constants import TEST_ISSUES_PATH, TEST_PRS_PATH
 
-from gitmine.commands.get import echo_info
+from gitmine.commands import get as get_module
+from gitmine.commands.get import echo_info, format_info, plain_table, stream_table
+from gitmine.decoding import project_issue
 from gitmine.gitmine import gitmine  # gitmine?
+from gitmine.models.github_elements import GithubElement, RepoDict, Repository
 
 runner = CliRunner()
 
@@ -77,9 +83,272 @@ def test_get_issues_option_desc_nocolorr():
     pass
 
 
-def test_get_all():
-    pass
+def test_get_all(fake_github):
+    fake_github.add_listing("/issues", [make_issue("a/one", 1)])
+    fake_github.add_listing("/search/issues", [make_issue("a/two", 2, "pull")], search=True)
+
+    result = base_runner(["all", "--no-cache", "--no-color"])
+
+    assert result.exit_code == 0, result.output
+    issues, prs = result.output.split("* " * 20)
+    assert "a/one" in issues and "#1" in issues
+    assert "a/two" in prs and "#2" in prs
 
 
 def test_get_bad_credentials():
     pass
+
+
+def test_get_unassigned_issues_streams(fake_github):
+    fake_github.add_listing("/user/repos", [{"full_name": "a/one"}, {"full_name": "a/two"}])
+    fake_github.add_listing("/repos/a/one/issues", [make_issue("a/one", 1)])
+    fake_github.add_listing("/repos/a/two/issues", [])
+
+    result = base_runner(["issues", "-u", "--no-cache", "--no-color"])
+
+    assert result.exit_code == 0, result.output
+    assert "a/one" in result.output and "#1" in result.output
+    assert "a/two" not in result.output
+
+
+def test_get_unassigned_issues_keeps_the_order_of_repos(fake_github):
+    names = [f"a/repo{i}" for i in range(4)]
+    fake_github.add_listing("/user/repos", [{"full_name": name} for name in names])
+    for number, name in enumerate(names):
+        fake_github.add_listing(f"/repos/{name}/issues", [make_issue(name, number)])
+    # the first repo is fetched last
+    fake_github.delays["/repos/a/repo0/issues"] = 0.2
+
+    result = base_runner(["issues", "-u", "--no-cache", "--no-color"])
+
+    assert result.exit_code == 0, result.output
+    positions = [result.output.index(name) for name in names]
+    assert positions == sorted(positions)
+
+
+def test_get_unassigned_issues_of_one_repo(fake_github):
+    pr = make_issue("a/one", 2, "pull")
+    fake_github.add_listing("/repos/a/one/issues", [make_issue("a/one", 1), pr])
+
+    result = base_runner(["issues", "-u", "-r", "a/one", "--no-cache", "--no-color"])
+
+    assert result.exit_code == 0, result.output
+    assert "#1" in result.output and "#2" not in result.output
+    # listed directly, without listing every collaborator repo nor looking it up
+    assert [urlsplit(path).path for path in fake_github.requests] == ["/repos/a/one/issues"]
+
+
+def test_get_filters_are_sent_to_github(fake_github):
+    fake_github.add_listing("/repos/a/one/milestones", [{"title": "v1", "number": 7}])
+    fake_github.add_listing("/repos/a/one/issues", [make_issue("a/one", 1)])
+    fake_github.add_listing("/search/issues", [], search=True)
+
+    result = base_runner(
+        ["all", "-r", "a/one", "-l", "bug", "-l", "ui", "--milestone", "v1"]
+        + ["--since", "2021-06-01", "--no-cache", "--no-color"]
+    )
+
+    assert result.exit_code == 0, result.output
+    (issues_request,) = [
+        path for path in fake_github.requests if path.startswith("/repos/a/one/issues")
+    ]
+    issues_query = parse_qs(urlsplit(issues_request).query)
+    assert issues_query["labels"] == ["bug,ui"]
+    assert issues_query["milestone"] == ["7"]
+    assert issues_query["since"] == ["2021-06-01T00:00:00Z"]
+    (prs_request,) = [path for path in fake_github.requests if path.startswith("/search")]
+    (query,) = parse_qs(urlsplit(prs_request).query)["q"]
+    assert query.endswith('label:"bug" label:"ui" milestone:"v1" updated:>=2021-06-01T00:00:00Z')
+
+
+def make_repo(name, issues):
+    repo = Repository(name)
+    for number, title in issues:
+        issue = make_issue(name, number, title=title)
+        repo.add_issue(GithubElement.from_dict(issue, elem_type="Issue"))
+    return repo
+
+
+def test_stream_table_within_the_lookahead_is_the_full_table():
+    repos = [make_repo("a/one", [(5, "short")]), make_repo("a/two", [(23, "a longer title")])]
+    assert (
+        "".join(stream_table(repos, "issues"))
+        == format_info({repo.name: repo for repo in repos}, "issues") + "\n"
+    )
+
+
+def test_stream_table_past_the_lookahead_keeps_columns_aligned(monkeypatch):
+    monkeypatch.setattr(get_module, "STREAM_LOOKAHEAD", 1)
+    repos = [
+        make_repo("a/one", [(5, "T5")]),
+        make_repo("a/two", [(23, "T23"), (1234, "x" * 80)]),
+    ]
+
+    blocks = [click.unstyle(block) for block in stream_table(repos, "issues")]
+
+    assert len(blocks) == 2
+    rows = [line for block in blocks for line in block.splitlines() if "days ago" in line]
+    assert len({line.index("days ago") for line in rows}) == 1
+    assert len({line.index("T") for line in rows[:2]}) == 1
+    assert "x" * 80 not in blocks[1] and "…" in blocks[1]
+
+
+def test_stream_table_empty():
+    assert list(stream_table([], "issues")) == ["No issues found! Keep up the good work.\n"]
+
+
+def test_get_all_as_json(fake_github):
+    issue = make_issue("a/one", 1)
+    issue["labels"] = [{"name": "bug"}]
+    fake_github.add_listing("/issues", [issue])
+    fake_github.add_listing("/search/issues", [make_issue("a/two", 2, "pull")], search=True)
+
+    result = base_runner(["all", "--no-cache", "--format", "json"])
+
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output) == [
+        {
+            "repo": "a/one",
+            "type": "Issue",
+            "number": 1,
+            "title": "Element 1",
+            "url": "https://github.com/a/one/issues/1",
+            "labels": ["bug"],
+            "created_at": "2021-01-01T00:00:00Z",
+        },
+        {
+            "repo": "a/two",
+            "type": "PullRequest",
+            "number": 2,
+            "title": "Element 2",
+            "url": "https://github.com/a/two/pull/2",
+            "labels": [],
+            "created_at": "2021-01-01T00:00:00Z",
+        },
+    ]
+
+
+def test_get_unassigned_issues_as_jsonl_and_csv(fake_github):
+    fake_github.add_listing("/user/repos", [{"full_name": "a/one"}, {"full_name": "a/two"}])
+    fake_github.add_listing("/repos/a/one/issues", [make_issue("a/one", 1)])
+    fake_github.add_listing("/repos/a/two/issues", [make_issue("a/two", 2)])
+
+    result = base_runner(["issues", "-u", "--no-cache", "--format", "jsonl"])
+
+    assert result.exit_code == 0, result.output
+    # the progress message goes to stderr, which CliRunner mixes into the output
+    lines = [line for line in result.output.splitlines() if line.startswith("{")]
+    assert sorted(json.loads(line)["number"] for line in lines) == [1, 2]
+    assert "\x1b[" not in result.output
+
+    result = base_runner(["issues", "-u", "--no-cache", "--format", "csv"])
+
+    assert result.exit_code == 0, result.output
+    assert "repo,type,number,title,url,labels,created_at" in result.output
+    assert "a/one,Issue,1,Element 1,https://github.com/a/one/issues/1,,2021-01-01T00:00:00Z" in (
+        result.output
+    )
+
+
+def test_get_limit_merges_repos_and_stops_fetching(fake_github):
+    def issue(repo_name, number, minute):
+        return make_issue(repo_name, number, created_at=f"2021-01-01T10:{minute:02}:00Z")
+
+    fake_github.add_listing("/user/repos", [{"full_name": "a/one"}, {"full_name": "a/two"}])
+    # newest first, as listed with direction=desc; a/one spans two pages
+    fake_github.add_listing(
+        "/repos/a/one/issues", [issue("a/one", n, 50 - n // 10) for n in range(1, 151)]
+    )
+    fake_github.add_listing("/repos/a/two/issues", [issue("a/two", n, 55 - n) for n in (1, 2)])
+
+    result = base_runner(["issues", "-u", "--no-cache", "--format", "jsonl", "--limit", "3"])
+
+    assert result.exit_code == 0, result.output
+    lines = [json.loads(line) for line in result.output.splitlines() if line.startswith("{")]
+    assert [(line["repo"], line["number"]) for line in lines] == [
+        ("a/two", 1),
+        ("a/two", 2),
+        ("a/one", 1),
+    ]
+    assert not any("page=2" in path for path in fake_github.requests)
+
+
+def test_get_explain_prints_the_plan_without_requests(fake_github):
+    result = base_runner(["issues", "-u", "--no-cache", "--explain"])
+
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert lines[0] == "issues:"
+    assert "/user/repos?affiliation=collaborator&per_page=100" in lines[1]
+    assert "/repos/{repo}/issues?direction=desc&assignee=none" in lines[2]
+    assert lines[2].endswith("for each collaborator repo")
+    assert fake_github.requests == []
+
+
+@pytest.mark.parametrize(
+    "options", [["issues"], ["issues", "--milestone", "v1"], ["prs"], ["prs", "--limit", "5"]]
+)
+def test_get_explain_prints_the_requests_get_sends(fake_github, options):
+    fake_github.add_listing("/issues", [make_issue("a/one", 1)])
+    found = make_issue("a/two", 2, "pull", repository_url=f"{fake_github.url}/repos/a/two")
+    fake_github.add_listing("/search/issues", [found], search=True)
+
+    explained = base_runner([*options, "--no-cache", "--explain"])
+    assert explained.exit_code == 0, explained.output
+    (planned,) = [line.split()[1] for line in explained.output.splitlines()[1:]]
+    result = base_runner([*options, "--no-cache"])
+
+    assert result.exit_code == 0, result.output
+    (sent,) = fake_github.requests
+    assert urlsplit(planned).path == urlsplit(sent).path
+    assert parse_qs(urlsplit(planned).query) == parse_qs(urlsplit(sent).query)
+
+
+def test_get_empty_json(fake_github):
+    fake_github.add_listing("/search/issues", [], search=True)
+
+    result = base_runner(["prs", "--no-cache", "--format", "json"])
+
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output) == []
+
+
+def test_project_issue_keeps_only_what_gitmine_reads():
+    issue = make_issue("a/one", 1)
+    issue.update(
+        labels=[{"name": "bug", "color": "d73a4a"}],
+        assignees=[{"login": "me", "avatar_url": "https://avatars.githubusercontent.com/me"}],
+        user={"login": "reporter"},
+        body="A long description",
+    )
+
+    assert project_issue(issue) == {
+        "title": "Element 1",
+        "number": 1,
+        "html_url": "https://github.com/a/one/issues/1",
+        "created_at": "2021-01-01T00:00:00Z",
+        "updated_at": "2021-01-02T00:00:00Z",
+        "state": "open",
+        "labels": [{"name": "bug"}],
+        "assignees": [{"login": "me"}],
+        "repository": {"full_name": "a/one"},
+    }
+
+
+@pytest.mark.parametrize(
+    "titles",
+    [
+        ["Fix the bug", " padded ", "123", ""],
+        ["日本語のタイトル", "emoji 🎉 title", "Ünïcödé"],
+        ["a title\nover two lines", "a\ttab"],
+    ],
+)
+def test_plain_table_matches_tabulate(titles):
+    repos = RepoDict()
+    for number, title in enumerate(titles):
+        issue = make_issue(f"a/repo{number % 2}", number)
+        issue.update(title=title, labels=[{"name": "bug"}] * (number % 2))
+        repos[f"a/repo{number % 2}"].add_issue(GithubElement.from_dict(issue, elem_type="Issue"))
+    rows = [row for repo in repos.values() for row in repo.format_for_table("issues", 0)]
+
+    assert plain_table(rows) == tabulate(rows, tablefmt="plain")
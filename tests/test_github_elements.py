@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from gitmine.models.github_elements import GithubElement, parse_timestamp
+
+ISSUE = {
+    "title": "Update CMake file",
+    "number": 2,
+    "labels": [{"id": 1, "name": "bug", "color": "f00", "url": "https://api.github.com/x"}],
+    "html_url": "https://github.com/a/E3D/issues/2",
+    "created_at": "2020-07-27T20:15:42Z",
+}
+
+
+def test_parse_timestamp_matches_strptime():
+    parsed = datetime.strptime(ISSUE["created_at"], "%Y-%m-%dT%H:%M:%SZ")
+    element = GithubElement.from_dict(ISSUE, elem_type="Issue")
+    assert element.created_at == parsed
+    assert parse_timestamp(ISSUE["created_at"]) == 1595880942
+
+
+def test_element_is_compact():
+    element = GithubElement.from_dict(ISSUE, elem_type="Issue")
+    assert not hasattr(element, "__dict__")
+    assert element.label_names == ("bug",)
+    assert element.labels == [{"name": "bug"}]
+
+
+def test_label_names_are_interned():
+    first = GithubElement.from_dict(ISSUE, elem_type="Issue")
+    other = dict(ISSUE, labels=[{"name": "".join(["b", "u", "g"])}])
+    second = GithubElement.from_dict(other, elem_type="Issue")
+    assert first.label_names[0] is second.label_names[0]
+
+
+def test_constructor_accepts_datetime():
+    created_at = datetime(2020, 7, 27, 20, 15, 42)
+    element = GithubElement("Issue", "title", 1, "url", created_at, False)
+    assert element.created_ts == 1595880942
+    assert element.created_at == created_at
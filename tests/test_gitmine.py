@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 from click.testing import CliRunner
 
 from gitmine.commands.config import get_or_create_github_config
@@ -5,6 +8,7 @@ from gitmine.gitmine import config, get, gitmine, go
 
 runner = CliRunner()
 
+
 def test_gitmine_without_command():
     result = runner.invoke(gitmine, [])
     assert result.exit_code == 0
@@ -29,3 +33,20 @@ def test_get_version():
 
     result = runner.invoke(gitmine, ["--version"])
     assert result.output == f"gitmine, version {__version__}\n"
+
+
+def test_startup_does_not_import_network_stack():
+    # Commands that never talk to Github should not pay for importing requests and friends
+    code = (
+        "import sys\n"
+        "from gitmine.gitmine import gitmine\n"
+        "try:\n"
+        "    gitmine(['go', '--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(' '.join(m for m in ('requests', 'furl', 'tabulate', 'yaml') if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], stdout=subprocess.PIPE, universal_newlines=True, check=True
+    )
+    assert result.stdout.splitlines()[-1] == ""
@@ -0,0 +1,97 @@
+import os
+from types import SimpleNamespace
+
+from click.testing import CliRunner
+from conftest import make_issue
+import pytest
+
+from gitmine.commands import go as go_module
+from gitmine.gitmine import gitmine
+from gitmine.index import ASSIGNED, REVIEW_REQUESTED, IssueIndex
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def opened(monkeypatch, tmp_path):
+    monkeypatch.setattr(go_module, "GHP_INDEX_PATH", tmp_path / "index.sqlite3")
+    syncs = []
+    monkeypatch.setattr(go_module, "sync_in_background", lambda **kwargs: syncs.append(kwargs))
+    urls = []
+    monkeypatch.setattr(go_module.click, "launch", urls.append)
+    yield urls, syncs
+
+
+def index_issues(path, issues):
+    index = IssueIndex(path)
+    index.apply(ASSIGNED, issues, scope=ASSIGNED)
+    index.apply(REVIEW_REQUESTED, [], scope=REVIEW_REQUESTED)
+    index.close()
+
+
+def test_go_opens_a_repo_and_number_directly(opened):
+    urls, syncs = opened
+    result = runner.invoke(gitmine, ["go", "a/one", "12"])
+    assert result.exit_code == 0, result.output
+    assert urls == ["https://github.com/a/one/issues/12"]
+    assert syncs == []
+
+
+def test_go_opens_the_best_match_of_a_misspelled_query(opened):
+    urls, syncs = opened
+    index_issues(
+        go_module.GHP_INDEX_PATH,
+        [
+            ("a/one", make_issue("a/one", 1, title="Login fails on Safari")),
+            ("a/two", make_issue("a/two", 2, title="Crash when uploading large files")),
+        ],
+    )
+
+    result = runner.invoke(gitmine, ["go", "loign", "safari"])
+
+    assert result.exit_code == 0, result.output
+    assert urls == ["https://github.com/a/one/issues/1"]
+    assert syncs == []  # just synced
+
+    result = runner.invoke(gitmine, ["go", "two", "uplod", "--list"])
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines()[0].split() == ["1", "a/two", "#2", "Crash"] + (
+        "when uploading large files".split()
+    )
+
+
+def test_go_syncs_a_stale_index_in_the_background(opened):
+    urls, syncs = opened
+    index_issues(go_module.GHP_INDEX_PATH, [("a/one", make_issue("a/one", 1, title="Login fails"))])
+
+    result = runner.invoke(gitmine, ["go", "login", "--max-staleness", "0"])
+    assert urls == ["https://github.com/a/one/issues/1"]
+    assert syncs == [{"unassigned": False}]
+
+    result = runner.invoke(gitmine, ["go", "nothing", "like", "it"])
+    assert result.exit_code == 1
+    assert "Nothing in the local index matches" in result.output
+
+
+def test_background_syncs_do_not_pile_up(monkeypatch, tmp_path):
+    pidfile = tmp_path / "sync.pid"
+    monkeypatch.setattr(go_module, "GHP_SYNC_PIDFILE", pidfile)
+    monkeypatch.setattr(go_module, "GHP_DAEMON_SOCKET", tmp_path / "daemon.sock")
+    started = []
+
+    def popen(command, **kwargs):
+        started.append(command)
+        # a process that is still running
+        return SimpleNamespace(pid=os.getpid())
+
+    monkeypatch.setattr(go_module.subprocess, "Popen", popen)
+
+    go_module.sync_in_background(unassigned=False)
+    go_module.sync_in_background(unassigned=False)
+    assert len(started) == 1
+    assert pidfile.read_text() == str(os.getpid())
+
+    # the previous sync exited
+    pidfile.write_text(str(2**31 - 1))
+    go_module.sync_in_background(unassigned=True)
+    assert len(started) == 2 and started[1][-1] == "-u"
@@ -0,0 +1,78 @@
+import click
+import pytest
+
+from gitmine.backends import graphql_backend
+
+
+def make_node(repo_name, number, labels=()):
+    return {
+        "title": f"Element {number}",
+        "number": number,
+        "url": f"https://github.com/{repo_name}/issues/{number}",
+        "createdAt": "2021-01-01T00:00:00Z",
+        "repository": {"nameWithOwner": repo_name},
+        "labels": {"nodes": [{"name": label} for label in labels]},
+    }
+
+
+def get_elements(**kwargs):
+    options = dict(issues=True, prs=True, unassigned=False, repo_name="", asc=False, color=False)
+    options.update(kwargs)
+    return graphql_backend.get_elements({}, **options)
+
+
+def test_issues_and_prs_in_one_round_trip(fake_github):
+    fake_github.graphql_search["is:open is:issue assignee:@me sort:created-desc"] = [
+        make_node("a/one", 1, labels=["bug"]),
+        make_node("a/two", 2),
+    ]
+    fake_github.graphql_search["is:open is:pr review-requested:@me"] = [make_node("a/one", 3)]
+
+    issues, prs = get_elements()
+
+    assert len(fake_github.requests) == 1
+    assert issues.total_num_of_issues() == 2
+    assert issues["a/one"].issues[0].labels == [{"name": "bug"}]
+    assert [pr.number for pr in prs["a/one"].prs] == [3]
+
+
+def test_query_only_requests_needed_fields(fake_github):
+    get_elements()
+    document = fake_github.graphql_documents[0]
+    assert "body" not in document
+    assert "createdAt" in document
+
+
+def test_unassigned_issues_batch_repos(fake_github, monkeypatch):
+    monkeypatch.setattr(graphql_backend, "MAX_ALIASES_PER_QUERY", 2)
+    repo_names = [f"a/repo{i}" for i in range(3)]
+    fake_github.graphql_collaborator_repos = repo_names
+    for i, name in enumerate(repo_names):
+        fake_github.graphql_repo_issues[name] = [make_node(name, n) for n in range(i)]
+
+    issues, _ = get_elements(prs=False, unassigned=True)
+
+    # one query for the repo list, two for three repos at two aliases per document
+    assert len(fake_github.requests) == 3
+    assert sorted(issues) == ["a/repo1", "a/repo2"]
+    assert issues.total_num_of_issues() == 3
+
+
+def test_follows_cursors(fake_github):
+    fake_github.graphql_repo_issues["a/big"] = [make_node("a/big", n) for n in range(250)]
+
+    issues, _ = get_elements(prs=False, repo_name="a/big")
+
+    assert len(fake_github.requests) == 3
+    assert [issue.number for issue in issues["a/big"].issues] == list(range(250))
+
+
+def test_unknown_repo_is_skipped(fake_github):
+    issues, _ = get_elements(prs=False, unassigned=True, repo_name="a/missing")
+    assert not issues
+
+
+def test_repo_must_be_owner_and_name(fake_github):
+    with pytest.raises(click.BadParameter):
+        get_elements(repo_name="foo")
+    assert not fake_github.requests
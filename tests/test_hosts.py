@@ -0,0 +1,75 @@
+import click
+from click.testing import CliRunner
+from conftest import make_issue
+from fake_github import FakeGithub
+import pytest
+
+from gitmine import hosts as hosts_module
+from gitmine.commands import config as config_module
+from gitmine.commands.config import GithubConfig
+from gitmine.commands.get import select_hosts
+from gitmine.gitmine import gitmine
+from gitmine.hosts import Host
+
+runner = CliRunner()
+
+GHE = "ghe.example.com"
+
+
+def test_host_resolves_github_urls():
+    host = Host(GHE, "me", "token", f"https://{GHE}/api/v3")
+    assert host.resolve(f"{hosts_module.GITHUB_API_URL}/issues?page=2") == (
+        f"https://{GHE}/api/v3/issues?page=2"
+    )
+    assert host.resolve(f"{hosts_module.GITHUB_API_URL}/graphql") == f"https://{GHE}/api/graphql"
+    assert host.repo_key("a/one") == f"{GHE}/a/one"
+
+
+def test_config_loads_every_host(tmp_path):
+    path = tmp_path / "hosts.yml"
+    # GH credentials name the properties differently
+    path.write_text(
+        f"github.com:\n  username: me\n  token: t1\n{GHE}:\n  user: me2\n  oauth_token: t2\n"
+    )
+    config = GithubConfig.load_config_from_yaml(path)
+
+    assert [host.name for host in config.hosts()] == ["github.com", GHE]
+    assert config.get_value("token", GHE) == "t2"
+    assert config.hosts()[1].api_url == f"https://{GHE}/api/v3"
+
+
+def test_select_hosts_by_repo():
+    configured = [Host("github.com", "", "", ""), Host(GHE, "", "", "")]
+    assert select_hosts(configured, (), f"{GHE}/a/one") == ([configured[1]], "a/one")
+    assert select_hosts(configured, (), "a/one") == ([configured[0]], "a/one")
+    with pytest.raises(click.BadOptionUsage):
+        select_hosts(configured, ("ghe.unknown.com",), "")
+
+
+def test_get_all_fans_out_to_every_host(fake_github, monkeypatch, tmp_path):
+    with FakeGithub() as ghe:
+        monkeypatch.setattr(hosts_module, "GITHUB_API_URL", fake_github.url)
+        credentials = tmp_path / "hosts.yml"
+        credentials.write_text(
+            "github.com:\n  username: me\n  token: t1\n"
+            f"{GHE}:\n  username: me2\n  token: t2\n  api_url: {ghe.url}/api/v3\n"
+        )
+        monkeypatch.setattr(config_module, "GHP_CREDENTIALS_PATH", credentials)
+
+        fake_github.add_listing("/issues", [make_issue("a/one", 1)])
+        fake_github.add_listing("/search/issues", [], search=True)
+        ghe.add_listing("/api/v3/issues", [make_issue("b/two", 2, host=GHE)])
+        ghe.add_listing(
+            "/api/v3/search/issues", [make_issue("b/two", 3, "pull", host=GHE)], search=True
+        )
+
+        result = runner.invoke(gitmine, ["get", "all", "--no-cache", "--no-color"])
+
+        assert result.exit_code == 0, result.output
+        issues, prs = result.output.split("* " * 20)
+        assert "a/one" in issues and f"{GHE}/b/two" in issues and "#2" in issues
+        assert f"{GHE}/b/two" in prs and "#3" in prs
+
+        result = runner.invoke(gitmine, ["get", "issues", "--host", GHE, "--no-cache"])
+        assert result.exit_code == 0, result.output
+        assert "a/one" not in result.output and "#2" in result.output
@@ -0,0 +1,103 @@
+from click.testing import CliRunner
+from conftest import make_issue
+import pytest
+
+from gitmine.commands import get as get_module, sync as sync_module
+from gitmine.gitmine import gitmine
+from gitmine.index import ASSIGNED, UNASSIGNED, IssueIndex
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = IssueIndex(tmp_path / "index.sqlite3")
+    yield index
+    index.close()
+
+
+def test_apply_and_load(index):
+    index.apply(ASSIGNED, [("a/one", make_issue("a/one", 1, labels=["bug"]))], scope=ASSIGNED)
+    repos = index.load(ASSIGNED, asc=False, color=False)
+    assert repos["a/one"].issues[0].title == "Element 1"
+    assert repos["a/one"].issues[0].labels == [{"name": "bug"}]
+    assert index.watermark(ASSIGNED) == "2021-01-02T00:00:00Z"
+
+
+def test_apply_removes_closed_and_rejected(index):
+    index.apply(ASSIGNED, [("a/one", make_issue("a/one", 1))], scope=ASSIGNED)
+    index.apply(ASSIGNED, [("a/one", make_issue("a/one", 1, state="closed"))], scope=ASSIGNED)
+    index.apply(
+        UNASSIGNED,
+        [("a/one", make_issue("a/one", 2, assignees=["me"]))],
+        scope=f"{UNASSIGNED}:a/one",
+        keep=lambda issue: not issue.get("assignees"),
+    )
+    assert not index.load(ASSIGNED, asc=False, color=False)
+    assert not index.load(UNASSIGNED, asc=False, color=False)
+
+
+def test_watermark_never_moves_back(index):
+    index.apply(ASSIGNED, [("a/one", make_issue("a/one", 1))], scope=ASSIGNED)
+    index.apply(
+        ASSIGNED,
+        [("a/one", make_issue("a/one", 2, updated_at="2020-01-01T00:00:00Z"))],
+        scope=ASSIGNED,
+    )
+    assert index.watermark(ASSIGNED) == "2021-01-02T00:00:00Z"
+
+
+@pytest.fixture
+def index_path(monkeypatch, tmp_path):
+    path = tmp_path / "index.sqlite3"
+    for module in (get_module, sync_module):
+        monkeypatch.setattr(module, "GHP_INDEX_PATH", path)
+    yield path
+
+
+def test_sync_then_get_offline(fake_github, index_path):
+    fake_github.add_listing("/issues", [make_issue("a/one", 1)])
+    fake_github.add_listing("/search/issues", [], search=True)
+
+    result = runner.invoke(gitmine, ["sync"])
+    assert result.exit_code == 0, result.output
+    assert "state=open" in fake_github.requests[0]
+
+    requests_made = len(fake_github.requests)
+    result = runner.invoke(gitmine, ["get", "issues", "--offline", "--no-color"])
+    assert result.exit_code == 0, result.output
+    assert "#1" in result.output
+    assert len(fake_github.requests) == requests_made
+
+
+def test_sync_removes_issues_no_longer_assigned(fake_github, index_path):
+    fake_github.add_listing("/issues", [make_issue("a/one", 1), make_issue("a/one", 2)])
+    fake_github.add_listing("/search/issues", [], search=True)
+    assert runner.invoke(gitmine, ["sync"]).exit_code == 0
+
+    # reassigned to someone else: still open, but no longer listed for the user
+    fake_github.add_listing("/issues", [make_issue("a/one", 2)])
+    result = runner.invoke(gitmine, ["sync"])
+    assert result.exit_code == 0, result.output
+    assert "Updated 1 issues" in result.output
+
+    result = runner.invoke(gitmine, ["get", "issues", "--offline", "--no-color"])
+    assert "#2" in result.output
+    assert "#1" not in result.output
+
+
+def test_search_index_follows_updates_and_is_rebuilt_for_old_indexes(tmp_path):
+    path = tmp_path / "index.sqlite3"
+    index = IssueIndex(path)
+    index.apply(ASSIGNED, [("a/one", make_issue("a/one", 1, title="Flaky login"))], scope=ASSIGNED)
+    index.apply(ASSIGNED, [("a/one", make_issue("a/one", 1, title="Slow search"))], scope=ASSIGNED)
+    assert [match.number for match in index.search("serch")] == [1]
+    assert index.search("login") == []
+    # as left by a version of gitmine without a search index
+    index.conn.execute("DROP TABLE trigrams")
+    index.conn.execute("PRAGMA user_version = 0")
+    index.close()
+
+    index = IssueIndex(path)
+    assert [match.title for match in index.search("slow")] == ["Slow search"]
+    index.close()
@@ -0,0 +1,38 @@
+from conftest import make_issue
+from furl import furl
+import pytest
+
+from gitmine import search as search_module
+from gitmine.search import search_issues
+from gitmine.utils import CORE_RESOURCE, SEARCH_RESOURCE, rate_limit_resource
+
+
+def make_pr(number, day):
+    return make_issue("a/one", number, "pull", created_at=f"2021-01-{day:02}T12:00:00Z")
+
+
+def test_search_splits_queries_over_the_cap(fake_github, monkeypatch):
+    monkeypatch.setattr(search_module, "SEARCH_RESULTS_CAP", 100)
+    fake_github.search_cap = 100
+    fake_github.add_listing(
+        "/search/issues", [make_pr(n, 1 + n % 28) for n in range(350)], search=True
+    )
+
+    results = list(search_issues("is:open is:pr", {}, concurrency=2))
+
+    assert sorted(pr["number"] for pr in results) == list(range(350))
+    assert any("created%3A" in path for path in fake_github.requests)
+
+
+def test_search_under_the_cap_is_not_split(fake_github):
+    fake_github.add_listing("/search/issues", [make_pr(n, 1) for n in range(150)], search=True)
+
+    assert len(list(search_issues("is:open is:pr", {}))) == 150
+    assert len(fake_github.requests) == 2
+    assert not any("created%3A" in path for path in fake_github.requests)
+
+
+def test_search_requests_spend_the_search_rate_limit():
+    assert rate_limit_resource(furl("https://api.github.com/search/issues")) == SEARCH_RESOURCE
+    assert rate_limit_resource(furl("https://ghe.io/api/v3/search/issues")) == SEARCH_RESOURCE
+    assert rate_limit_resource(furl("https://api.github.com/repos/a/search")) == CORE_RESOURCE
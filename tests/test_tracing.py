@@ -0,0 +1,47 @@
+import json
+import pstats
+
+from click.testing import CliRunner
+from conftest import make_issue
+import pytest
+
+from gitmine.gitmine import gitmine
+from gitmine.tracing import Tracer
+
+runner = CliRunner()
+
+
+@pytest.mark.parametrize("fake_github", [{"rate_limit": 100}], indirect=True)
+def test_get_writes_trace_and_profile(fake_github, tmp_path):
+    fake_github.add_listing("/issues", [make_issue("a/one", 1)])
+    fake_github.add_listing("/search/issues", [make_issue("a/two", 2, "pull")], search=True)
+    trace_file = tmp_path / "trace.json"
+    profile_file = tmp_path / "get.prof"
+
+    result = runner.invoke(
+        gitmine,
+        ["get", "all", "--no-cache", "--no-color", "--trace"]
+        + ["--trace-file", str(trace_file), "--profile", str(profile_file)],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "request: ttfb" in result.output and "phase: Fetching PRs" in result.output
+    assert "2 requests" in result.output and "requests left in the rate limit" in result.output
+    events = json.loads(trace_file.read_text())["traceEvents"]
+    requests = [event for event in events if event["cat"] == "request"]
+    assert len(requests) == 2
+    assert all({"connect", "ttfb", "download"} <= set(event["args"]) for event in requests)
+    assert any(event["cat"] == "json" for event in events)
+    assert pstats.Stats(str(profile_file)).total_calls > 0
+
+
+def test_summary_counts_retries_and_cache_hits():
+    tracer = Tracer()
+    tracer.count("retries")
+    tracer.count("cache hits", "https://api.github.com/issues")
+    tracer.count("cache hits", "https://api.github.com/issues")
+    tracer.observe_rate_limit({"X-RateLimit-Remaining": "42"})
+
+    assert tracer.summary().endswith(
+        "0 requests, 2 cache hits, 1 retries, 42 requests left in the rate limit"
+    )
@@ -0,0 +1,56 @@
+import click
+from click.testing import CliRunner
+from conftest import make_issue
+import pytest
+
+from gitmine.commands import triage as triage_module
+from gitmine.gitmine import gitmine
+from gitmine.hosts import Host
+
+runner = CliRunner()
+
+
+def test_org_triage_counts_every_repo(fake_github):
+    fake_github.add_listing(
+        "/orgs/o/repos",
+        [
+            {"full_name": "o/a", "open_issues_count": 3},
+            {"full_name": "o/b", "open_issues_count": 1},
+            {"full_name": "o/empty", "open_issues_count": 0},
+        ],
+    )
+    fake_github.add_listing(
+        "/repos/o/a/issues",
+        [
+            make_issue("o/a", 1, days_old=1, labels=["bug"], assignees=["ann"]),
+            make_issue("o/a", 2, days_old=30, labels=["bug", "ui"]),
+            make_issue("o/a", 3, "pull", days_old=10),
+        ],
+    )
+    fake_github.add_listing(
+        "/repos/o/b/issues", [make_issue("o/b", 1, days_old=20, assignees=["bob"])]
+    )
+
+    result = runner.invoke(gitmine, ["get", "all", "--org", "o", "--no-cache"])
+
+    assert result.exit_code == 0, result.output
+    lines = [line.split() for line in result.output.splitlines()]
+    assert "o: 3 open Issues and 1 open PRs in 2 repos" in result.output
+    assert ["<", "7", "days", "1", "0"] in lines
+    assert ["7-14", "days", "0", "1"] in lines
+    assert [">=", "14", "days", "2", "0"] in lines
+    assert ["bug", "2", "0"] in lines
+    assert ["(unassigned)", "1", "1"] in lines
+    assert ["o/a", "2", "1"] in lines
+    assert not any(path.startswith("/repos/o/empty") for path in fake_github.requests)
+
+
+def test_org_is_swept_on_every_host_unless_one_is_named():
+    configured = [Host("github.com", "", "", ""), Host("ghe.example.com", "", "", "")]
+    assert triage_module.select_org_hosts(configured, (), "acme") == (configured, "acme")
+    assert triage_module.select_org_hosts(configured, (), "ghe.example.com/acme") == (
+        [configured[1]],
+        "acme",
+    )
+    with pytest.raises(click.BadOptionUsage):
+        triage_module.select_org_hosts(configured, ("github.com",), "ghe.example.com/acme")
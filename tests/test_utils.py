@@ -0,0 +1,159 @@
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+import click
+from fake_github import FakeGithub
+from furl import furl
+import pytest
+
+from gitmine.utils import (
+    PER_PAGE,
+    RequestScheduler,
+    SafeSession,
+    SingleFlight,
+    connection_stats,
+    get_scheduler,
+    get_session,
+    paginate,
+    safe_request,
+    set_scheduler,
+)
+
+
+def test_paginate_fetches_every_page(fake_github):
+    items = [{"number": i} for i in range(250)]
+    fake_github.add_listing("/issues", items)
+    result = list(paginate(furl(fake_github.url, path="/issues"), {}, {}))
+    assert result == items
+    assert len(fake_github.requests) == 3
+    assert all(f"per_page={PER_PAGE}" in r for r in fake_github.requests)
+
+
+def test_paginate_follows_next_links_without_last(fake_github):
+    items = [{"number": i} for i in range(201)]
+    fake_github.add_listing("/issues", items)
+    fake_github.link_last = False
+    result = list(paginate(furl(fake_github.url, path="/issues"), {}, {}))
+    assert result == items
+    assert len(fake_github.requests) == 3
+
+
+def test_paginate_search_items(fake_github):
+    items = [{"number": i} for i in range(120)]
+    fake_github.add_listing("/search/issues", items, search=True)
+    url = furl(fake_github.url, path="/search/issues", args={"q": "is:open is:pr"})
+    result = list(paginate(url, {}, {}, items_key="items"))
+    assert result == items
+    assert "q=is%3Aopen+is%3Apr" in fake_github.requests[-1]
+
+
+def test_paginate_single_page(fake_github):
+    fake_github.add_listing("/issues", [{"number": 1}])
+    assert list(paginate(furl(fake_github.url, path="/issues"), {}, {})) == [{"number": 1}]
+    assert len(fake_github.requests) == 1
+
+
+@pytest.fixture
+def scheduler():
+    previous = get_scheduler()
+    scheduler = RequestScheduler(4, max_retries=2, backoff_base=0.01)
+    set_scheduler(scheduler)
+    yield scheduler
+    set_scheduler(previous)
+
+
+def test_retries_transient_errors(fake_github, scheduler):
+    fake_github.add_listing("/issues", [{"number": 1}])
+    fake_github.failures["/issues"] = [(502, {}), (403, {"Retry-After": "0"})]
+    assert list(paginate(furl(fake_github.url, path="/issues"), {}, {})) == [{"number": 1}]
+    assert fake_github.statuses == [502, 403, 200]
+
+
+def test_gives_up_after_max_retries(fake_github, scheduler):
+    fake_github.add_listing("/issues", [{"number": 1}])
+    fake_github.failures["/issues"] = [(503, {})] * 3
+    with pytest.raises(click.ClickException, match="503"):
+        list(paginate(furl(fake_github.url, path="/issues"), {}, {}))
+    assert len(fake_github.requests) == 3
+
+
+def test_does_not_retry_bad_credentials(fake_github, scheduler):
+    fake_github.failures["/issues"] = [(401, {})]
+    with pytest.raises(click.ClickException, match="Bad Credentials"):
+        list(paginate(furl(fake_github.url, path="/issues"), {}, {}))
+    assert len(fake_github.requests) == 1
+
+
+def test_errors_shrink_concurrency(fake_github, scheduler):
+    fake_github.add_listing("/issues", [{"number": 1}])
+    fake_github.failures["/issues"] = [(500, {}), (500, {})]
+    list(paginate(furl(fake_github.url, path="/issues"), {}, {}))
+    assert scheduler.limit < 4
+
+
+def test_pauses_once_rate_limit_is_exhausted(fake_github, scheduler):
+    reset = time.time() + 120
+    fake_github.failures["/issues"] = [
+        (200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(reset))})
+    ]
+    safe_request(SafeSession().get, furl(fake_github.url, path="/issues"), {}, {})
+    assert scheduler.paused_until == int(reset)
+
+
+def test_paces_what_is_left_of_the_rate_limit(fake_github, scheduler):
+    # as small as the search rate limit: 30 requests a minute
+    fake_github.rate_limit = 30
+    fake_github.rate_limit_window = 0.5
+    fake_github.add_listing("/issues", [])
+    url = furl(fake_github.url, path="/issues")
+
+    for _ in range(28):
+        assert safe_request(SafeSession().get, url, {}, {}).status_code == 200
+
+    # what is left is spread out until the reset, instead of waiting for it
+    assert scheduler.paused_until == 0.0
+    assert 0 < scheduler.spacing < 1.5
+    assert len(fake_github.requests) == 28
+
+
+def test_requests_share_keep_alive_connections(fake_github, scheduler):
+    scheduler.max_in_flight = scheduler.limit = 2
+    set_scheduler(scheduler)  # recreates the sessions with pools of two connections
+    fake_github.add_listing("/issues", [{"number": i} for i in range(1000)])
+
+    for _ in range(2):
+        assert len(list(paginate(furl(fake_github.url, path="/issues"), {}, {}))) == 1000
+
+    sent, opened = connection_stats()["github.com"]
+    assert sent == 20
+    # pages are fetched by up to five threads, but never more than two requests at once
+    assert opened <= 2
+
+
+def test_identical_requests_in_flight_are_coalesced(fake_github, scheduler):
+    fake_github.latency = 0.2
+    fake_github.add_listing("/issues", [{"number": 1}])
+    url = furl(fake_github.url, path="/issues")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: list(paginate(url, {}, {})), range(4)))
+
+    assert results == [[{"number": 1}]] * 4
+    assert len(fake_github.requests) == 1
+
+
+def test_single_flight_forgets_failed_calls():
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.run("key", lambda: int("not a number"))
+    assert flight.run("key", lambda: 1) == 1
+
+
+def test_session_pool_has_room_for_every_rate_limit(scheduler):
+    scheduler.max_in_flight = 3
+    set_scheduler(scheduler)
+
+    adapter = get_session().get_adapter("https://api.github.com")
+
+    # the core and search schedulers may each have three requests in flight
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 6
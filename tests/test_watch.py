@@ -0,0 +1,52 @@
+from click.testing import CliRunner
+from conftest import make_issue
+import pytest
+
+from gitmine.commands import watch as watch_module
+from gitmine.commands.watch import diff_snapshots
+from gitmine.gitmine import gitmine
+from gitmine.models.github_elements import GithubElement
+
+runner = CliRunner()
+
+
+def element(number, labels=()):
+    return GithubElement.from_dict(make_issue("a/one", number, labels=labels), elem_type="Issue")
+
+
+def test_diff_snapshots():
+    old = {("issues", "a/one", 1): element(1), ("issues", "a/one", 2): element(2)}
+    new = {("issues", "a/one", 2): element(2, ["bug"]), ("issues", "a/one", 3): element(3)}
+
+    changes = [(mark, element.number) for mark, _, element in diff_snapshots(old, new)]
+
+    assert changes == [("~", 2), ("+", 3), ("-", 1)]
+    assert list(diff_snapshots(new, new)) == []
+
+
+def test_watch_prints_only_changes(fake_github, monkeypatch):
+    fake_github.add_listing("/issues", [make_issue("a/one", 1)])
+    polls = iter(
+        [
+            [make_issue("a/one", 1)],
+            [make_issue("a/one", 1, labels=["bug"]), make_issue("a/one", 2)],
+        ]
+    )
+
+    def sleep(_):
+        try:
+            fake_github.add_listing("/issues", next(polls))
+        except StopIteration:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(watch_module.time, "sleep", sleep)
+
+    result = runner.invoke(gitmine, ["get", "issues", "--watch", "--interval", "1"])
+
+    assert result.exit_code == 0, result.output
+    lines = [line for line in result.output.splitlines() if line[:2].isdigit()]
+    assert len(lines) == 2
+    assert " ~ a/one #1 Element 1 (bug)" in lines[0]
+    assert " + a/one #2 Element 2" in lines[1]
+    # the unchanged poll was answered with 304 Not Modified
+    assert 304 in fake_github.statuses